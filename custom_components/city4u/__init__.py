@@ -1,5 +1,6 @@
 """The City4U Water Consumption integration."""
 
+import asyncio
 import logging
 from datetime import timedelta
 from typing import Any
@@ -7,15 +8,53 @@ from typing import Any
 import aiohttp
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.const import CONF_PASSWORD, CONF_USERNAME, Platform
-from homeassistant.core import HomeAssistant
+from homeassistant.core import HomeAssistant, callback
 from homeassistant.exceptions import ConfigEntryAuthFailed, ConfigEntryNotReady
 from homeassistant.helpers import config_validation as cv
-from homeassistant.helpers.aiohttp_client import async_get_clientsession
+from homeassistant.helpers.dispatcher import async_dispatcher_send
 from homeassistant.helpers.update_coordinator import DataUpdateCoordinator, UpdateFailed
+from homeassistant.util import dt as dt_util
 
-from .api import City4UApiClient, City4UCredentials
-from .const import CONF_CUSTOMER_ID, CONF_METER_NUMBER, DOMAIN, SCAN_INTERVAL
-from .services import async_setup_services, async_unload_services
+from .account import City4UAccountScheduler
+from .api import (
+    City4UApiClient,
+    City4UAuthRegistry,
+    City4UCredentials,
+    City4URequestLimiter,
+    Reading,
+)
+from .cache import City4UReadingCache
+from .const import (
+    CONF_AUTO_IMPORT_STATISTICS,
+    CONF_CONNECT_TIMEOUT,
+    CONF_CUSTOMER_ID,
+    CONF_MAX_CONCURRENT_REQUESTS,
+    CONF_MAX_REQUESTS_PER_SECOND,
+    CONF_METER_NUMBER,
+    CONF_READ_TIMEOUT,
+    CONF_TOTAL_TIMEOUT,
+    DATA_ACCOUNTS,
+    DATA_AUTH_REGISTRY,
+    DATA_CIRCUIT_BREAKER,
+    DATA_REQUEST_LIMITER,
+    DEFAULT_CONNECT_TIMEOUT,
+    DEFAULT_MAX_CONCURRENT_REQUESTS,
+    DEFAULT_MAX_REQUESTS_PER_SECOND,
+    DEFAULT_READ_TIMEOUT,
+    DEFAULT_TOTAL_TIMEOUT,
+    DOMAIN,
+    MAX_SCAN_INTERVAL,
+    MAX_STORED_READINGS,
+    MIN_SCAN_INTERVAL,
+    SCAN_INTERVAL,
+    SIGNAL_POLLED,
+)
+from .handoff import async_pop_handoff
+from .polling import AdaptivePollInterval, poll_offset
+from .readings import ReadingSnapshot, ReadingStore
+from .resilience import City4UCircuitBreaker, City4UCircuitOpenError, City4UTimeouts
+from .services import async_import_statistics, async_setup_services
+from .session import async_close_session, async_get_session
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -35,22 +74,37 @@ async def async_setup(hass: HomeAssistant, _config: dict[str, Any]) -> bool:
     return True
 
 
-async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
-    """Set up City4U from a config entry."""
-    username = entry.data[CONF_USERNAME]
-    password = entry.data[CONF_PASSWORD]
-    customer_id = entry.data[CONF_CUSTOMER_ID]
-    meter_number = entry.data[CONF_METER_NUMBER]
-
-    session = async_get_clientsession(hass)
-    credentials = City4UCredentials(
-        username=username,
-        password=password,
-        customer_id=customer_id,
-        meter_number=meter_number,
+def _request_limits(hass: HomeAssistant) -> tuple[int, float]:
+    """Return the strictest request limits set in any entry's options."""
+    entries = hass.config_entries.async_entries(DOMAIN)
+    max_concurrency = min(
+        (
+            entry.options.get(
+                CONF_MAX_CONCURRENT_REQUESTS, DEFAULT_MAX_CONCURRENT_REQUESTS
+            )
+            for entry in entries
+        ),
+        default=DEFAULT_MAX_CONCURRENT_REQUESTS,
     )
-    api = City4UApiClient(credentials=credentials, session=session)
+    requests_per_second = min(
+        (
+            entry.options.get(
+                CONF_MAX_REQUESTS_PER_SECOND, DEFAULT_MAX_REQUESTS_PER_SECOND
+            )
+            for entry in entries
+        ),
+        default=DEFAULT_MAX_REQUESTS_PER_SECOND,
+    )
+    return max_concurrency, requests_per_second
+
 
+def _poll_key(entry: ConfigEntry) -> str:
+    """Return the poll key of the account an entry belongs to."""
+    return f"{entry.data[CONF_CUSTOMER_ID]}_{entry.data[CONF_USERNAME]}"
+
+
+async def _async_authenticate(api: City4UApiClient) -> None:
+    """Authenticate during setup, mapping errors to config entry exceptions."""
     try:
         await api.authenticate()
     except aiohttp.ClientResponseError as err:
@@ -68,14 +122,159 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
         _LOGGER.exception("Unknown error occurred during authentication: %s", err)
         raise ConfigEntryNotReady("Failed to connect to City4U API") from err
 
-    async def async_update_data() -> list[dict[str, Any]]:
-        """Update data via API."""
+
+async def _async_fetch_new_readings(api: City4UApiClient) -> list[Reading]:
+    """Fetch new readings, logging in again once if the token is rejected.
+
+    Tokens restored from the cache or shared with other entries can be
+    invalidated by the server before they expire.
+    """
+    token = api.token
+    try:
+        return await api.fetch_new_readings()
+    except aiohttp.ClientResponseError as err:
+        if err.status not in _AUTH_FAILURE_STATUSES:
+            raise
+        _LOGGER.debug("Token rejected (status %s), logging in again", err.status)
+
+    # Another entry of the account may have logged in again already
+    if api.token == token:
+        api.set_token(None)
+    # A rejected login raises, and is reported as an authentication failure
+    await api.authenticate()
+    try:
+        return await api.fetch_new_readings()
+    except aiohttp.ClientResponseError as err:
+        if err.status not in _AUTH_FAILURE_STATUSES:
+            raise
+        # The credentials were just accepted, so they are not at fault
+        raise UpdateFailed(
+            f"Data request rejected after logging in again: {err}"
+        ) from err
+
+
+async def async_setup_entry(  # pylint: disable=too-many-locals,too-many-statements
+    hass: HomeAssistant, entry: ConfigEntry
+) -> bool:
+    """Set up City4U from a config entry."""
+    username = entry.data[CONF_USERNAME]
+    password = entry.data[CONF_PASSWORD]
+    customer_id = entry.data[CONF_CUSTOMER_ID]
+    meter_number = entry.data[CONF_METER_NUMBER]
+
+    # All entries share one connection pool to city4u.co.il
+    session = async_get_session(hass)
+    credentials = City4UCredentials(
+        username=username,
+        password=password,
+        customer_id=customer_id,
+        meter_number=meter_number,
+    )
+    # Entries of the same account share one token and one login at a time
+    auth_registry: City4UAuthRegistry = hass.data.setdefault(
+        DATA_AUTH_REGISTRY, City4UAuthRegistry()
+    )
+    # All entries share one limit on concurrent requests and request rate
+    request_limits = _request_limits(hass)
+    request_limiter: City4URequestLimiter | None = hass.data.get(DATA_REQUEST_LIMITER)
+    if request_limiter is None:
+        request_limiter = hass.data[DATA_REQUEST_LIMITER] = City4URequestLimiter(
+            *request_limits
+        )
+    else:
+        # Entries are reloaded when their options change
+        request_limiter.configure(*request_limits)
+    # All entries stop sending requests together while the host is down
+    circuit_breaker: City4UCircuitBreaker = hass.data.setdefault(
+        DATA_CIRCUIT_BREAKER, City4UCircuitBreaker()
+    )
+    api = City4UApiClient(
+        credentials=credentials,
+        session=session,
+        auth_state=auth_registry.get(customer_id, username),
+        request_limiter=request_limiter,
+        timeouts=City4UTimeouts(
+            connect=entry.options.get(CONF_CONNECT_TIMEOUT, DEFAULT_CONNECT_TIMEOUT),
+            read=entry.options.get(CONF_READ_TIMEOUT, DEFAULT_READ_TIMEOUT),
+            total=entry.options.get(CONF_TOTAL_TIMEOUT, DEFAULT_TOTAL_TIMEOUT),
+        ),
+        circuit_breaker=circuit_breaker,
+    )
+
+    # A meter just added in the config flow reuses the flow's login and payload
+    if (handoff := async_pop_handoff(hass, credentials)) is not None:
+        handoff.apply(api)
+
+    store = ReadingStore(max_readings=MAX_STORED_READINGS)
+    cache = City4UReadingCache(hass, entry.entry_id)
+
+    # Without cached readings we have nothing to show, so log in up front
+    if not await cache.async_restore(api, store):
+        await _async_authenticate(api)
+
+    poll_interval = AdaptivePollInterval(
+        base_interval=timedelta(seconds=SCAN_INTERVAL),
+        min_interval=timedelta(seconds=MIN_SCAN_INTERVAL),
+        max_interval=timedelta(seconds=MAX_SCAN_INTERVAL),
+    )
+
+    # Meters of the same account are polled together in one batch
+    accounts: dict[tuple[str, str], City4UAccountScheduler] = hass.data.setdefault(
+        DATA_ACCOUNTS, {}
+    )
+    account_key = (str(customer_id), username)
+    account = accounts.get(account_key)
+    if account is None:
+        account = accounts[account_key] = City4UAccountScheduler(hass)
+
+    async def async_import_new_statistics() -> None:
+        """Append readings that are not yet in long-term statistics."""
         try:
-            # Check if token is still valid, re-auth if needed
-            if not api.is_token_valid():
-                await api.authenticate()
+            await async_import_statistics(hass, api, store)
+        except Exception as err:  # pylint: disable=broad-exception-caught
+            _LOGGER.warning(
+                "Failed to import statistics for meter %s: %s", meter_number, err
+            )
 
-            return await api.fetch_water_data()
+    async def async_fetch_readings() -> None:
+        """Fetch new readings into the store."""
+        token = api.token
+        # Check if token is still valid, re-auth if needed
+        if not api.is_token_valid():
+            await api.authenticate()
+
+        # Only readings newer than the last poll are returned
+        added = store.extend(await _async_fetch_new_readings(api))
+        # Polls that found nothing new leave nothing to save
+        if added or api.token != token:
+            cache.async_schedule_save(api, store)
+        async_dispatcher_send(hass, SIGNAL_POLLED.format(entry.entry_id))
+
+        if added and entry.options.get(CONF_AUTO_IMPORT_STATISTICS):
+            entry.async_create_background_task(
+                hass,
+                async_import_new_statistics(),
+                f"city4u_import_statistics_{entry.entry_id}",
+            )
+
+        # Poll again when the meter's next reading is expected. Batches only
+        # fetch meters that asked, so siblings keep their own schedules, but
+        # polls are snapped to the account's slots for siblings to share them.
+        now = dt_util.utcnow().timestamp()
+        coordinator.update_interval = account.async_snap_interval(
+            poll_interval.next_interval(store, added, now), now
+        )
+
+    async def async_update_data() -> ReadingSnapshot:
+        """Update data via API."""
+        try:
+            await account.async_refresh(entry.entry_id)
+            return store.snapshot()
+        except UpdateFailed:
+            raise
+        except City4UCircuitOpenError as err:
+            # Expected during an outage, already logged when the circuit opened
+            raise UpdateFailed(str(err)) from err
         except aiohttp.ClientResponseError as err:
             if err.status in _AUTH_FAILURE_STATUSES:
                 raise ConfigEntryAuthFailed(
@@ -95,10 +294,42 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
         name=DOMAIN,
         update_method=async_update_data,
         update_interval=timedelta(seconds=SCAN_INTERVAL),
+        # Snapshots compare equal until a new reading arrives, so polls that
+        # find nothing new do not notify the sensor
+        always_update=False,
     )
 
-    # Fetch initial data
-    await coordinator.async_config_entry_first_refresh()
+    remove_meter = account.async_add_meter(entry.entry_id, async_fetch_readings)
+
+    @callback
+    def _async_remove_meter() -> None:
+        remove_meter()
+        if not account.meter_count:
+            accounts.pop(account_key, None)
+
+    entry.async_on_unload(_async_remove_meter)
+
+    if store:
+        # Serve cached readings right away and refresh in the background. The
+        # accounts are spread evenly over the poll interval, so that a restart
+        # does not send every meter to the API at once.
+        coordinator.async_set_updated_data(store.snapshot())
+        offset = poll_offset(
+            _poll_key(entry),
+            map(_poll_key, hass.config_entries.async_entries(DOMAIN)),
+            timedelta(seconds=SCAN_INTERVAL),
+        )
+
+        async def _async_delayed_refresh() -> None:
+            await asyncio.sleep(offset.total_seconds())
+            await coordinator.async_refresh()
+
+        entry.async_create_background_task(
+            hass, _async_delayed_refresh(), f"{DOMAIN}_refresh_{entry.entry_id}"
+        )
+    else:
+        # Fetch initial data
+        await coordinator.async_config_entry_first_refresh()
 
     hass.data.setdefault(DOMAIN, {})
     hass.data[DOMAIN][entry.entry_id] = {
@@ -106,18 +337,36 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
         "api": api,
     }
 
+    # Timeouts are applied when the client is created
+    entry.async_on_unload(entry.add_update_listener(_async_options_updated))
+
     await hass.config_entries.async_forward_entry_setups(entry, PLATFORMS)
     return True
 
 
+async def _async_options_updated(hass: HomeAssistant, entry: ConfigEntry) -> None:
+    """Reload the entry so changed options take effect."""
+    await hass.config_entries.async_reload(entry.entry_id)
+
+
 async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     """Unload a config entry."""
     unload_ok = await hass.config_entries.async_unload_platforms(entry, PLATFORMS)
     if unload_ok:
         hass.data[DOMAIN].pop(entry.entry_id)
 
-        # If this is the last entry, unload services
+        # If this is the last entry, release the shared objects. Services stay
+        # registered, as async_setup does not run again when an entry reloads
         if not hass.data[DOMAIN]:
-            await async_unload_services(hass)
+            hass.data.pop(DATA_AUTH_REGISTRY, None)
+            hass.data.pop(DATA_ACCOUNTS, None)
+            hass.data.pop(DATA_REQUEST_LIMITER, None)
+            hass.data.pop(DATA_CIRCUIT_BREAKER, None)
+            await async_close_session(hass)
 
     return unload_ok
+
+
+async def async_remove_entry(hass: HomeAssistant, entry: ConfigEntry) -> None:
+    """Remove the persisted reading cache when an entry is deleted."""
+    await City4UReadingCache(hass, entry.entry_id).async_remove()
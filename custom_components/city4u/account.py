@@ -0,0 +1,108 @@
+"""Per-account poll scheduling for the City4U integration."""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+from collections.abc import Awaitable, Callable
+from datetime import timedelta
+
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
+
+from .const import ACCOUNT_BATCH_WINDOW, ACCOUNT_POLL_SLOT
+
+_LOGGER = logging.getLogger(__name__)
+
+
+class City4UAccountScheduler:
+    """Coalesce ReadingMoneWater polls of meters under one account.
+
+    A refresh requested by any meter starts a batch after a short window.
+    The batch fetches the meters that asked during the window back to back
+    over the shared session and token, so the connection is reused. Meters
+    that did not ask are left to their own schedule, but every meter's next
+    poll is snapped to one of the account's poll slots, so meters whose polls
+    fall in the same slot ask together.
+    """
+
+    def __init__(self, hass: HomeAssistant) -> None:
+        """Initialize the scheduler."""
+        self._hass = hass
+        self._meters: dict[str, Callable[[], Awaitable[None]]] = {}
+        self._pending: dict[str, asyncio.Future[None]] = {}
+        self._batch_scheduled = False
+        self._slot_anchor: float | None = None
+
+    @property
+    def meter_count(self) -> int:
+        """Return the number of registered meters."""
+        return len(self._meters)
+
+    @callback
+    def async_add_meter(
+        self, key: str, fetch: Callable[[], Awaitable[None]]
+    ) -> CALLBACK_TYPE:
+        """Register a meter and return a callback that removes it.
+
+        fetch updates the meter's readings and raises on failure.
+        """
+        self._meters[key] = fetch
+
+        @callback
+        def _async_remove() -> None:
+            self._meters.pop(key, None)
+
+        return _async_remove
+
+    @callback
+    def async_snap_interval(self, interval: timedelta, now: float) -> timedelta:
+        """Shorten a meter's poll interval to end on the account's last slot.
+
+        now is the current POSIX timestamp. Slots are ACCOUNT_POLL_SLOT apart,
+        counted from the first interval snapped, so a poll comes at most one
+        slot early.
+        """
+        if self._slot_anchor is None:
+            self._slot_anchor = now
+        due = now + interval.total_seconds()
+        slot = due - (due - self._slot_anchor) % ACCOUNT_POLL_SLOT
+        if slot <= now:
+            return interval
+        return timedelta(seconds=slot - now)
+
+    async def async_refresh(self, key: str) -> None:
+        """Fetch a meter's readings as part of the next account batch."""
+        future = self._pending.get(key)
+        if future is None:
+            future = self._hass.loop.create_future()
+            self._pending[key] = future
+
+        if not self._batch_scheduled:
+            self._batch_scheduled = True
+            self._hass.async_create_background_task(
+                self._async_run_batch(), "city4u_account_batch"
+            )
+
+        await future
+
+    async def _async_run_batch(self) -> None:
+        """Wait for other meters to join, then fetch the ones that did."""
+        await asyncio.sleep(ACCOUNT_BATCH_WINDOW)
+
+        pending, self._pending = self._pending, {}
+        self._batch_scheduled = False
+
+        _LOGGER.debug("Fetching %d meters", len(pending))
+
+        for key, future in pending.items():
+            fetch = self._meters.get(key)
+            try:
+                # Meters removed while waiting have nothing to fetch
+                if fetch is not None:
+                    await fetch()
+            except Exception as err:  # pylint: disable=broad-exception-caught
+                if not future.done():
+                    future.set_exception(err)
+                continue
+            if not future.done():
+                future.set_result(None)
@@ -1,17 +1,228 @@
 """City4U API client."""
 
+import asyncio
+import contextlib
+import hashlib
 import json
 import logging
-from dataclasses import dataclass
-from datetime import datetime, timedelta
-from typing import Any
+import time
+from collections.abc import AsyncIterator, Awaitable, Callable
+from contextlib import AbstractAsyncContextManager
+from dataclasses import dataclass, field
+from datetime import UTC, datetime, timedelta
+from functools import lru_cache
+from typing import Any, Self
+from urllib.parse import urlsplit
+from zoneinfo import ZoneInfo
 
 import aiohttp
-
-from .const import DATA_URL_TEMPLATE, LOGIN_URL, TOKEN_EXPIRATION_MINUTES
+from aiohttp import hdrs
+
+from .const import (
+    DATA_URL_TEMPLATE,
+    LOGIN_URL,
+    PAYLOAD_FINGERPRINT_BYTES,
+    READING_TIME_CACHE_SIZE,
+    STREAM_CHUNK_SIZE,
+    TOKEN_EXPIRATION_MINUTES,
+)
+from .jsonstream import JsonArrayStream
+from .resilience import (
+    City4UCircuitBreaker,
+    City4UCircuitOpenError,
+    City4URetryPolicy,
+    City4UTimeouts,
+    async_request_with_retries,
+)
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - Home Assistant always ships orjson
+    orjson = None  # type: ignore[assignment]
 
 _LOGGER = logging.getLogger(__name__)
 
+type JsonDecoder = Callable[[bytes], Any]
+
+# Decodes a UTF-8 response body straight from bytes, without building a str
+DEFAULT_JSON_DECODER: JsonDecoder = (
+    orjson.loads  # pylint: disable=no-member
+    if orjson is not None
+    else json.loads
+)
+
+# Reading times are Israel local time without an offset
+_READING_TIME_ZONE = ZoneInfo("Asia/Jerusalem")
+
+
+@lru_cache(maxsize=READING_TIME_CACHE_SIZE)
+def _parse_reading_time(reading_time_str: str) -> datetime:
+    """Parse a readingTime string, caching the result for repeated strings."""
+    reading_time = datetime.fromisoformat(reading_time_str)
+    if reading_time.tzinfo is None:
+        reading_time = reading_time.replace(tzinfo=_READING_TIME_ZONE)
+    return reading_time.astimezone(UTC)
+
+
+def parse_reading_time(reading_time_str: str | None) -> datetime | None:
+    """Parse a City4U readingTime string to a UTC datetime."""
+    if not reading_time_str:
+        return None
+    try:
+        return _parse_reading_time(reading_time_str)
+    except (ValueError, TypeError):
+        _LOGGER.warning("Failed to parse reading time: %s", reading_time_str)
+        return None
+
+
+def parse_reading_value(reading_value: Any) -> float | None:
+    """Parse a City4U totalWaterDataWithMultiplier value to a float."""
+    if reading_value is None:
+        return None
+    try:
+        return float(reading_value)
+    except (ValueError, TypeError):
+        _LOGGER.warning("Invalid water reading value: %s", reading_value)
+        return None
+
+
+def _first_str(data: dict[str, Any], *keys: str) -> str | None:
+    """Return the first truthy value among keys, as a string."""
+    for key in keys:
+        if value := data.get(key):
+            return str(value)
+    return None
+
+
+def _payload_fingerprint(length: int, tail: bytes) -> tuple[int, bytes]:
+    """Return the length of a payload and a hash of its tail."""
+    return (
+        length,
+        hashlib.blake2b(tail[-PAYLOAD_FINGERPRINT_BYTES:], digest_size=16).digest(),
+    )
+
+
+async def _async_iter_chunks(body: bytes) -> AsyncIterator[bytes]:
+    """Yield a payload that is already in memory in stream-sized chunks."""
+    for start in range(0, len(body), STREAM_CHUNK_SIZE):
+        yield body[start : start + STREAM_CHUNK_SIZE]
+
+
+@dataclass(frozen=True, slots=True)
+class _DataPayload:
+    """An open data payload, read in chunks."""
+
+    chunks: AsyncIterator[bytes]
+    length: int | None  # from Content-Length, when the server sent it
+    etag: str | None = None
+    last_modified: str | None = None
+
+
+def _record_key(item: dict[str, Any]) -> list[Any]:
+    """Return the readingTime and value that identify a raw record."""
+    return [item.get("readingTime"), item.get("totalWaterDataWithMultiplier")]
+
+
+class _NewRecords:  # pylint: disable=too-many-instance-attributes
+    """Pick the records of a payload that were not handed out yet.
+
+    The history is append-only, so the records after the first seen ones are
+    new, provided the last of those is still the record handed out last.
+    Otherwise the history was rewritten, and records newer than the
+    watermark are picked instead, comparing the raw fixed-width readingTime
+    strings. Records are fed in order, in any number of batches.
+    """
+
+    def __init__(
+        self, seen: int | None, last_record: list[Any] | None, watermark: str | None
+    ) -> None:
+        """Initialize the filter with the position handed out so far."""
+        self._seen = seen
+        self._seen_last_record = last_record
+        self._watermark = watermark
+        # Whether the history still starts with the records seen, once known
+        self._intact: bool | None = True if seen == 0 else None
+        self._appended: list[dict[str, Any]] = []
+        self._newer: list[dict[str, Any]] = []
+        self.total = 0
+        self.last_record: list[Any] | None = None
+
+    def feed(self, items: list[Any]) -> None:
+        """Add the next records of the payload."""
+        if not items:
+            return
+        start = self.total
+        self.total += len(items)
+        self.last_record = _record_key(items[-1])
+
+        seen = self._seen
+        if seen is None:
+            self._keep_newer(items)
+            return
+        if self._intact is None and seen <= self.total:
+            self._intact = _record_key(items[seen - start - 1]) == (
+                self._seen_last_record
+            )
+        self._appended.extend(items[max(seen - start, 0) :])
+        if not self._intact:
+            self._keep_newer(items)
+
+    def _keep_newer(self, items: list[Any]) -> None:
+        """Keep the records newer than the watermark."""
+        watermark = self._watermark
+        if watermark is None:
+            self._newer.extend(items)
+            return
+        self._newer.extend(
+            item
+            for item in items
+            if not isinstance(reading_time := item.get("readingTime"), str)
+            or reading_time > watermark
+        )
+
+    def new_items(self) -> list[dict[str, Any]]:
+        """Return the new records, once all of them were fed."""
+        if self._intact:
+            return self._appended
+        if self._seen is not None:
+            _LOGGER.debug("Reading history was rewritten, using the last reading time")
+        return self._newer
+
+
+@dataclass(frozen=True, slots=True)
+class Reading:
+    """A water meter reading normalized from the ReadingMoneWater response.
+
+    The API spells some identifiers in different cases between customers;
+    from_api resolves them once, so consumers never touch the raw keys.
+    """
+
+    reading_time: str | None  # raw readingTime, ordered like the time
+    time: datetime | None  # UTC
+    value: float | None
+    meter_number: str | None
+    property_id: str | None  # ExternalWaterCardId (זיהוי נכס)
+    site_id: str | None  # SiteExternalReferenceId (municipality portal ID)
+    raw: dict[str, Any] = field(repr=False)
+
+    @classmethod
+    def from_api(cls, data: dict[str, Any]) -> Self:
+        """Create a reading from one record of the API response."""
+        reading_time = data.get("readingTime")
+        if not isinstance(reading_time, str):
+            reading_time = None
+        return cls(
+            reading_time=reading_time,
+            time=parse_reading_time(reading_time),
+            value=parse_reading_value(data.get("totalWaterDataWithMultiplier")),
+            meter_number=_first_str(data, "MeterNumber", "meterNumber"),
+            property_id=_first_str(data, "ExternalWaterCardId", "externalWaterCardId"),
+            site_id=_first_str(
+                data, "SiteExternalReferenceId", "siteExternalReferenceId"
+            ),
+            raw=data,
+        )
+
 
 @dataclass
 class City4UCredentials:
@@ -23,26 +234,150 @@ class City4UCredentials:
     meter_number: str
 
 
-class City4UApiClient:
+@dataclass
+class City4UAuthState:
+    """Token state that can be shared by API clients of the same account."""
+
+    token: str | None = None
+    expires_at: datetime | None = None
+    lock: asyncio.Lock = field(default_factory=asyncio.Lock, repr=False)
+
+
+class City4UAuthRegistry:  # pylint: disable=too-few-public-methods
+    """Hand out one shared City4UAuthState per (customer_id, username)."""
+
+    def __init__(self) -> None:
+        """Initialize the registry."""
+        self._states: dict[tuple[str, str], City4UAuthState] = {}
+
+    def get(self, customer_id: str, username: str) -> City4UAuthState:
+        """Return the auth state for an account, creating it if needed."""
+        key = (str(customer_id), username)
+        state = self._states.get(key)
+        if state is None:
+            state = self._states[key] = City4UAuthState()
+        return state
+
+
+class City4URequestLimiter:
+    """Limit concurrency and request rate across all API clients."""
+
+    def __init__(self, max_concurrency: int, requests_per_second: float) -> None:
+        """Initialize the limiter."""
+        self._max_concurrency = max_concurrency
+        self._semaphore = asyncio.Semaphore(max_concurrency)
+        self._min_spacing = 1.0 / requests_per_second
+        self._next_start = 0.0
+
+    def configure(self, max_concurrency: int, requests_per_second: float) -> None:
+        """Change the limits for requests that have not started yet."""
+        if max_concurrency != self._max_concurrency:
+            # Requests in flight release the semaphore they acquired
+            self._max_concurrency = max_concurrency
+            self._semaphore = asyncio.Semaphore(max_concurrency)
+        self._min_spacing = 1.0 / requests_per_second
+
+    @contextlib.asynccontextmanager
+    async def slot(self) -> AsyncIterator[None]:
+        """Wait for a free request slot and hold it for the request."""
+        async with self._semaphore:
+            # Reserve the next start time so requests are evenly spaced
+            now = time.monotonic()
+            start = max(now, self._next_start)
+            self._next_start = start + self._min_spacing
+            if start > now:
+                await asyncio.sleep(start - now)
+            yield
+
+
+class City4UApiClient:  # pylint: disable=too-many-instance-attributes
     """City4U API client."""
 
-    def __init__(
+    def __init__(  # pylint: disable=too-many-arguments
         self,
         credentials: City4UCredentials,
         session: aiohttp.ClientSession,
+        auth_state: City4UAuthState | None = None,
+        request_limiter: City4URequestLimiter | None = None,
+        json_decoder: JsonDecoder = DEFAULT_JSON_DECODER,
+        *,
+        timeouts: City4UTimeouts | None = None,
+        retry_policy: City4URetryPolicy | None = None,
+        circuit_breaker: City4UCircuitBreaker | None = None,
     ) -> None:
-        """Initialize the API client."""
+        """Initialize the API client.
+
+        Clients created with the same auth_state share one token, and at most
+        one of them logs in at a time. Clients sharing a request_limiter are
+        throttled together, and clients sharing a circuit_breaker stop
+        sending requests together while the host is down. json_decoder
+        parses raw response bodies.
+        """
         self._credentials = credentials
         self._session = session
-        self._token: str | None = None
-        self._token_expires_at: datetime | None = None
+        self._json_decoder = json_decoder
+        self._auth = auth_state if auth_state is not None else City4UAuthState()
+        self._request_limiter = request_limiter
+        self._timeout = (timeouts or City4UTimeouts()).client_timeout()
+        self._retry_policy = retry_policy or City4URetryPolicy()
+        self._circuit_breaker = circuit_breaker
         self._last_poll_time: datetime | None = None
+        self._last_reading_time: str | None = None
+        # Position in the append-only history of the records handed out
+        self._records_seen: int | None = None
+        self._last_record: list[Any] | None = None
+        # Validators of the last data payload, to detect an unchanged history
+        self._etag: str | None = None
+        self._last_modified: str | None = None
+        self._fingerprint: tuple[int, bytes] | None = None
+        # Payload downloaded elsewhere, served by the next fetch_new_readings
+        self._primed_payload: bytes | None = None
 
     @property
     def last_poll_time(self) -> datetime | None:
         """Return the last time data was polled."""
         return self._last_poll_time
 
+    @property
+    def last_reading_time(self) -> str | None:
+        """Return the newest readingTime handed out by fetch_new_readings."""
+        return self._last_reading_time
+
+    @property
+    def records_seen(self) -> int | None:
+        """Return how many records of the history were handed out."""
+        return self._records_seen
+
+    @property
+    def last_record(self) -> list[Any] | None:
+        """Return the readingTime and value of the last record handed out."""
+        return self._last_record
+
+    def reset_last_reading_time(
+        self,
+        reading_time: str | None = None,
+        records_seen: int | None = None,
+        last_record: list[Any] | None = None,
+    ) -> None:
+        """Reset the incremental fetch watermark.
+
+        Passing None makes the next fetch_new_readings call return the full
+        history again. records_seen and last_record restore the position in
+        the history, so records appended since then are found even when they
+        are backdated; without them, only readings newer than reading_time
+        are returned.
+        """
+        self._last_reading_time = reading_time
+        self._records_seen = records_seen
+        self._last_record = last_record
+        self._clear_payload_validators()
+
+    def _clear_payload_validators(self) -> None:
+        """Forget the last payload, so the next one is decoded in full."""
+        self._etag = None
+        self._last_modified = None
+        self._fingerprint = None
+
     @property
     def meter_number(self) -> str:
         """Return the meter number."""
@@ -55,27 +390,45 @@ class City4UApiClient:
 
     @property
     def token(self) -> str | None:
-        """Return the current token (for testing)."""
-        return self._token
+        """Return the current token."""
+        return self._auth.token
 
     @property
     def token_expires_at(self) -> datetime | None:
-        """Return when the token expires (for testing)."""
-        return self._token_expires_at
+        """Return when the token expires."""
+        return self._auth.expires_at
 
     def set_token(self, token: str | None, expires_at: datetime | None = None) -> None:
-        """Set the token (for testing)."""
-        self._token = token
-        self._token_expires_at = expires_at
+        """Set the token, e.g. when restoring a cached session."""
+        self._auth.token = token
+        self._auth.expires_at = expires_at
 
     def is_token_valid(self) -> bool:
         """Check if the current token is valid."""
-        if not self._token or not self._token_expires_at:
+        if not self._auth.token or not self._auth.expires_at:
             return False
 
         # Consider the token invalid if it will expire in the next 5 minutes
         now = datetime.now()
-        return self._token_expires_at > now + timedelta(minutes=5)
+        return self._auth.expires_at > now + timedelta(minutes=5)
+
+    def _request_slot(self) -> AbstractAsyncContextManager[None]:
+        """Return a context that holds a request slot, if throttled."""
+        if self._request_limiter is None:
+            return contextlib.nullcontext()
+        return self._request_limiter.slot()
+
+    async def _request_with_retries[T](
+        self, url: str, context: str, send: Callable[[], Awaitable[T]]
+    ) -> T:
+        """Run a request, retrying transient failures of the host."""
+        return await async_request_with_retries(
+            send,
+            host=urlsplit(url).hostname or url,
+            context=context,
+            retry_policy=self._retry_policy,
+            circuit_breaker=self._circuit_breaker,
+        )
 
     async def _parse_json_response(
         self,
@@ -87,14 +440,15 @@ class City4UApiClient:
         Raises aiohttp.ClientResponseError with a descriptive message on any
         failure so callers don't need to repeat this boilerplate.
         """
-        text = await response.text()
+        body = await response.read()
 
         if response.status != 200:
+            text = body[:500].decode(errors="replace")
             _LOGGER.error(
                 "%s failed with status %s: %s",
                 context,
                 response.status,
-                text[:500],
+                text,
             )
             raise aiohttp.ClientResponseError(
                 response.request_info,
@@ -104,13 +458,13 @@ class City4UApiClient:
             )
 
         try:
-            return json.loads(text)
+            return self._json_decoder(body)
         except (json.JSONDecodeError, ValueError) as json_err:
             _LOGGER.error(
                 "%s response is not valid JSON (got %s). Response body: %s",
                 context,
                 response.content_type,
-                text[:500],
+                body[:500].decode(errors="replace"),
             )
             raise aiohttp.ClientResponseError(
                 response.request_info,
@@ -122,7 +476,22 @@ class City4UApiClient:
             ) from json_err
 
     async def authenticate(self) -> None:
-        """Authenticate with City4U API."""
+        """Authenticate with City4U API.
+
+        Logins are single-flight per auth state: concurrent callers wait for
+        the login in progress and reuse its token instead of posting their own.
+        """
+        if self.is_token_valid():
+            return
+
+        async with self._auth.lock:
+            # Another client may have logged in while we waited for the lock
+            if self.is_token_valid():
+                return
+            await self._login()
+
+    async def _login(self) -> None:
+        """Post the LoginUser request and store the returned token."""
         # Use the exact payload format from the browser trace
         payload = {
             "ServiceName": "LoginUser",
@@ -137,15 +506,16 @@ class City4UApiClient:
             "Content-Type": "application/x-www-form-urlencoded",
         }
 
-        try:
-            _LOGGER.debug("Authenticating with City4U API...")
-            async with self._session.post(
-                LOGIN_URL,
-                data=payload,
-                headers=headers,
-                ssl=False,  # Disable SSL verification as in original code
-                timeout=aiohttp.ClientTimeout(total=30),
-            ) as response:
+        async def send() -> str:
+            async with (
+                self._request_slot(),
+                self._session.post(
+                    LOGIN_URL,
+                    data=payload,
+                    headers=headers,
+                    timeout=self._timeout,
+                ) as response,
+            ):
                 data = await self._parse_json_response(response, "Authentication")
                 user_token = data.get("UserToken")
                 if not user_token:
@@ -156,61 +526,231 @@ class City4UApiClient:
                         status=response.status,
                         message="No UserToken found in response",
                     )
+                return str(user_token)
 
-                self._token = user_token
-                # Set token expiration (default to 12 hours)
-                self._token_expires_at = datetime.now() + timedelta(
-                    minutes=TOKEN_EXPIRATION_MINUTES
-                )
-                _LOGGER.debug(
-                    "Successfully obtained token, expires at %s", self._token_expires_at
-                )
+        try:
+            _LOGGER.debug("Authenticating with City4U API...")
+            user_token = await self._request_with_retries(
+                LOGIN_URL, "Authentication", send
+            )
 
+            # Set token expiration (default to 12 hours)
+            self.set_token(
+                user_token,
+                datetime.now() + timedelta(minutes=TOKEN_EXPIRATION_MINUTES),
+            )
+            _LOGGER.debug(
+                "Successfully obtained token, expires at %s", self._auth.expires_at
+            )
+
+        except City4UCircuitOpenError:
+            raise
         except aiohttp.ClientError as err:
             _LOGGER.error("Error during authentication: %s", err)
             raise
 
-    async def fetch_water_data(self) -> list[dict[str, Any]]:
-        """Fetch water consumption data from City4U API."""
-        if not self._token:
+    async def _data_request(self) -> tuple[str, dict[str, str]]:
+        """Return the URL and headers for a data request, logging in if needed."""
+        if not self._auth.token:
             await self.authenticate()
 
         customer_id = str(self._credentials.customer_id)
-        if not self._token:
+        token = self._auth.token
+        if not token:
             raise aiohttp.ClientError("No authentication token available")
         headers: dict[str, str] = {
             "customerID": customer_id,
             "CustomerSite": customer_id,
             "UserName": self._credentials.username,
-            "token": self._token,
+            "token": token,
         }
 
-        data_url = DATA_URL_TEMPLATE % (customer_id, self._credentials.meter_number)
+        return (
+            DATA_URL_TEMPLATE % (customer_id, self._credentials.meter_number),
+            headers,
+        )
+
+    async def probe(self) -> tuple[Reading | None, bytes]:
+        """Return the first reading of the data payload, and the raw payload.
 
+        Used to validate credentials: only the first reading is decoded, and
+        the payload can be handed to the new entry's client with
+        prime_payload instead of being downloaded again.
+        """
+        # Without validators the server never answers "not modified"
+        self._clear_payload_validators()
+        async with contextlib.AsyncExitStack() as stack:
+            payload = await self._async_open_payload(stack)
+            body = (
+                b"".join([chunk async for chunk in payload.chunks]) if payload else b""
+            )
+
+        parser = JsonArrayStream(self._json_decoder)
         try:
-            _LOGGER.debug("Fetching water consumption data...")
-            async with self._session.get(
-                data_url,
-                headers=headers,
-                ssl=False,
-                timeout=aiohttp.ClientTimeout(total=30),
-            ) as response:
-                data: list[dict[str, Any]] = await self._parse_json_response(
-                    response, "Data fetch"
+            for start in range(0, len(body), STREAM_CHUNK_SIZE):
+                for item in parser.feed(body[start : start + STREAM_CHUNK_SIZE]):
+                    return Reading.from_api(item), body
+            for item in parser.close():
+                return Reading.from_api(item), body
+        except ValueError as err:
+            raise aiohttp.ClientPayloadError(
+                f"Data fetch returned invalid JSON: {err}"
+            ) from err
+        return None, body
+
+    def prime_payload(self, body: bytes) -> None:
+        """Serve a payload from probe on the next fetch_new_readings call."""
+        self._clear_payload_validators()
+        self._primed_payload = body
+
+    async def _async_open_payload(
+        self, stack: contextlib.AsyncExitStack
+    ) -> _DataPayload | None:
+        """Open the data payload, or return None if the server says it is unchanged.
+
+        The server's ETag and Last-Modified validators are sent back when it
+        supplied them, so an unchanged history can be answered with a 304.
+        The response is kept open on stack and its request slot held, while
+        the caller reads the body. Only opening the response is retried,
+        since a body that fails halfway is fetched again on the next poll.
+        """
+        if (body := self._primed_payload) is not None:
+            self._primed_payload = None
+            self._last_poll_time = datetime.now()
+            return _DataPayload(_async_iter_chunks(body), len(body))
+
+        data_url, headers = await self._data_request()
+        if self._etag:
+            headers[hdrs.IF_NONE_MATCH] = self._etag
+        if self._last_modified:
+            headers[hdrs.IF_MODIFIED_SINCE] = self._last_modified
+
+        async def send() -> aiohttp.ClientResponse | None:
+            async with contextlib.AsyncExitStack() as attempt:
+                await attempt.enter_async_context(self._request_slot())
+                response = await attempt.enter_async_context(
+                    self._session.get(
+                        data_url,
+                        headers=headers,
+                        timeout=self._timeout,
+                    )
                 )
-                self._last_poll_time = datetime.now()
-                _LOGGER.debug("Successfully fetched water consumption data")
-                return data
+                if response.status == 304:
+                    return None
+                if response.status != 200:
+                    # Reads the error body and raises
+                    await self._parse_json_response(response, "Data fetch")
+                # Keep the response open for the caller
+                stack.push_async_exit(attempt.pop_all())
+                return response
 
+        try:
+            _LOGGER.debug("Fetching water consumption data...")
+            response = await self._request_with_retries(data_url, "Data fetch", send)
+            self._last_poll_time = datetime.now()
+        except City4UCircuitOpenError:
+            raise
         except aiohttp.ClientError as err:
             _LOGGER.error("Error fetching water data: %s", err)
             raise
 
-    async def fetch_all_historical_data(self) -> list[dict[str, Any]]:
-        """Fetch all available historical water consumption data.
+        if response is None:
+            return None
+        return _DataPayload(
+            response.content.iter_chunked(STREAM_CHUNK_SIZE),
+            response.content_length,
+            response.headers.get(hdrs.ETAG),
+            response.headers.get(hdrs.LAST_MODIFIED),
+        )
+
+    async def _async_read_payload(
+        self, payload: _DataPayload, records: _NewRecords
+    ) -> bool:
+        """Feed the records of a payload to records as it downloads.
+
+        Returns False, without decoding anything, if the payload is the one
+        read last time. That is checked by the payload's length and a hash of
+        its tail, which changes whenever readings are appended. While the
+        payload may still turn out unchanged, its chunks are held back; once
+        it is known to differ, they are decoded as they arrive.
+        """
+        previous = self._fingerprint
+        parser = JsonArrayStream(self._json_decoder)
+        held: list[bytes] | None = None
+        if previous is not None and payload.length in (None, previous[0]):
+            held = []
+        length = 0
+        tail = b""
+
+        try:
+            async for chunk in payload.chunks:
+                length += len(chunk)
+                tail = (tail + chunk)[-PAYLOAD_FINGERPRINT_BYTES:]
+                if held is None:
+                    records.feed(parser.feed(chunk))
+                    continue
+                held.append(chunk)
+                if previous is not None and length > previous[0]:
+                    # Longer than the last payload, so it has changed
+                    records.feed(parser.feed(b"".join(held)))
+                    held = None
+
+            fingerprint = _payload_fingerprint(length, tail)
+            self._etag = payload.etag
+            self._last_modified = payload.last_modified
+            if held is not None:
+                if fingerprint == previous:
+                    return False
+                records.feed(parser.feed(b"".join(held)))
+            records.feed(parser.close())
+        except ValueError as err:
+            self._clear_payload_validators()
+            raise aiohttp.ClientPayloadError(
+                f"Data fetch returned invalid JSON: {err}"
+            ) from err
+        except aiohttp.ClientError as err:
+            _LOGGER.error("Error fetching water data: %s", err)
+            raise
 
-        This method fetches all readings available from the API.
-        The API returns all historical data by default.
+        self._fingerprint = fingerprint
+        return True
+
+    async def fetch_new_readings(self) -> list[Reading]:
+        """Fetch only the records added since the last call.
+
+        The ReadingMoneWater endpoint has no date range parameters, so the full
+        payload is still downloaded, but it is decoded as it downloads, and an
+        unchanged payload is not decoded at all. The history is append-only,
+        and backdated readings and adjustments of an existing readingTime are
+        appended too, so the records after the ones already returned are the
+        new ones. If the history was changed some other way, readings newer
+        than the last readingTime returned are used instead. Only the new
+        records are normalized into Reading objects. The first call returns
+        the full history.
         """
-        _LOGGER.info("Fetching all historical water consumption data...")
-        return await self.fetch_water_data()
+        records = _NewRecords(
+            self._records_seen, self._last_record, self._last_reading_time
+        )
+        async with contextlib.AsyncExitStack() as stack:
+            payload = await self._async_open_payload(stack)
+            if payload is None or not await self._async_read_payload(payload, records):
+                _LOGGER.debug("Water consumption data unchanged since the last poll")
+                return []
+
+        new_readings = [Reading.from_api(item) for item in records.new_items()]
+        self._records_seen = records.total
+        self._last_record = records.last_record
+        # Backdated records must not move the watermark back
+        reading_times = [
+            reading.reading_time
+            for reading in new_readings
+            if reading.reading_time is not None
+        ]
+        if self._last_reading_time is not None:
+            reading_times.append(self._last_reading_time)
+        self._last_reading_time = max(reading_times, default=None)
+
+        _LOGGER.debug(
+            "Fetched %d new readings (of %d total)", len(new_readings), records.total
+        )
+        return new_readings
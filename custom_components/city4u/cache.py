@@ -0,0 +1,88 @@
+"""Persistent reading cache for the City4U integration."""
+
+from __future__ import annotations
+
+import logging
+from datetime import datetime
+from typing import Any
+
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.storage import Store
+
+from .api import City4UApiClient
+from .const import CACHE_SAVE_DELAY, DOMAIN, STORAGE_VERSION
+from .readings import ReadingStore
+
+_LOGGER = logging.getLogger(__name__)
+
+
+class City4UReadingCache:
+    """Persist fetched readings and the session token for one config entry.
+
+    This lets setup serve the sensor from disk right away after a restart,
+    while the first refresh runs in the background.
+    """
+
+    def __init__(self, hass: HomeAssistant, entry_id: str) -> None:
+        """Initialize the cache."""
+        self._store: Store[dict[str, Any]] = Store(
+            hass, STORAGE_VERSION, f"{DOMAIN}.{entry_id}"
+        )
+
+    async def async_restore(self, api: City4UApiClient, store: ReadingStore) -> bool:
+        """Load cached state into the API client and reading store.
+
+        Returns True if cached readings were restored.
+        """
+        cached = await self._store.async_load()
+        if not cached:
+            return False
+
+        try:
+            store.restore(cached["readings"])
+            api.reset_last_reading_time(
+                cached.get("last_reading_time"),
+                cached.get("records_seen"),
+                cached.get("last_record"),
+            )
+
+            # Another entry of the same account may already hold a newer token
+            if not api.is_token_valid():
+                token_expires_at = cached.get("token_expires_at")
+                api.set_token(
+                    cached.get("token"),
+                    datetime.fromisoformat(token_expires_at)
+                    if token_expires_at
+                    else None,
+                )
+        except (KeyError, TypeError, ValueError) as err:
+            _LOGGER.warning("Ignoring invalid City4U reading cache: %s", err)
+            store.restore({})
+            api.reset_last_reading_time()
+            return False
+
+        _LOGGER.debug("Restored %d cached readings", len(store))
+        return bool(store)
+
+    @callback
+    def async_schedule_save(self, api: City4UApiClient, store: ReadingStore) -> None:
+        """Schedule writing the current state to disk."""
+
+        def _data_to_save() -> dict[str, Any]:
+            token_expires_at = api.token_expires_at
+            return {
+                "readings": store.as_dict(),
+                "last_reading_time": api.last_reading_time,
+                "records_seen": api.records_seen,
+                "last_record": api.last_record,
+                "token": api.token,
+                "token_expires_at": (
+                    token_expires_at.isoformat() if token_expires_at else None
+                ),
+            }
+
+        self._store.async_delay_save(_data_to_save, CACHE_SAVE_DELAY)
+
+    async def async_remove(self) -> None:
+        """Remove the cache from disk."""
+        await self._store.async_remove()
@@ -1,6 +1,7 @@
 """Config flow for City4U Water Consumption integration."""
 
 import logging
+from collections.abc import Mapping
 from typing import Any
 
 import aiohttp
@@ -8,18 +9,40 @@ import voluptuous as vol
 from homeassistant import config_entries
 from homeassistant.config_entries import ConfigFlowResult
 from homeassistant.const import CONF_PASSWORD, CONF_USERNAME
-from homeassistant.core import HomeAssistant
+from homeassistant.core import HomeAssistant, callback
 from homeassistant.exceptions import HomeAssistantError
-from homeassistant.helpers.aiohttp_client import async_get_clientsession
 from homeassistant.helpers.selector import (
+    SelectOptionDict,
     SelectSelector,
     SelectSelectorConfig,
     SelectSelectorMode,
 )
 
 from .api import City4UApiClient, City4UCredentials
-from .const import CONF_CUSTOMER_ID, CONF_METER_NUMBER, CONF_MUNICIPALITY, DOMAIN
-from .municipalities import MUNICIPALITIES_SORTED_HE
+from .const import (
+    CONF_AUTO_IMPORT_STATISTICS,
+    CONF_CONNECT_TIMEOUT,
+    CONF_CUSTOMER_ID,
+    CONF_MAX_CONCURRENT_REQUESTS,
+    CONF_MAX_REQUESTS_PER_SECOND,
+    CONF_METER_NUMBER,
+    CONF_MUNICIPALITY,
+    CONF_READ_TIMEOUT,
+    CONF_TOTAL_TIMEOUT,
+    DEFAULT_CONNECT_TIMEOUT,
+    DEFAULT_MAX_CONCURRENT_REQUESTS,
+    DEFAULT_MAX_REQUESTS_PER_SECOND,
+    DEFAULT_READ_TIMEOUT,
+    DEFAULT_TOTAL_TIMEOUT,
+    DOMAIN,
+    MAX_CONCURRENT_REQUESTS,
+    MAX_REQUESTS_PER_SECOND,
+    MUNICIPALITY_CHOICES,
+)
+from .handoff import City4USetupHandoff, async_store_handoff
+from .municipalities import Municipality
+from .search import SearchMatch, async_get_search_index, confident_match
+from .session import async_get_session
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -29,7 +52,7 @@ async def validate_input(hass: HomeAssistant, data: dict[str, Any]) -> dict[str,
 
     Data has the keys from DATA_SCHEMA with values provided by the user.
     """
-    session = async_get_clientsession(hass)
+    session = async_get_session(hass)
 
     # Verify that we can log in
     credentials = City4UCredentials(
@@ -49,14 +72,24 @@ async def validate_input(hass: HomeAssistant, data: dict[str, Any]) -> dict[str,
         _LOGGER.error("Connection error: %s", err)
         raise CannotConnect from err
 
-    # Test data fetching
+    # Check the meter has data, decoding only its first reading
     try:
-        water_data = await api.fetch_water_data()
-        if not water_data:
-            raise CannotFetchData("No data returned")
+        first_reading, payload = await api.probe()
     except Exception as err:
         _LOGGER.error("Failed to fetch water data: %s", err)
         raise CannotFetchData from err
+    if first_reading is None:
+        _LOGGER.error("Failed to fetch water data: no readings returned")
+        raise CannotFetchData("No data returned")
+
+    # The new entry's setup reuses the login and payload
+    async_store_handoff(
+        hass,
+        credentials,
+        City4USetupHandoff(
+            token=api.token, expires_at=api.token_expires_at, payload=payload
+        ),
+    )
 
     # Return info to be stored in the config entry
     return {
@@ -69,9 +102,18 @@ class ConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):  # pylint: disable=a
 
     VERSION = 1
 
+    @staticmethod
+    @callback
+    def async_get_options_flow(
+        config_entry: config_entries.ConfigEntry,
+    ) -> config_entries.OptionsFlow:
+        """Get the options flow for this handler."""
+        return OptionsFlowHandler()
+
     def __init__(self) -> None:
         """Initialize the config flow."""
-        self._municipality_map: dict[str, str] = {}
+        self._user_input: dict[str, Any] = {}
+        self._matches: list[SearchMatch] = []
 
     async def async_step_user(
         self, user_input: dict[str, Any] | None = None
@@ -79,35 +121,124 @@ class ConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):  # pylint: disable=a
         """Handle the initial step."""
         errors = {}
 
-        # Create municipality selector options on first call
-        if not self._municipality_map:
-            self._municipality_map = {
-                str(m.name_he): str(m.customer_id) for m in MUNICIPALITIES_SORTED_HE
-            }
+        if user_input is not None:
+            # Resolve the typed name or customer ID to ranked municipalities
+            search_index = await async_get_search_index(self.hass)
+            self._user_input = user_input
+            self._matches = search_index.search(
+                user_input[CONF_MUNICIPALITY], limit=MUNICIPALITY_CHOICES
+            )
+            municipality = confident_match(self._matches)
+            if municipality is not None:
+                return await self._async_create_meter(municipality)
+            if self._matches:
+                return await self.async_step_municipality()
+            errors["base"] = "unknown_municipality"
+
+        return self._async_show_user_form(errors)
 
+    async def async_step_municipality(
+        self, user_input: dict[str, Any] | None = None
+    ) -> ConfigFlowResult:
+        """Let the user pick one of the municipalities matching the name."""
         if user_input is not None:
-            # Convert municipality selection to customer_id
-            if CONF_MUNICIPALITY in user_input:
-                municipality_label = user_input[CONF_MUNICIPALITY]
-                user_input[CONF_CUSTOMER_ID] = self._municipality_map[
-                    municipality_label
-                ]
-                del user_input[CONF_MUNICIPALITY]
-
-            # Default meter number to username if not provided
-            if not user_input.get(CONF_METER_NUMBER):
-                user_input[CONF_METER_NUMBER] = user_input[CONF_USERNAME]
+            customer_id = user_input[CONF_CUSTOMER_ID]
+            for match in self._matches:
+                if str(match.municipality.customer_id) == customer_id:
+                    return await self._async_create_meter(match.municipality)
 
-            try:
-                info = await validate_input(self.hass, user_input)
+        return self.async_show_form(
+            step_id="municipality",
+            data_schema=vol.Schema(
+                {
+                    vol.Required(CONF_CUSTOMER_ID): SelectSelector(
+                        SelectSelectorConfig(
+                            options=[
+                                SelectOptionDict(
+                                    value=str(match.municipality.customer_id),
+                                    label=match.municipality.name_he,
+                                )
+                                for match in self._matches
+                            ],
+                            mode=SelectSelectorMode.LIST,
+                        )
+                    ),
+                }
+            ),
+            description_placeholders={
+                CONF_MUNICIPALITY: self._user_input[CONF_MUNICIPALITY]
+            },
+        )
+
+    async def _async_create_meter(self, municipality: Municipality) -> ConfigFlowResult:
+        """Validate the credentials against municipality and create the entry."""
+        errors = {}
+        data = {
+            key: value
+            for key, value in self._user_input.items()
+            if key != CONF_MUNICIPALITY
+        }
+        data[CONF_CUSTOMER_ID] = str(municipality.customer_id)
+        # Default meter number to username if not provided
+        if not data.get(CONF_METER_NUMBER):
+            data[CONF_METER_NUMBER] = data[CONF_USERNAME]
+
+        try:
+            info = await validate_input(self.hass, data)
+        except CannotConnect:
+            errors["base"] = "cannot_connect"
+        except InvalidAuth:
+            errors["base"] = "invalid_auth"
+        except CannotFetchData:
+            errors["base"] = "cannot_fetch_data"
+        except Exception:  # pylint: disable=broad-except
+            _LOGGER.exception("Unexpected exception")
+            errors["base"] = "unknown"
+        else:
+            # Check if entry already exists with these credentials
+            await self.async_set_unique_id(
+                f"{data[CONF_CUSTOMER_ID]}_{data[CONF_METER_NUMBER]}"
+            )
+            self._abort_if_unique_id_configured()
 
-                # Check if entry already exists with these credentials
-                await self.async_set_unique_id(
-                    f"{user_input[CONF_CUSTOMER_ID]}_{user_input[CONF_METER_NUMBER]}"
-                )
-                self._abort_if_unique_id_configured()
+            return self.async_create_entry(title=info["title"], data=data)
 
-                return self.async_create_entry(title=info["title"], data=user_input)
+        return self._async_show_user_form(errors)
+
+    @callback
+    def _async_show_user_form(self, errors: dict[str, str]) -> ConfigFlowResult:
+        """Show the credentials form."""
+        return self.async_show_form(
+            step_id="user",
+            data_schema=vol.Schema(
+                {
+                    vol.Required(CONF_USERNAME): str,
+                    vol.Required(CONF_PASSWORD): str,
+                    # Typed in Hebrew or English, or given as a customer ID
+                    vol.Required(CONF_MUNICIPALITY): str,
+                    vol.Optional(CONF_METER_NUMBER): str,
+                }
+            ),
+            errors=errors,
+        )
+
+    async def async_step_reauth(
+        self, _entry_data: Mapping[str, Any]
+    ) -> ConfigFlowResult:
+        """Handle credentials the server no longer accepts."""
+        return await self.async_step_reauth_confirm()
+
+    async def async_step_reauth_confirm(
+        self, user_input: dict[str, Any] | None = None
+    ) -> ConfigFlowResult:
+        """Ask for the account's new password."""
+        errors = {}
+        entry = self._get_reauth_entry()
+
+        if user_input is not None:
+            data = {**entry.data, CONF_PASSWORD: user_input[CONF_PASSWORD]}
+            try:
+                await validate_input(self.hass, data)
             except CannotConnect:
                 errors["base"] = "cannot_connect"
             except InvalidAuth:
@@ -117,26 +248,73 @@ class ConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):  # pylint: disable=a
             except Exception:  # pylint: disable=broad-except
                 _LOGGER.exception("Unexpected exception")
                 errors["base"] = "unknown"
+            else:
+                return self.async_update_reload_and_abort(entry, data=data)
 
-        # Create municipality selector options
-        municipality_options = list(self._municipality_map.keys())
+        return self.async_show_form(
+            step_id="reauth_confirm",
+            data_schema=vol.Schema({vol.Required(CONF_PASSWORD): str}),
+            description_placeholders={"username": entry.data[CONF_USERNAME]},
+            errors=errors,
+        )
 
+
+class OptionsFlowHandler(config_entries.OptionsFlow):
+    """Handle City4U options."""
+
+    async def async_step_init(
+        self, user_input: dict[str, Any] | None = None
+    ) -> ConfigFlowResult:
+        """Manage the options."""
+        if user_input is not None:
+            return self.async_create_entry(data=user_input)
+
+        options = self.config_entry.options
+        timeout = vol.All(vol.Coerce(int), vol.Range(min=1, max=600))
         return self.async_show_form(
-            step_id="user",
+            step_id="init",
             data_schema=vol.Schema(
                 {
-                    vol.Required(CONF_USERNAME): str,
-                    vol.Required(CONF_PASSWORD): str,
-                    vol.Required(CONF_MUNICIPALITY): SelectSelector(
-                        SelectSelectorConfig(
-                            options=municipality_options,
-                            mode=SelectSelectorMode.DROPDOWN,
-                        )
+                    vol.Optional(
+                        CONF_AUTO_IMPORT_STATISTICS,
+                        default=options.get(CONF_AUTO_IMPORT_STATISTICS, False),
+                    ): bool,
+                    vol.Optional(
+                        CONF_CONNECT_TIMEOUT,
+                        default=options.get(
+                            CONF_CONNECT_TIMEOUT, DEFAULT_CONNECT_TIMEOUT
+                        ),
+                    ): timeout,
+                    vol.Optional(
+                        CONF_READ_TIMEOUT,
+                        default=options.get(CONF_READ_TIMEOUT, DEFAULT_READ_TIMEOUT),
+                    ): timeout,
+                    vol.Optional(
+                        CONF_TOTAL_TIMEOUT,
+                        default=options.get(CONF_TOTAL_TIMEOUT, DEFAULT_TOTAL_TIMEOUT),
+                    ): timeout,
+                    vol.Optional(
+                        CONF_MAX_CONCURRENT_REQUESTS,
+                        default=options.get(
+                            CONF_MAX_CONCURRENT_REQUESTS,
+                            DEFAULT_MAX_CONCURRENT_REQUESTS,
+                        ),
+                    ): vol.All(
+                        vol.Coerce(int),
+                        vol.Range(min=1, max=MAX_CONCURRENT_REQUESTS),
+                    ),
+                    vol.Optional(
+                        CONF_MAX_REQUESTS_PER_SECOND,
+                        default=options.get(
+                            CONF_MAX_REQUESTS_PER_SECOND,
+                            DEFAULT_MAX_REQUESTS_PER_SECOND,
+                        ),
+                    ): vol.All(
+                        vol.Coerce(float),
+                        vol.Range(min=0.1, max=MAX_REQUESTS_PER_SECOND),
                     ),
-                    vol.Optional(CONF_METER_NUMBER): str,
                 }
             ),
-            errors=errors,
         )
 
 
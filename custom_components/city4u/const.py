@@ -3,10 +3,28 @@
 # Domain
 DOMAIN = "city4u"
 
+# hass.data keys for state shared by all config entries
+DATA_AUTH_REGISTRY = f"{DOMAIN}_auth"
+DATA_ACCOUNTS = f"{DOMAIN}_accounts"
+DATA_REQUEST_LIMITER = f"{DOMAIN}_request_limiter"
+DATA_IMPORT_LOCK = f"{DOMAIN}_import_lock"
+DATA_CIRCUIT_BREAKER = f"{DOMAIN}_circuit_breaker"
+DATA_SESSION = f"{DOMAIN}_session"
+DATA_MUNICIPALITIES = f"{DOMAIN}_municipalities"
+DATA_MUNICIPALITY_SEARCH = f"{DOMAIN}_municipality_search"
+DATA_SETUP_HANDOFFS = f"{DOMAIN}_setup_handoffs"
+
 # Configuration and options
 CONF_CUSTOMER_ID = "customer_id"
 CONF_METER_NUMBER = "meter_number"
 CONF_MUNICIPALITY = "municipality"
+MUNICIPALITY_CHOICES = 10  # best matches offered for an ambiguous municipality
+CONF_AUTO_IMPORT_STATISTICS = "auto_import_statistics"
+CONF_CONNECT_TIMEOUT = "connect_timeout"
+CONF_READ_TIMEOUT = "read_timeout"
+CONF_TOTAL_TIMEOUT = "total_timeout"
+CONF_MAX_CONCURRENT_REQUESTS = "max_concurrent_requests"
+CONF_MAX_REQUESTS_PER_SECOND = "max_requests_per_second"
 
 # API URLs
 LOGIN_URL = "https://city4u.co.il/WebApiUsersManagement/v1/UsrManagements/LoginUser"
@@ -18,7 +36,46 @@ CUSTOMERS_URL = "https://city4u.co.il/WebApi_portal/v1/Customers/Customer/allcus
 # Default values
 DEFAULT_NAME = "City4U Water Consumption"
 SCAN_INTERVAL = 3600  # 1 hour
+MIN_SCAN_INTERVAL = 900  # 15 minutes, around an expected reading
+MAX_SCAN_INTERVAL = 21600  # 6 hours, while no reading is expected
+CADENCE_SAMPLE_SIZE = 20  # recent readings used to learn a meter's cadence
+
+# Limits on traffic to city4u.co.il across all config entries. The strictest
+# limits set in any entry's options apply to all of them.
+DEFAULT_MAX_CONCURRENT_REQUESTS = 4
+DEFAULT_MAX_REQUESTS_PER_SECOND = 2.0
+MAX_CONCURRENT_REQUESTS = 16  # highest allowed option, and connections per host
+MAX_REQUESTS_PER_SECOND = 20.0  # highest allowed option
+# Seconds to wait for other meters of an account. Coordinators due in the
+# same slot fire up to two seconds apart, as their timers are rounded.
+ACCOUNT_BATCH_WINDOW = 2.0
+ACCOUNT_POLL_SLOT = MIN_SCAN_INTERVAL  # seconds between an account's poll slots
+KEEPALIVE_TIMEOUT = 60  # seconds an idle connection outlives an account batch
+DNS_CACHE_TTL = 600  # seconds, city4u.co.il is resolved a few times an hour
 TOKEN_EXPIRATION_MINUTES = 720  # 12 hours
+SETUP_HANDOFF_TTL = 300  # seconds a validated login waits for its entry's setup
+STREAM_CHUNK_SIZE = 65536  # bytes of a payload decoded at a time
+PAYLOAD_FINGERPRINT_BYTES = 4096  # tail bytes hashed to spot unchanged payloads
+MAX_STORED_READINGS = 100_000  # Roughly 10 years of hourly readings per meter
+READING_TIME_CACHE_SIZE = 1024  # parsed reading times kept for repeated strings
+
+# Request timeouts (seconds) and retries of transient failures
+DEFAULT_CONNECT_TIMEOUT = 10
+DEFAULT_READ_TIMEOUT = 30  # longest wait for any single socket read
+DEFAULT_TOTAL_TIMEOUT = 60
+RETRY_ATTEMPTS = 3
+RETRY_BASE_DELAY = 1.0  # seconds, doubled on every retry
+RETRY_MAX_DELAY = 30.0
+BREAKER_FAILURE_THRESHOLD = 5  # consecutive failures before fast-failing a host
+BREAKER_RECOVERY_TIME = 300  # seconds between recovery probes
+
+# Long-term statistics import
+IMPORT_BATCH_HOURS = 744  # hours per recorder batch, about one month
+DEFAULT_IMPORT_PARALLEL = 4  # entries prepared for import at the same time
+
+# Persistent reading cache
+STORAGE_VERSION = 1
+CACHE_SAVE_DELAY = 60  # seconds
 
 # Icons
 ICON = "mdi:water"
@@ -30,6 +87,14 @@ UNIT_OF_MEASUREMENT = "m³"
 ATTR_READING_TIME = "reading_time"
 ATTR_LAST_POLLED = "last_polled"
 
+# Service call attributes
+ATTR_ENTRY_ID = "entry_id"
+ATTR_METER_NUMBER = "meter_number"
+ATTR_MAX_PARALLEL = "max_parallel"
+
+# Dispatcher signal sent after every successful poll of an entry
+SIGNAL_POLLED = f"{DOMAIN}_polled_{{}}"
+
 # Attributes to exclude from extra_state_attributes (lowercase for case-insensitive matching)
 # These are either shown as state, as custom attributes, or in device info
 EXCLUDED_ATTRIBUTES_LOWER = {
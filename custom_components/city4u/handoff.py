@@ -0,0 +1,84 @@
+"""Hand a validated login from the config flow to the new entry's setup."""
+
+from __future__ import annotations
+
+import logging
+from dataclasses import dataclass, field
+from datetime import datetime
+
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
+from homeassistant.helpers.event import async_call_later
+
+from .api import City4UApiClient, City4UCredentials
+from .const import DATA_SETUP_HANDOFFS, SETUP_HANDOFF_TTL
+
+_LOGGER = logging.getLogger(__name__)
+
+type _HandoffKey = tuple[str, str, str]
+
+
+@dataclass(frozen=True, slots=True)
+class City4USetupHandoff:
+    """The token and data payload obtained while validating credentials."""
+
+    token: str | None
+    expires_at: datetime | None
+    payload: bytes = field(repr=False)
+
+    def apply(self, api: City4UApiClient) -> None:
+        """Let api reuse the token and payload instead of fetching them again."""
+        # Another entry of the same account may already hold a newer token
+        if not api.is_token_valid():
+            api.set_token(self.token, self.expires_at)
+        api.prime_payload(self.payload)
+
+
+def _handoff_key(credentials: City4UCredentials) -> _HandoffKey:
+    """Return the key of a meter's handoff."""
+    return (
+        str(credentials.customer_id),
+        credentials.username,
+        credentials.meter_number,
+    )
+
+
+@callback
+def async_store_handoff(
+    hass: HomeAssistant, credentials: City4UCredentials, handoff: City4USetupHandoff
+) -> None:
+    """Keep a handoff for the meter's setup, for SETUP_HANDOFF_TTL seconds.
+
+    Handoffs of flows that end without creating an entry expire unused, so
+    their payload is not held on to.
+    """
+    handoffs: dict[_HandoffKey, tuple[City4USetupHandoff, CALLBACK_TYPE]] = (
+        hass.data.setdefault(DATA_SETUP_HANDOFFS, {})
+    )
+    key = _handoff_key(credentials)
+    if (previous := handoffs.pop(key, None)) is not None:
+        previous[1]()
+
+    @callback
+    def _async_expire(_now: datetime) -> None:
+        if handoffs.pop(key, None) is not None:
+            _LOGGER.debug("Setup handoff for meter %s expired", key[2])
+
+    handoffs[key] = (
+        handoff,
+        async_call_later(hass, SETUP_HANDOFF_TTL, _async_expire),
+    )
+
+
+@callback
+def async_pop_handoff(
+    hass: HomeAssistant, credentials: City4UCredentials
+) -> City4USetupHandoff | None:
+    """Return and forget the meter's handoff, if it has not expired."""
+    handoffs: dict[_HandoffKey, tuple[City4USetupHandoff, CALLBACK_TYPE]] = (
+        hass.data.get(DATA_SETUP_HANDOFFS, {})
+    )
+    if (stored := handoffs.pop(_handoff_key(credentials), None)) is None:
+        return None
+    handoff, cancel_expiry = stored
+    cancel_expiry()
+    return handoff
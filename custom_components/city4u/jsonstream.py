@@ -0,0 +1,71 @@
+"""Incremental parsing of JSON arrays for the City4U integration."""
+
+from __future__ import annotations
+
+import json
+from collections.abc import Callable
+from typing import Any
+
+_WHITESPACE = b" \t\n\r"
+
+
+class JsonArrayStream:
+    """Parse the items of a top-level JSON array from byte chunks.
+
+    Each chunk is cut after the last complete item it holds, and the items up
+    to the cut are decoded together with decoder, so a fast decoder such as
+    orjson does the work instead of Python code. The rest waits for the next
+    chunk, so the whole document is never held in memory at once. Items are
+    expected to be objects.
+    """
+
+    def __init__(self, decoder: Callable[[bytes], Any] = json.loads) -> None:
+        """Initialize the parser."""
+        self._decoder = decoder
+        self._buffer = b""
+        self._started = False
+        self._finished = False
+
+    def feed(self, chunk: bytes) -> list[Any]:
+        """Add a chunk and return the items it completed."""
+        self._buffer += chunk
+        return self._parse()
+
+    def close(self) -> list[Any]:
+        """Finish parsing, raising ValueError if the array is incomplete."""
+        items = self._parse()
+        if not self._finished or self._buffer.strip(_WHITESPACE):
+            raise ValueError("Incomplete or invalid JSON array")
+        return items
+
+    def _parse(self) -> list[Any]:
+        """Decode the complete items at the start of the buffer."""
+        buffer = self._buffer.lstrip(_WHITESPACE)
+        if not self._started:
+            if not buffer:
+                return []
+            if buffer[:1] != b"[":
+                raise ValueError(f"Expected a JSON array, got {buffer[:1]!r}")
+            self._started = True
+            buffer = buffer[1:]
+
+        items: list[Any] = []
+        if not self._finished:
+            # The buffer starts at an item, or at the separator before one
+            if buffer[:1] == b",":
+                buffer = buffer[1:].lstrip(_WHITESPACE)
+            # A "}" inside a string or a nested object leaves the cut invalid,
+            # and the items wait for a later chunk
+            end = buffer.rfind(b"}") + 1
+            if end:
+                try:
+                    items = self._decoder(b"[" + buffer[:end] + b"]")
+                except ValueError:
+                    end = 0
+            buffer = buffer[end:].lstrip(_WHITESPACE)
+            if buffer[:1] == b"]":
+                self._finished = True
+                buffer = buffer[1:]
+
+        self._buffer = buffer
+        return items
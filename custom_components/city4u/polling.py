@@ -0,0 +1,90 @@
+"""Poll scheduling helpers for the City4U integration."""
+
+from __future__ import annotations
+
+import hashlib
+import logging
+from collections import deque
+from collections.abc import Iterable
+from datetime import timedelta
+from itertools import pairwise
+from statistics import median
+
+from .const import CADENCE_SAMPLE_SIZE
+from .readings import ReadingStore
+
+_LOGGER = logging.getLogger(__name__)
+
+
+def poll_offset(key: str, keys: Iterable[str], interval: timedelta) -> timedelta:
+    """Return key's offset when keys are spread evenly over interval.
+
+    Keys are ordered by a hash rather than by name or by when they were
+    added, so the order is stable across restarts and neighbouring keys do
+    not get neighbouring slots.
+    """
+    ordered = sorted(set(keys) | {key}, key=_poll_order)
+    return interval * ordered.index(key) / len(ordered)
+
+
+def _poll_order(key: str) -> bytes:
+    """Return the sort key that orders poll keys."""
+    return hashlib.sha256(key.encode()).digest()
+
+
+class AdaptivePollInterval:  # pylint: disable=too-few-public-methods
+    """Pick a meter's next poll interval from its observed reading cadence.
+
+    The cadence is the median gap between recent reading times, and the lag is
+    the median delay between a reading's time and the poll that first saw it.
+    Polls are pushed out until the next reading is expected, repeated at the
+    minimum interval around the expected arrival, and backed off again the
+    longer a reading is overdue.
+    """
+
+    def __init__(
+        self,
+        base_interval: timedelta,
+        min_interval: timedelta,
+        max_interval: timedelta,
+    ) -> None:
+        """Initialize the interval estimator."""
+        self._base = base_interval.total_seconds()
+        self._min = min_interval.total_seconds()
+        self._max = max_interval.total_seconds()
+        self._lags: deque[float] = deque(maxlen=CADENCE_SAMPLE_SIZE)
+
+    def next_interval(self, store: ReadingStore, added: int, now: float) -> timedelta:
+        """Return the interval until the next poll.
+
+        added is the number of readings the latest poll stored and now is the
+        current POSIX timestamp.
+        """
+        timestamps = store.tail_timestamps(CADENCE_SAMPLE_SIZE + 1)
+        if added and timestamps:
+            self._lags.append(max(now - timestamps[-1], 0.0))
+
+        gaps = [later - earlier for earlier, later in pairwise(timestamps)]
+        gaps = [gap for gap in gaps if gap > 0]
+        if len(gaps) < 2:
+            return timedelta(seconds=self._base)
+
+        cadence = median(gaps)
+        lag = median(self._lags) if self._lags else 0.0
+        until_expected = timestamps[-1] + cadence + lag - now
+
+        if until_expected > 0:
+            # Nothing new is expected before then, so sleep until it is
+            seconds = until_expected
+        else:
+            # Overdue: poll often right after the expected time, then back off
+            seconds = min(-until_expected / 2, self._base)
+
+        seconds = min(max(seconds, self._min), self._max)
+        _LOGGER.debug(
+            "Reading cadence %.0fs, lag %.0fs, next poll in %.0fs",
+            cadence,
+            lag,
+            seconds,
+        )
+        return timedelta(seconds=seconds)
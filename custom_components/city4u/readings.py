@@ -0,0 +1,166 @@
+"""Compact in-memory store for City4U meter readings."""
+
+from __future__ import annotations
+
+import logging
+from array import array
+from bisect import bisect_left, bisect_right
+from collections.abc import Iterable, Iterator, Sequence
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta
+from typing import Any
+
+from homeassistant.util import dt as dt_util
+
+from .api import Reading
+
+_LOGGER = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True, slots=True)
+class ReadingSnapshot:
+    """Immutable view of a store's newest reading, used as coordinator data.
+
+    Snapshots compare equal when the newest reading is unchanged, which lets
+    the coordinator skip notifying listeners after polls with no new data.
+    """
+
+    store: ReadingStore = field(compare=False, repr=False)
+    reading: Reading | None
+
+    @property
+    def time(self) -> datetime | None:
+        """Return the UTC time of the newest reading."""
+        return self.reading.time if self.reading else None
+
+    @property
+    def value(self) -> float | None:
+        """Return the value of the newest reading."""
+        return self.reading.value if self.reading else None
+
+
+class ReadingStore:
+    """Array-backed store of (timestamp, value) readings for a single meter.
+
+    Readings are kept as two parallel arrays of doubles sorted by timestamp,
+    instead of Reading objects. Only the most recently added reading is kept
+    whole, for the sensor's device info and extra attributes.
+    """
+
+    __slots__ = (
+        "_latest",
+        "_max_age",
+        "_max_readings",
+        "_timestamps",
+        "_values",
+    )
+
+    def __init__(
+        self,
+        max_readings: int | None = None,
+        max_age: timedelta | None = None,
+    ) -> None:
+        """Initialize the store with optional retention limits."""
+        self._max_readings = max_readings
+        self._max_age = max_age
+        self._timestamps = array("d")
+        self._values = array("d")
+        self._latest: Reading | None = None
+
+    def __len__(self) -> int:
+        """Return the number of stored readings."""
+        return len(self._timestamps)
+
+    def __bool__(self) -> bool:
+        """Return True if the store holds any data at all."""
+        return self._latest is not None or len(self._timestamps) > 0
+
+    def __iter__(self) -> Iterator[tuple[datetime, float]]:
+        """Iterate over (UTC reading time, value) pairs, oldest first."""
+        for timestamp, value in zip(self._timestamps, self._values, strict=True):
+            yield dt_util.utc_from_timestamp(timestamp), value
+
+    @property
+    def latest(self) -> Reading | None:
+        """Return the most recently added reading."""
+        return self._latest
+
+    def snapshot(self) -> ReadingSnapshot:
+        """Return an immutable view of the newest reading."""
+        return ReadingSnapshot(store=self, reading=self._latest)
+
+    def columns(self) -> tuple[Sequence[float], Sequence[float]]:
+        """Return the sorted timestamps and their values, which must not be modified."""
+        return self._timestamps, self._values
+
+    def tail_timestamps(self, count: int) -> list[float]:
+        """Return the POSIX timestamps of up to count newest readings."""
+        return self._timestamps[-count:].tolist() if count > 0 else []
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return a JSON-serializable snapshot of the store."""
+        return {
+            "timestamps": self._timestamps.tolist(),
+            "values": self._values.tolist(),
+            "latest_raw": self._latest.raw if self._latest else None,
+        }
+
+    def restore(self, data: dict[str, Any]) -> None:
+        """Replace the store contents with a snapshot from as_dict."""
+        timestamps = array("d", data.get("timestamps", []))
+        values = array("d", data.get("values", []))
+        if len(timestamps) != len(values):
+            raise ValueError("Mismatched timestamps and values in snapshot")
+
+        self._timestamps = timestamps
+        self._values = values
+        latest_raw = data.get("latest_raw")
+        self._latest = Reading.from_api(latest_raw) if latest_raw is not None else None
+        self._apply_retention()
+
+    def extend(self, readings: Iterable[Reading]) -> int:
+        """Add readings to the store and return how many were stored.
+
+        The last reading in API order becomes the latest reading, matching how
+        the API lists adjustments after the readings they replace.
+        """
+        added = 0
+        latest: Reading | None = None
+
+        for reading in readings:
+            latest = reading
+            if reading.time is None or reading.value is None:
+                continue
+            self._insert(reading.time.timestamp(), reading.value)
+            added += 1
+
+        if latest is not None:
+            self._latest = latest
+
+        if added:
+            self._apply_retention()
+
+        return added
+
+    def _insert(self, timestamp: float, value: float) -> None:
+        """Insert a reading keeping the arrays sorted by timestamp."""
+        index = bisect_right(self._timestamps, timestamp)
+        if index == len(self._timestamps):
+            # Fast path: readings almost always arrive in chronological order
+            self._timestamps.append(timestamp)
+            self._values.append(value)
+        else:
+            self._timestamps.insert(index, timestamp)
+            self._values.insert(index, value)
+
+    def _apply_retention(self) -> None:
+        """Drop the oldest readings that exceed the retention limits."""
+        drop = 0
+        if self._max_age is not None and self._timestamps:
+            cutoff = self._timestamps[-1] - self._max_age.total_seconds()
+            drop = bisect_left(self._timestamps, cutoff)
+        if self._max_readings is not None:
+            drop = max(drop, len(self._timestamps) - self._max_readings)
+        if drop > 0:
+            del self._timestamps[:drop]
+            del self._values[:drop]
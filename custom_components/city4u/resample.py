@@ -0,0 +1,88 @@
+"""Hourly resampling of City4U meter readings for long-term statistics."""
+
+from __future__ import annotations
+
+from bisect import bisect_right
+from collections.abc import Iterator, Sequence
+from typing import NamedTuple
+
+HOUR = 3600.0
+
+
+class HourlyStatistic(NamedTuple):
+    """Meter state and cumulative consumption at the end of one hour."""
+
+    start: float
+    state: float
+    sum: float
+
+
+def floor_hour(timestamp: float) -> float:
+    """Return the POSIX timestamp of the start of the hour containing timestamp."""
+    return timestamp - timestamp % HOUR
+
+
+def hourly_statistics(  # pylint: disable=too-many-locals
+    timestamps: Sequence[float],
+    values: Sequence[float],
+    resume: HourlyStatistic | None = None,
+) -> Iterator[HourlyStatistic]:
+    """Resample sorted meter readings into hour-aligned statistics.
+
+    Each statistic covers the hour starting at start: state is the meter value
+    at the end of the hour and sum is the consumption accumulated since the
+    first reading. Hours between readings get the meter value interpolated
+    linearly at the hour boundary, so consumption is spread over gaps. A reading
+    lower than the one before it is a meter reset, and counts as consumption
+    from zero; boundaries before a reset carry the previous value forward.
+
+    Only hours that have ended by the last reading are emitted. When resume is
+    the last statistic already recorded, emission continues with the hour after
+    it and its state and sum carry on from there. The readings are walked once.
+    """
+    if not timestamps:
+        return
+
+    if resume is None:
+        start = floor_hour(timestamps[0])
+        index = 0
+        current = values[0]
+        total = 0.0
+    else:
+        start = floor_hour(resume.start) + HOUR
+        index = bisect_right(timestamps, start)
+        current = resume.state
+        total = resume.sum
+
+    # The reading that interpolation between boundaries starts from
+    if index:
+        anchor_time, anchor_value = timestamps[index - 1], values[index - 1]
+    else:
+        anchor_time, anchor_value = start, current
+
+    count = len(timestamps)
+    last_hour = floor_hour(timestamps[-1])
+    hour = start
+    while hour < last_hour:
+        hour_end = hour + HOUR
+
+        # Readings within the hour
+        while index < count and timestamps[index] <= hour_end:
+            value = values[index]
+            total += value - current if value >= current else value
+            current = value
+            anchor_time, anchor_value = timestamps[index], value
+            index += 1
+
+        # Interpolate the meter value at the end of the hour
+        if index < count and anchor_time < hour_end:
+            next_value = values[index]
+            if next_value >= anchor_value:
+                fraction = (hour_end - anchor_time) / (timestamps[index] - anchor_time)
+                boundary = anchor_value + (next_value - anchor_value) * fraction
+                if boundary > current:
+                    total += boundary - current
+                    current = boundary
+
+        yield HourlyStatistic(hour, current, total)
+        hour = hour_end
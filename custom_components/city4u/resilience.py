@@ -0,0 +1,187 @@
+"""Retries, timeouts and circuit breaking for City4U API requests."""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import random
+import time
+from collections.abc import Awaitable, Callable
+from dataclasses import dataclass, field
+
+import aiohttp
+
+from .const import (
+    BREAKER_FAILURE_THRESHOLD,
+    BREAKER_RECOVERY_TIME,
+    DEFAULT_CONNECT_TIMEOUT,
+    DEFAULT_READ_TIMEOUT,
+    DEFAULT_TOTAL_TIMEOUT,
+    RETRY_ATTEMPTS,
+    RETRY_BASE_DELAY,
+    RETRY_MAX_DELAY,
+)
+
+_LOGGER = logging.getLogger(__name__)
+
+# HTTP statuses worth retrying: throttling and gateway/server hiccups
+RETRYABLE_STATUSES = frozenset({408, 429, 500, 502, 503, 504})
+
+
+class City4UCircuitOpenError(aiohttp.ClientConnectionError):
+    """Raised without a request while a host's circuit is open."""
+
+
+def is_transient(err: BaseException) -> bool:
+    """Return True if a failed request may succeed when repeated."""
+    if isinstance(err, City4UCircuitOpenError):
+        return False
+    if isinstance(err, aiohttp.ClientResponseError):
+        return err.status in RETRYABLE_STATUSES
+    return isinstance(
+        err, (aiohttp.ClientConnectionError, aiohttp.ClientPayloadError, TimeoutError)
+    )
+
+
+@dataclass(frozen=True, slots=True)
+class City4UTimeouts:
+    """Per-phase request timeouts, in seconds."""
+
+    connect: float = DEFAULT_CONNECT_TIMEOUT
+    read: float = DEFAULT_READ_TIMEOUT
+    total: float = DEFAULT_TOTAL_TIMEOUT
+
+    def client_timeout(self) -> aiohttp.ClientTimeout:
+        """Return the equivalent aiohttp timeout.
+
+        The connect timeout covers getting a pooled connection as well as
+        opening a new one, and the read timeout applies to every socket read.
+        """
+        return aiohttp.ClientTimeout(
+            total=self.total, connect=self.connect, sock_read=self.read
+        )
+
+
+@dataclass(frozen=True, slots=True)
+class City4URetryPolicy:
+    """Capped exponential backoff with full jitter."""
+
+    attempts: int = RETRY_ATTEMPTS
+    base_delay: float = RETRY_BASE_DELAY
+    max_delay: float = RETRY_MAX_DELAY
+
+    def delay(self, retry: int) -> float:
+        """Return a random delay before the given retry, counted from 0.
+
+        Full jitter keeps meters that failed together from retrying together.
+        """
+        return random.uniform(0, min(self.max_delay, self.base_delay * 2**retry))
+
+
+@dataclass(slots=True)
+class _HostCircuit:
+    """Failure state of a single host."""
+
+    failures: int = 0
+    opened_at: float | None = None
+
+
+@dataclass
+class City4UCircuitBreaker:
+    """Fast-fail requests to hosts that keep failing, shared by all clients.
+
+    After failure_threshold consecutive transient failures a host's circuit
+    opens and requests fail immediately with City4UCircuitOpenError. Every
+    recovery_time one request is let through as a probe: its success closes
+    the circuit, and its failure keeps it open for another recovery_time.
+    """
+
+    failure_threshold: int = BREAKER_FAILURE_THRESHOLD
+    recovery_time: float = BREAKER_RECOVERY_TIME
+    _hosts: dict[str, _HostCircuit] = field(default_factory=dict, repr=False)
+
+    def before_request(self, host: str) -> None:
+        """Raise City4UCircuitOpenError if a request to host must not be sent."""
+        circuit = self._hosts.get(host)
+        if circuit is None or circuit.opened_at is None:
+            return
+        now = time.monotonic()
+        remaining = circuit.opened_at + self.recovery_time - now
+        if remaining > 0:
+            raise City4UCircuitOpenError(
+                f"Requests to {host} paused after repeated failures, "
+                f"retrying in {remaining:.0f}s"
+            )
+        # Let this request probe the host; others wait for another period
+        _LOGGER.debug("Probing %s for recovery", host)
+        circuit.opened_at = now
+
+    def record_success(self, host: str) -> None:
+        """Record that host answered, closing its circuit."""
+        circuit = self._hosts.pop(host, None)
+        if circuit is not None and circuit.opened_at is not None:
+            _LOGGER.info("%s is responding again, resuming requests", host)
+
+    def record_failure(self, host: str) -> None:
+        """Record a transient failure, opening the circuit past the threshold."""
+        circuit = self._hosts.setdefault(host, _HostCircuit())
+        circuit.failures += 1
+        if circuit.opened_at is not None:
+            # A failed probe keeps the circuit open for another period
+            circuit.opened_at = time.monotonic()
+        elif circuit.failures >= self.failure_threshold:
+            _LOGGER.warning(
+                "%s failed %d times in a row, pausing requests for %.0fs",
+                host,
+                circuit.failures,
+                self.recovery_time,
+            )
+            circuit.opened_at = time.monotonic()
+
+
+async def async_request_with_retries[T](
+    send: Callable[[], Awaitable[T]],
+    *,
+    host: str,
+    context: str,
+    retry_policy: City4URetryPolicy,
+    circuit_breaker: City4UCircuitBreaker | None = None,
+) -> T:
+    """Call send until it succeeds, retrying transient failures.
+
+    Each attempt first checks the host's circuit. Transient failures count
+    against the circuit and are retried after a backoff delay. Any other
+    outcome, including a client error response, shows the host is up and
+    closes it again.
+    """
+    retry = 0
+    while True:
+        if circuit_breaker is not None:
+            circuit_breaker.before_request(host)
+        try:
+            result = await send()
+        except Exception as err:  # pylint: disable=broad-exception-caught
+            transient = is_transient(err)
+            if circuit_breaker is not None:
+                if transient:
+                    circuit_breaker.record_failure(host)
+                else:
+                    circuit_breaker.record_success(host)
+            if not transient or retry + 1 >= retry_policy.attempts:
+                raise
+            delay = retry_policy.delay(retry)
+            retry += 1
+            _LOGGER.debug(
+                "%s failed (%s), retry %d of %d in %.1fs",
+                context,
+                str(err) or type(err).__name__,
+                retry,
+                retry_policy.attempts - 1,
+                delay,
+            )
+            await asyncio.sleep(delay)
+            continue
+
+        if circuit_breaker is not None:
+            circuit_breaker.record_success(host)
+        return result
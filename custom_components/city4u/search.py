@@ -0,0 +1,237 @@
+"""Typeahead search over the municipality catalogue."""
+
+from __future__ import annotations
+
+import heapq
+from bisect import bisect_left
+from collections import Counter
+from collections.abc import Iterable, Sequence
+from itertools import groupby
+from typing import NamedTuple
+
+from homeassistant.core import HomeAssistant
+
+from .const import DATA_MUNICIPALITY_SEARCH
+from .municipalities import Municipality, async_get_registry, normalize_name
+
+# Scores of the ways a query can match a name; the best one counts
+SCORE_EXACT = 1.0
+SCORE_PREFIX = 0.9
+SCORE_WORD_PREFIX = 0.8
+SCORE_FUZZY = 0.7  # scaled by the trigram similarity
+# Phonetic matches are lossy, so they rank below the same Hebrew match
+PHONETIC_WEIGHT = 0.9
+FUZZY_MIN_SIMILARITY = 0.4
+# Shorter skeletons, like the "s" of "זזז", match too much to be useful
+PHONETIC_MIN_LENGTH = 2
+
+_FINAL_LETTERS = str.maketrans("ךםןףץ", "כמנפצ")
+
+# Hebrew letters to a consonant skeleton shared with Latin transliterations.
+# Letters usually written as vowels (and ח, whose "ch"/"kh" is dropped on
+# the Latin side) are removed, and sounds that English spells alike merge.
+_HEBREW_SKELETON = str.maketrans(
+    {
+        "ב": "b",
+        "ג": "g",
+        "ד": "d",
+        "ז": "s",
+        "ט": "t",
+        "כ": "k",
+        "ל": "l",
+        "מ": "m",
+        "נ": "n",
+        "ס": "s",
+        "פ": "p",
+        "צ": "s",
+        "ק": "k",
+        "ר": "r",
+        "ש": "s",
+        "ת": "t",
+        **dict.fromkeys("אהוחיע", None),
+    }
+)
+_LATIN_DIGRAPHS = (("sh", "s"), ("ch", ""), ("kh", ""), ("tz", "s"), ("ts", "s"))
+_LATIN_SKELETON = str.maketrans(
+    {
+        "v": "b",
+        "w": "b",
+        "f": "p",
+        "c": "k",
+        "q": "k",
+        "j": "g",
+        "x": "ks",
+        "z": "s",
+        **dict.fromkeys("aeiouyh0123456789", None),
+    }
+)
+
+
+class SearchMatch(NamedTuple):
+    """A municipality matching a search query."""
+
+    municipality: Municipality
+    score: float
+
+
+def search_key(text: str) -> str:
+    """Return the Hebrew search form of a name or query.
+
+    On top of normalize_name, final letters are folded into their regular
+    forms and punctuation is dropped, so "קרית גת ? מרכז" and "סח'נין" can be
+    typed without it.
+    """
+    text = normalize_name(text).translate(_FINAL_LETTERS)
+    text = "".join(
+        char if char.isalnum() or char.isspace() else " "
+        for char in text.replace("'", "").replace("׳", "")
+    )
+    return " ".join(text.split())
+
+
+def phonetic_key(text: str) -> str:
+    """Return the consonant skeleton of Hebrew or transliterated English text.
+
+    "בני ברק" and "Bnei Brak" both become "bn brk", so English spellings
+    match Hebrew names without a curated list of aliases.
+    """
+    words = []
+    for word in search_key(text).split():
+        for digraph, replacement in _LATIN_DIGRAPHS:
+            word = word.replace(digraph, replacement)
+        skeleton = word.translate(_HEBREW_SKELETON).translate(_LATIN_SKELETON)
+        # Doubled letters are spelled inconsistently in transliterations
+        if skeleton := "".join(char for char, _ in groupby(skeleton)):
+            words.append(skeleton)
+    return " ".join(words)
+
+
+def _trigrams(key: str) -> set[str]:
+    """Return the character trigrams of a key, padded at both ends."""
+    padded = f" {key} "
+    return {padded[i : i + 3] for i in range(len(padded) - 2)}
+
+
+class MunicipalitySearchIndex:  # pylint: disable=too-few-public-methods
+    """Rank municipalities by how well their name or ID matches a query.
+
+    Each municipality is indexed by its customer ID, its Hebrew name and
+    the name's phonetic skeleton. Exact keys are looked up in a dict,
+    prefixes of the whole key or of any of its words by bisecting a sorted
+    list, and misspellings through a trigram index, so a query never scans
+    the whole catalogue.
+    """
+
+    def __init__(self, municipalities: Iterable[Municipality]) -> None:
+        """Build the indexes."""
+        self._municipalities = tuple(municipalities)
+        keys: list[tuple[str, int]] = []
+        for index, municipality in enumerate(self._municipalities):
+            keys.append((str(municipality.customer_id), index))
+            keys.append((search_key(municipality.name_he), index))
+            keys.append((phonetic_key(municipality.name_he), index))
+
+        self._exact: dict[str, set[int]] = {}
+        prefixes: list[tuple[str, int, bool]] = []
+        self._trigram_keys: dict[str, list[int]] = {}
+        self._keys: list[tuple[int, int]] = []  # (municipality, trigram count)
+        for key, index in dict.fromkeys(key for key in keys if key[0]):
+            self._exact.setdefault(key, set()).add(index)
+            prefixes.append((key, index, True))
+            words = key.split(" ")
+            prefixes.extend(
+                (" ".join(words[start:]), index, False)
+                for start in range(1, len(words))
+            )
+            trigrams = _trigrams(key)
+            for trigram in trigrams:
+                self._trigram_keys.setdefault(trigram, []).append(len(self._keys))
+            self._keys.append((index, len(trigrams)))
+
+        prefixes.sort()
+        self._prefix_keys = [prefix[0] for prefix in prefixes]
+        self._prefix_entries = [(index, whole) for _, index, whole in prefixes]
+
+    def search(self, query: str, limit: int = 10) -> list[SearchMatch]:
+        """Return up to limit municipalities matching query, best first."""
+        scores: dict[int, float] = {}
+        keys: list[tuple[str, float]] = []
+        if key := search_key(query):
+            keys.append((key, 1.0))
+        if len(key := phonetic_key(query)) >= PHONETIC_MIN_LENGTH:
+            keys.append((key, PHONETIC_WEIGHT))
+
+        for key, weight in keys:
+            self._score_exact(key, weight, scores)
+        # Fuzzy matches score below any exact or prefix match, so they are
+        # only looked for when those leave room in the results
+        if len(scores) < limit:
+            for key, weight in keys:
+                self._score_fuzzy(key, weight, scores)
+
+        ranked = heapq.nsmallest(
+            limit,
+            scores.items(),
+            key=lambda item: (-item[1], self._municipalities[item[0]].name_he),
+        )
+        return [
+            SearchMatch(self._municipalities[index], score) for index, score in ranked
+        ]
+
+    def _score_exact(self, key: str, weight: float, scores: dict[int, float]) -> None:
+        """Score the municipalities matching key exactly or by a prefix."""
+        for index in self._exact.get(key, ()):
+            _add_score(scores, index, SCORE_EXACT * weight)
+
+        start = bisect_left(self._prefix_keys, key)
+        for position in range(start, len(self._prefix_keys)):
+            if not self._prefix_keys[position].startswith(key):
+                break
+            index, whole = self._prefix_entries[position]
+            _add_score(
+                scores, index, (SCORE_PREFIX if whole else SCORE_WORD_PREFIX) * weight
+            )
+
+    def _score_fuzzy(self, key: str, weight: float, scores: dict[int, float]) -> None:
+        """Score the municipalities sharing enough trigrams with key."""
+        query_trigrams = _trigrams(key)
+        shared = Counter(
+            key_id
+            for trigram in query_trigrams
+            for key_id in self._trigram_keys.get(trigram, ())
+        )
+        for key_id, count in shared.items():
+            index, key_trigrams = self._keys[key_id]
+            similarity = 2 * count / (len(query_trigrams) + key_trigrams)
+            if similarity >= FUZZY_MIN_SIMILARITY:
+                _add_score(scores, index, SCORE_FUZZY * similarity * weight)
+
+
+def _add_score(scores: dict[int, float], index: int, score: float) -> None:
+    """Keep the best score of a municipality."""
+    if score > scores.get(index, 0.0):
+        scores[index] = score
+
+
+def confident_match(matches: Sequence[SearchMatch]) -> Municipality | None:
+    """Return the best of ranked matches if it is the only exact one.
+
+    Prefix, phonetic and fuzzy matches can point at the wrong municipality
+    however far they lead, so they are never picked without asking.
+    """
+    if not matches or matches[0].score < SCORE_EXACT:
+        return None
+    if len(matches) > 1 and matches[1].score >= SCORE_EXACT:
+        return None
+    return matches[0].municipality
+
+
+async def async_get_search_index(hass: HomeAssistant) -> MunicipalitySearchIndex:
+    """Return the search index over the municipality catalogue."""
+    search_index: MunicipalitySearchIndex | None = hass.data.get(
+        DATA_MUNICIPALITY_SEARCH
+    )
+    if search_index is None:
+        search_index = MunicipalitySearchIndex(await async_get_registry(hass))
+        hass.data[DATA_MUNICIPALITY_SEARCH] = search_index
+    return search_index
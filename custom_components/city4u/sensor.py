@@ -12,9 +12,10 @@ from homeassistant.components.sensor import (
     SensorStateClass,
 )
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.const import UnitOfVolume
+from homeassistant.const import EntityCategory, UnitOfVolume
 from homeassistant.core import HomeAssistant, callback
 from homeassistant.helpers.device_registry import DeviceInfo
+from homeassistant.helpers.dispatcher import async_dispatcher_connect
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
 from homeassistant.helpers.update_coordinator import (
     CoordinatorEntity,
@@ -29,8 +30,10 @@ from .const import (
     DOMAIN,
     EXCLUDED_ATTRIBUTES_LOWER,
     ICON,
+    SIGNAL_POLLED,
 )
-from .municipalities import get_municipality_by_id
+from .municipalities import MunicipalityRegistry, async_get_registry
+from .readings import ReadingSnapshot
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -44,17 +47,26 @@ async def async_setup_entry(
     coordinator = hass.data[DOMAIN][entry.entry_id]["coordinator"]
     api = hass.data[DOMAIN][entry.entry_id]["api"]
 
+    consumption_sensor = City4UWaterConsumptionSensor(
+        coordinator=coordinator,
+        api=api,
+        municipalities=await async_get_registry(hass),
+    )
     async_add_entities(
         [
-            City4UWaterConsumptionSensor(
-                coordinator=coordinator,
+            consumption_sensor,
+            City4ULastPolledSensor(
+                entry_id=entry.entry_id,
                 api=api,
-            )
+                device_info=consumption_sensor.device_info,
+            ),
         ]
     )
 
 
-class City4UWaterConsumptionSensor(CoordinatorEntity, SensorEntity):
+class City4UWaterConsumptionSensor(  # pylint: disable=too-many-instance-attributes
+    CoordinatorEntity[DataUpdateCoordinator[ReadingSnapshot]], SensorEntity
+):
     """Implementation of a City4U water consumption sensor."""
 
     _attr_has_entity_name = True
@@ -65,14 +77,18 @@ class City4UWaterConsumptionSensor(CoordinatorEntity, SensorEntity):
 
     def __init__(
         self,
-        coordinator: DataUpdateCoordinator,
+        coordinator: DataUpdateCoordinator[ReadingSnapshot],
         api: City4UApiClient,
+        municipalities: MunicipalityRegistry,
     ) -> None:
         """Initialize the sensor."""
         super().__init__(coordinator)
         self._api = api
         self._last_reading_time: datetime | None = None
-        self._last_polled: datetime | None = None
+        self._snapshot: ReadingSnapshot | None = None
+        self._last_available: bool | None = None
+        self._raw_attributes: dict[str, Any] = {}
+        self._extra_attributes: dict[str, Any] = {}
 
         # Entity properties
         meter_number = api.meter_number
@@ -81,21 +97,11 @@ class City4UWaterConsumptionSensor(CoordinatorEntity, SensorEntity):
         self._attr_name = "Water Consumption"
 
         # Extract device identifiers from initial data
-        api_meter_number = None
-        property_id = None  # ExternalWaterCardId (זיהוי נכס)
-        site_id = None  # SiteExternalReferenceId (municipality portal ID)
-
-        if coordinator.data and isinstance(coordinator.data, list) and coordinator.data:
-            first_reading = coordinator.data[0]
-            api_meter_number = first_reading.get("MeterNumber") or first_reading.get(
-                "meterNumber"
-            )
-            property_id = first_reading.get("ExternalWaterCardId") or first_reading.get(
-                "externalWaterCardId"
-            )
-            site_id = first_reading.get("SiteExternalReferenceId") or first_reading.get(
-                "siteExternalReferenceId"
-            )
+        snapshot: ReadingSnapshot | None = coordinator.data
+        latest = snapshot.reading if snapshot else None
+        api_meter_number = latest.meter_number if latest else None
+        property_id = latest.property_id if latest else None
+        site_id = latest.site_id if latest else None
 
         # Build identifiers set - primary identifier plus property ID if available
         identifiers: set[tuple[str, str]] = {(DOMAIN, f"{customer_id}_{meter_number}")}
@@ -109,7 +115,9 @@ class City4UWaterConsumptionSensor(CoordinatorEntity, SensorEntity):
             config_url = "https://city4u.co.il"
 
         # Get municipality information
-        municipality = get_municipality_by_id(int(customer_id))
+        municipality = municipalities.by_customer_id(customer_id)
+        if municipality is None and site_id:
+            municipality = municipalities.by_site_id(site_id)
         municipality_name = municipality.name_he if municipality else "Unknown"
 
         # Build device info with identifiers from API
@@ -119,84 +127,110 @@ class City4UWaterConsumptionSensor(CoordinatorEntity, SensorEntity):
             manufacturer="City4U",
             model=f"{municipality_name} (ID: {customer_id})",
             configuration_url=config_url,
-            serial_number=str(api_meter_number) if api_meter_number else None,
+            serial_number=api_meter_number,
         )
 
-    def _parse_reading_time(self, reading_time_str: str) -> datetime | None:
-        """Parse reading time string to datetime with timezone."""
-        if not reading_time_str:
-            return None
-        try:
-            # Parse the date format from City4U API (assume Israel timezone)
-            naive_dt = datetime.strptime(reading_time_str, "%Y-%m-%dT%H:%M:%S")
-            # Assume Israel timezone for readings
-            return dt_util.as_utc(
-                naive_dt.replace(tzinfo=dt_util.get_time_zone("Asia/Jerusalem"))
-            )
-        except ValueError:
-            _LOGGER.warning("Failed to parse reading time: %s", reading_time_str)
-            return None
+        self._update_from_snapshot()
 
-    @callback
-    def _handle_coordinator_update(self) -> None:
-        """Handle updated data from the coordinator."""
-        self._last_polled = dt_util.utcnow()
-        super()._handle_coordinator_update()
+    def _update_from_snapshot(self) -> None:
+        """Cache the state and attributes derived from the newest reading."""
+        snapshot: ReadingSnapshot | None = self.coordinator.data
+        previous = self._snapshot.reading if self._snapshot else None
+        self._snapshot = snapshot
 
-    @property
-    def native_value(self) -> float | None:
-        """Return the state of the sensor."""
-        if not self.coordinator.data:
-            return None
-
-        # The data is a list of readings, with the latest one at the end
-        try:
-            if isinstance(self.coordinator.data, list) and self.coordinator.data:
-                latest_reading = self.coordinator.data[-1]
-                reading_value = latest_reading.get("totalWaterDataWithMultiplier")
-
-                # Parse reading time
-                reading_time_str = latest_reading.get("readingTime")
-                if reading_time_str:
-                    self._last_reading_time = self._parse_reading_time(reading_time_str)
-
-                if reading_value is not None:
-                    try:
-                        return float(reading_value)
-                    except (ValueError, TypeError):
-                        _LOGGER.warning(
-                            "Invalid water reading value: %s", reading_value
-                        )
-
-            return None
-        except (KeyError, IndexError) as err:
-            _LOGGER.error("Error extracting water data: %s", err)
-            return None
+        if snapshot is None:
+            self._attr_native_value = None
+            latest = None
+        else:
+            self._last_reading_time = snapshot.time
+            self._attr_native_value = snapshot.value
+            latest = snapshot.reading
+
+        # Only rescan the raw record when a new reading arrives
+        if latest is not previous:
+            self._raw_attributes = (
+                {
+                    key: value
+                    for key, value in latest.raw.items()
+                    if key.lower() not in EXCLUDED_ATTRIBUTES_LOWER
+                }
+                if latest
+                else {}
+            )
 
-    @property
-    def extra_state_attributes(self) -> dict[str, Any]:
-        """Return the state attributes."""
         attributes: dict[str, Any] = {}
 
         # Add reading time if available
         if self._last_reading_time:
             attributes[ATTR_READING_TIME] = self._last_reading_time.isoformat()
 
-        # Add last polled time
-        if self._last_polled:
-            attributes[ATTR_LAST_POLLED] = self._last_polled.isoformat()
+        # Add other attributes from the data (excluding unwanted ones)
+        attributes.update(self._raw_attributes)
+        self._extra_attributes = attributes
+
+    @property
+    def extra_state_attributes(self) -> dict[str, Any]:
+        """Return the state attributes."""
+        return self._extra_attributes
+
+    @callback
+    def _handle_coordinator_update(self) -> None:
+        """Handle updated data from the coordinator.
 
-        # Add other attributes from the data if available (excluding unwanted ones)
+        State is only written when the newest reading or availability changed,
+        so polls without new data do not add recorder rows.
+        """
+        available = self.available
         if (
-            self.coordinator.data
-            and isinstance(self.coordinator.data, list)
-            and self.coordinator.data
+            self.coordinator.data == self._snapshot
+            and available == self._last_available
         ):
-            latest_reading = self.coordinator.data[-1]
+            return
+
+        self._last_available = available
+        self._update_from_snapshot()
+        super()._handle_coordinator_update()
 
-            # Add additional attributes that might be useful (case-insensitive filtering)
-            for key, value in latest_reading.items():
-                if key.lower() not in EXCLUDED_ATTRIBUTES_LOWER:
-                    attributes[key] = value
 
-        return attributes
+class City4ULastPolledSensor(SensorEntity):
+    """Diagnostic sensor with the time of the last successful poll.
+
+    Disabled by default, since it changes on every poll.
+    """
+
+    _attr_has_entity_name = True
+    _attr_should_poll = False
+    _attr_device_class = SensorDeviceClass.TIMESTAMP
+    _attr_entity_category = EntityCategory.DIAGNOSTIC
+    _attr_entity_registry_enabled_default = False
+
+    def __init__(
+        self,
+        entry_id: str,
+        api: City4UApiClient,
+        device_info: DeviceInfo | None,
+    ) -> None:
+        """Initialize the sensor."""
+        self._entry_id = entry_id
+        self._attr_unique_id = (
+            f"{DOMAIN}_{api.customer_id}_{api.meter_number}_{ATTR_LAST_POLLED}"
+        )
+        self._attr_name = "Last Polled"
+        self._attr_device_info = device_info
+
+    async def async_added_to_hass(self) -> None:
+        """Subscribe to poll notifications."""
+        await super().async_added_to_hass()
+        self.async_on_remove(
+            async_dispatcher_connect(
+                self.hass,
+                SIGNAL_POLLED.format(self._entry_id),
+                self._handle_polled,
+            )
+        )
+
+    @callback
+    def _handle_polled(self) -> None:
+        """Record a successful poll."""
+        self._attr_native_value = dt_util.utcnow()
+        self.async_write_ha_state()
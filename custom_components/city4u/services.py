@@ -1,7 +1,11 @@
 """Services for the City4U integration."""
 
+import asyncio
 import logging
-from datetime import datetime
+from bisect import bisect_right
+from collections.abc import Sequence
+from dataclasses import dataclass
+from itertools import batched
 
 import voluptuous as vol
 from homeassistant.components.recorder.models import (
@@ -9,18 +13,166 @@ from homeassistant.components.recorder.models import (
     StatisticMeanType,
     StatisticMetaData,
 )
-from homeassistant.components.recorder.statistics import async_add_external_statistics
+from homeassistant.components.recorder.statistics import (
+    async_add_external_statistics,
+    get_last_statistics,
+)
 from homeassistant.const import UnitOfVolume
 from homeassistant.core import HomeAssistant, ServiceCall
+from homeassistant.helpers import config_validation as cv
+from homeassistant.helpers.recorder import get_instance
 from homeassistant.util import dt as dt_util
 
-from .const import DOMAIN
+from .api import City4UApiClient
+from .const import (
+    ATTR_ENTRY_ID,
+    ATTR_MAX_PARALLEL,
+    ATTR_METER_NUMBER,
+    DATA_IMPORT_LOCK,
+    DEFAULT_IMPORT_PARALLEL,
+    DOMAIN,
+    IMPORT_BATCH_HOURS,
+)
+from .readings import ReadingSnapshot, ReadingStore
+from .resample import HourlyStatistic, hourly_statistics
 
 _LOGGER = logging.getLogger(__name__)
 
 # Define service schemas
 FORCE_UPDATE_SCHEMA = vol.Schema({})
-IMPORT_HISTORICAL_SCHEMA = vol.Schema({})
+IMPORT_HISTORICAL_SCHEMA = vol.Schema(
+    {
+        vol.Optional(ATTR_ENTRY_ID): vol.All(cv.ensure_list, [cv.string]),
+        vol.Optional(ATTR_METER_NUMBER): vol.All(cv.ensure_list, [cv.string]),
+        vol.Optional(ATTR_MAX_PARALLEL, default=DEFAULT_IMPORT_PARALLEL): vol.All(
+            vol.Coerce(int), vol.Range(min=1, max=10)
+        ),
+    }
+)
+
+
+def statistic_id_for_meter(meter_number: str) -> str:
+    """Return the external statistic ID for a meter."""
+    return f"{DOMAIN}:water_consumption_{meter_number}"
+
+
+async def _async_get_last_imported(
+    hass: HomeAssistant, statistic_id: str
+) -> HourlyStatistic | None:
+    """Return the newest imported statistic, if any."""
+    last_stats = await get_instance(hass).async_add_executor_job(
+        get_last_statistics, hass, 1, statistic_id, True, {"state", "sum"}
+    )
+    if not (rows := last_stats.get(statistic_id)):
+        return None
+    row = rows[0]
+    state, total = row.get("state"), row.get("sum")
+    if state is None or total is None:
+        return None
+    return HourlyStatistic(row["start"], state, total)
+
+
+@dataclass
+class _StatisticsImport:
+    """Readings of one meter that are ready to be submitted as statistics."""
+
+    meter_number: str
+    metadata: StatisticMetaData
+    last_imported: HourlyStatistic | None
+    timestamps: Sequence[float]
+    values: Sequence[float]
+
+
+async def _async_prepare_import(
+    hass: HomeAssistant, api: City4UApiClient, store: ReadingStore
+) -> _StatisticsImport:
+    """Look up where a meter's statistics end and copy the readings after it."""
+    statistic_id = statistic_id_for_meter(api.meter_number)
+    last_imported = await _async_get_last_imported(hass, statistic_id)
+
+    # Copy the readings still to import, since polls may change the store
+    # while batches are submitted
+    timestamps, values = store.columns()
+    begin = 0
+    if last_imported is not None:
+        begin = max(bisect_right(timestamps, last_imported.start) - 1, 0)
+
+    return _StatisticsImport(
+        meter_number=api.meter_number,
+        metadata=StatisticMetaData(
+            has_mean=False,
+            has_sum=True,
+            mean_type=StatisticMeanType.NONE,
+            name=f"City4U Water Consumption ({api.meter_number})",
+            source=DOMAIN,
+            statistic_id=statistic_id,
+            unit_class=None,
+            unit_of_measurement=UnitOfVolume.CUBIC_METERS,
+        ),
+        last_imported=last_imported,
+        timestamps=timestamps[begin:],
+        values=values[begin:],
+    )
+
+
+async def _async_submit_import(
+    hass: HomeAssistant, statistics_import: _StatisticsImport
+) -> int:
+    """Resample prepared readings and submit them to the recorder."""
+    recorder = get_instance(hass)
+    meter_number = statistics_import.meter_number
+    imported = 0
+
+    # Submit a month at a time and let the recorder catch up in between, so
+    # long histories neither build one huge list nor hog the recorder queue
+    for batch in batched(
+        hourly_statistics(
+            statistics_import.timestamps,
+            statistics_import.values,
+            statistics_import.last_imported,
+        ),
+        IMPORT_BATCH_HOURS,
+    ):
+        statistics = [
+            StatisticData(
+                start=dt_util.utc_from_timestamp(hour.start),
+                state=hour.state,
+                sum=hour.sum,
+            )
+            for hour in batch
+        ]
+        async_add_external_statistics(hass, statistics_import.metadata, statistics)
+        await recorder.async_block_till_done()
+
+        imported += len(statistics)
+        _LOGGER.debug(
+            "Imported statistics for meter %s up to %s (%d hours so far)",
+            meter_number,
+            statistics[-1]["start"],
+            imported,
+        )
+
+    if imported:
+        _LOGGER.info(
+            "Imported %d hours of statistics for meter %s", imported, meter_number
+        )
+    else:
+        _LOGGER.debug("No new readings to import for meter %s", meter_number)
+    return imported
+
+
+async def async_import_statistics(
+    hass: HomeAssistant, api: City4UApiClient, store: ReadingStore
+) -> int:
+    """Import hours newer than the last imported statistic.
+
+    Returns the number of statistics submitted. Running this repeatedly only
+    adds what is new, so it is cheap enough to call after every refresh.
+    """
+    statistics_import = await _async_prepare_import(hass, api, store)
+    # One meter at a time is submitted to the recorder
+    async with hass.data.setdefault(DATA_IMPORT_LOCK, asyncio.Lock()):
+        return await _async_submit_import(hass, statistics_import)
 
 
 async def async_setup_services(hass: HomeAssistant) -> None:
@@ -32,103 +184,67 @@ async def async_setup_services(hass: HomeAssistant) -> None:
             _LOGGER.error("City4U integration not set up")
             return
 
-        for entry_id, entry_data in hass.data[DOMAIN].items():
-            coordinator = entry_data.get("coordinator")
-            if coordinator:
-                await coordinator.async_refresh()
-                _LOGGER.debug("Forced update for City4U entry %s", entry_id)
+        # Refresh together, so meters of an account share one batch
+        coordinators = [
+            coordinator
+            for entry_data in hass.data[DOMAIN].values()
+            if (coordinator := entry_data.get("coordinator"))
+        ]
+        await asyncio.gather(
+            *(coordinator.async_refresh() for coordinator in coordinators)
+        )
+        _LOGGER.debug("Forced update of %d City4U entries", len(coordinators))
 
-    async def handle_import_historical(_call: ServiceCall) -> None:
+    async def handle_import_historical(call: ServiceCall) -> None:
         """Handle the import historical data service call."""
         if DOMAIN not in hass.data:
             _LOGGER.error("City4U integration not set up")
             return
 
-        for entry_id, entry_data in hass.data[DOMAIN].items():
-            api = entry_data.get("api")
-            if not api:
-                continue
+        entry_ids: list[str] = call.data.get(ATTR_ENTRY_ID, [])
+        meter_numbers: list[str] = call.data.get(ATTR_METER_NUMBER, [])
+        semaphore = asyncio.Semaphore(call.data[ATTR_MAX_PARALLEL])
+        submit_lock: asyncio.Lock = hass.data.setdefault(
+            DATA_IMPORT_LOCK, asyncio.Lock()
+        )
 
+        async def async_import_entry(
+            entry_id: str, api: City4UApiClient, store: ReadingStore
+        ) -> None:
+            """Prepare one entry concurrently, then submit it in turn."""
             try:
-                # Fetch all historical data
-                historical_data = await api.fetch_all_historical_data()
-
-                if not historical_data:
-                    _LOGGER.warning(
-                        "No historical data available for entry %s", entry_id
-                    )
-                    continue
-
-                # Convert to statistics format
-                statistic_id = f"{DOMAIN}:water_consumption_{api.meter_number}"
-
-                # Build statistics data from historical readings
-                statistics: list[StatisticData] = []
-
-                for reading in historical_data:
-                    reading_time_str = reading.get("readingTime")
-                    reading_value = reading.get("totalWaterDataWithMultiplier")
-
-                    if not reading_time_str or reading_value is None:
-                        continue
-
-                    try:
-                        # Parse reading time (assume Israel timezone)
-                        naive_dt = datetime.strptime(
-                            reading_time_str, "%Y-%m-%dT%H:%M:%S"
-                        )
-                        reading_time = dt_util.as_utc(
-                            naive_dt.replace(
-                                tzinfo=dt_util.get_time_zone("Asia/Jerusalem")
-                            )
-                        )
-
-                        value = float(reading_value)
-
-                        statistics.append(
-                            StatisticData(
-                                start=reading_time,
-                                state=value,
-                                sum=value,
-                            )
-                        )
-                    except (ValueError, TypeError) as err:
-                        _LOGGER.warning(
-                            "Failed to parse reading: %s, error: %s", reading, err
-                        )
-                        continue
-
-                if statistics:
-                    # Sort by timestamp
-                    statistics.sort(key=lambda x: x["start"])
-
-                    metadata = StatisticMetaData(
-                        has_mean=False,
-                        has_sum=True,
-                        mean_type=StatisticMeanType.NONE,
-                        name=f"City4U Water Consumption ({api.meter_number})",
-                        source=DOMAIN,
-                        statistic_id=statistic_id,
-                        unit_class=None,
-                        unit_of_measurement=UnitOfVolume.CUBIC_METERS,
-                    )
-
-                    async_add_external_statistics(hass, metadata, statistics)
-                    _LOGGER.info(
-                        "Imported %d historical readings for meter %s",
-                        len(statistics),
-                        api.meter_number,
-                    )
-                else:
-                    _LOGGER.warning(
-                        "No valid readings to import for entry %s", entry_id
-                    )
-
+                async with semaphore:
+                    statistics_import = await _async_prepare_import(hass, api, store)
+                async with submit_lock:
+                    await _async_submit_import(hass, statistics_import)
             except Exception as err:  # pylint: disable=broad-exception-caught
                 _LOGGER.error(
                     "Failed to import historical data for entry %s: %s", entry_id, err
                 )
 
+        imports = []
+        for entry_id, entry_data in hass.data[DOMAIN].items():
+            api = entry_data.get("api")
+            coordinator = entry_data.get("coordinator")
+            if not api or not coordinator:
+                continue
+
+            # Only import the requested entries, if any were given
+            if (entry_ids or meter_numbers) and not (
+                entry_id in entry_ids or api.meter_number in meter_numbers
+            ):
+                continue
+
+            # Historical readings are already held by the coordinator
+            snapshot: ReadingSnapshot | None = coordinator.data
+            if not snapshot or not snapshot.store:
+                _LOGGER.warning("No historical data available for entry %s", entry_id)
+                continue
+
+            imports.append(async_import_entry(entry_id, api, snapshot.store))
+
+        await asyncio.gather(*imports)
+
     # Register services
     hass.services.async_register(
         DOMAIN, "force_update", handle_force_update, schema=FORCE_UPDATE_SCHEMA
@@ -139,11 +255,3 @@ async def async_setup_services(hass: HomeAssistant) -> None:
         handle_import_historical,
         schema=IMPORT_HISTORICAL_SCHEMA,
     )
-
-
-async def async_unload_services(hass: HomeAssistant) -> None:
-    """Unload City4U services."""
-    if hass.services.has_service(DOMAIN, "force_update"):
-        hass.services.async_remove(DOMAIN, "force_update")
-    if hass.services.has_service(DOMAIN, "import_historical"):
-        hass.services.async_remove(DOMAIN, "import_historical")
@@ -0,0 +1,134 @@
+#!/usr/bin/env python3
+"""
+Micro-benchmarks for municipality lookups.
+
+Times loading the bundled catalogue, compares the indexed
+MunicipalityRegistry against the linear scan it replaced, and times the
+config flow's typeahead search, on synthetic registries up to the size of
+the full City4U customer list.
+
+Usage:
+    pdm run python3 scripts/benchmark_municipalities.py [--sizes 77 500 1500]
+"""
+
+import argparse
+import random
+import sys
+import timeit
+from collections.abc import Callable
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+# pylint: disable=wrong-import-position
+from custom_components.city4u.municipalities import (
+    Municipality,
+    MunicipalityRegistry,
+    load_registry,
+)
+from custom_components.city4u.search import MunicipalitySearchIndex
+
+HEBREW_LETTERS = "אבגדהוזחטיכלמנסעפצקרשת"
+
+
+def make_municipalities(count: int) -> list[Municipality]:
+    """Return count municipalities with distinct IDs and random Hebrew names."""
+    rng = random.Random(count)
+    names: dict[str, None] = {}
+    while len(names) < count:
+        words = (
+            "".join(rng.choices(HEBREW_LETTERS, k=rng.randint(2, 6)))
+            for _ in range(rng.randint(1, 3))
+        )
+        names[" ".join(words)] = None
+    return [
+        Municipality(customer_id=100_000 + index, name_he=name)
+        for index, name in enumerate(names)
+    ]
+
+
+def linear_lookup(
+    municipalities: list[Municipality], customer_id: int
+) -> Municipality | None:
+    """Look up a municipality the way the integration used to."""
+    for muni in municipalities:
+        if muni.customer_id == customer_id:
+            return muni
+    return None
+
+
+def report(name: str, seconds: float, lookups: int) -> None:
+    """Print the per-lookup cost."""
+    print(f"  {name:<32} {seconds / lookups * 1e9:8.0f} ns/lookup")
+
+
+def benchmark_size(size: int, lookups: int, repeat: int) -> None:
+    """Benchmark lookups in a registry of the given size."""
+    municipalities = make_municipalities(size)
+    picks = random.Random(size).choices(municipalities, k=lookups)
+    ids = [muni.customer_id for muni in picks]
+    names = [muni.name_he for muni in picks]
+    print(f"{size} municipalities")
+
+    def best(func: Callable[[], object]) -> float:
+        return min(timeit.repeat(func, number=1, repeat=repeat))
+
+    report(
+        "linear scan (previous)",
+        best(lambda: [linear_lookup(municipalities, cid) for cid in ids]),
+        lookups,
+    )
+
+    registry = MunicipalityRegistry(municipalities)
+    build = best(lambda: MunicipalityRegistry(municipalities).by_customer_id(0))
+    print(f"  {'index build, first lookup':<32} {build * 1e6:8.0f} us")
+    report(
+        "by_customer_id",
+        best(lambda: [registry.by_customer_id(cid) for cid in ids]),
+        lookups,
+    )
+    report("by_name", best(lambda: [registry.by_name(name) for name in names]), lookups)
+
+    build = best(lambda: MunicipalitySearchIndex(municipalities))
+    print(f"  {'search index build':<32} {build * 1e6:8.0f} us")
+    search_index = MunicipalitySearchIndex(municipalities)
+    # Searches are far slower than lookups, so time fewer of them
+    queries = names[: max(lookups // 10, 1)]
+    typos = [name[:-1] + "ז" for name in queries]
+    report(
+        "search (name)",
+        best(lambda: [search_index.search(query) for query in queries]),
+        len(queries),
+    )
+    report(
+        "search (misspelled name)",
+        best(lambda: [search_index.search(query) for query in typos]),
+        len(queries),
+    )
+    report(
+        "search (first letter)",
+        best(lambda: [search_index.search(query[0]) for query in queries]),
+        len(queries),
+    )
+    print()
+
+
+def main() -> None:
+    """Run the benchmarks."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument(
+        "--sizes", type=int, nargs="+", default=[10, 77, 250, 1000, 1500]
+    )
+    parser.add_argument("--lookups", type=int, default=10_000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    load = min(timeit.repeat(load_registry.__wrapped__, number=1, repeat=args.repeat))
+    print(f"Loading the bundled catalogue: {load * 1e3:.2f} ms\n")
+
+    for size in args.sizes:
+        benchmark_size(size, args.lookups, args.repeat)
+
+
+if __name__ == "__main__":
+    main()
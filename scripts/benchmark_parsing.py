@@ -0,0 +1,181 @@
+#!/usr/bin/env python3
+"""
+Micro-benchmarks for parsing City4U readings.
+
+Compares the integration's parsers against the implementations they replaced,
+on a synthetic history of hourly readings.
+
+Usage:
+    pdm run python3 scripts/benchmark_parsing.py [--readings 100000]
+"""
+
+import argparse
+import asyncio
+import json
+import sys
+import timeit
+import tracemalloc
+from collections.abc import Callable
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Any
+from unittest.mock import MagicMock
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+# pylint: disable=wrong-import-position
+from homeassistant.util import dt as dt_util
+
+from custom_components.city4u.api import (
+    DEFAULT_JSON_DECODER,
+    City4UApiClient,
+    City4UCredentials,
+    JsonDecoder,
+    _parse_reading_time,
+    parse_reading_time,
+)
+
+
+def make_readings(count: int) -> list[dict[str, Any]]:
+    """Return count hourly readings in the API's format."""
+    start = datetime(2015, 1, 1)
+    return [
+        {
+            "totalWaterDataWithMultiplier": round(index * 0.01, 3),
+            "readingTime": (start + timedelta(hours=index)).strftime(
+                "%Y-%m-%dT%H:%M:%S"
+            ),
+            "meterNumber": "12345678",
+            "readingType": "Regular",
+        }
+        for index in range(count)
+    ]
+
+
+def strptime_reading_time(reading_time_str: str) -> datetime:
+    """Parse a reading time the way the integration used to."""
+    naive_dt = datetime.strptime(reading_time_str, "%Y-%m-%dT%H:%M:%S")
+    return dt_util.as_utc(
+        naive_dt.replace(tzinfo=dt_util.get_time_zone("Asia/Jerusalem"))
+    )
+
+
+def report(name: str, func: Callable[[], object], count: int, repeat: int) -> float:
+    """Time func and print the best per-reading cost."""
+    best = min(timeit.repeat(func, number=1, repeat=repeat))
+    print(f"{name:<40} {best * 1e3:9.1f} ms  {best / count * 1e9:8.0f} ns/reading")
+    return best
+
+
+def benchmark_reading_time(readings: list[dict[str, Any]], repeat: int) -> None:
+    """Benchmark reading time parsing."""
+    times = [reading["readingTime"] for reading in readings]
+    count = len(times)
+    print(f"Reading time parsing ({count} readings)")
+
+    def parse_cold() -> None:
+        _parse_reading_time.cache_clear()
+        for reading_time in times:
+            parse_reading_time(reading_time)
+
+    def parse_repeated() -> None:
+        # The same few readings, as when the latest reading is re-parsed
+        for reading_time in times[:10] * (count // 10):
+            parse_reading_time(reading_time)
+
+    baseline = report(
+        "strptime (previous)",
+        lambda: [strptime_reading_time(reading_time) for reading_time in times],
+        count,
+        repeat,
+    )
+    current = report("parse_reading_time", parse_cold, count, repeat)
+    report("parse_reading_time (repeated strings)", parse_repeated, count, repeat)
+    print(f"Speedup: {baseline / current:.1f}x\n")
+
+
+def peak_memory(func: Callable[[], object]) -> int:
+    """Return the peak memory allocated while running func."""
+    tracemalloc.start()
+    try:
+        func()
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+def make_client(json_decoder: JsonDecoder) -> City4UApiClient:
+    """Return a client that only ever serves primed payloads."""
+    return City4UApiClient(
+        credentials=City4UCredentials(
+            username="user",
+            password="password",
+            customer_id="123456",
+            meter_number="12345678",
+        ),
+        session=MagicMock(),
+        json_decoder=json_decoder,
+    )
+
+
+def benchmark_json(readings: list[dict[str, Any]], repeat: int) -> None:
+    """Benchmark decoding a changed data payload in fetch_new_readings."""
+    body = json.dumps(readings).encode()
+    count = len(readings)
+    last = readings[-2]
+    print(f"Changed data payload ({count} readings, {len(body) / 1e6:.1f} MB)")
+    loop = asyncio.new_event_loop()
+
+    def decode_text() -> object:
+        # Previous implementation: response.text() followed by json.loads
+        return json.loads(body.decode())
+
+    def fetch_new_readings(client: City4UApiClient) -> Callable[[], object]:
+        def fetch() -> object:
+            # One reading was appended since the last poll
+            client.reset_last_reading_time(
+                last["readingTime"],
+                count - 1,
+                [last["readingTime"], last["totalWaterDataWithMultiplier"]],
+            )
+            client.prime_payload(body)
+            return loop.run_until_complete(client.fetch_new_readings())
+
+        return fetch
+
+    stdlib = fetch_new_readings(make_client(json.loads))
+    current = fetch_new_readings(make_client(DEFAULT_JSON_DECODER))
+    try:
+        baseline = report("text + json.loads (previous)", decode_text, count, repeat)
+        report("fetch_new_readings with json.loads", stdlib, count, repeat)
+        fastest = report(
+            f"fetch_new_readings with {DEFAULT_JSON_DECODER.__module__}.loads",
+            current,
+            count,
+            repeat,
+        )
+        print(f"Speedup: {baseline / fastest:.1f}x")
+        print(
+            f"Peak memory: {peak_memory(decode_text) / 1e6:.1f} MB previous, "
+            f"{peak_memory(stdlib) / 1e6:.1f} MB with json.loads, "
+            f"{peak_memory(current) / 1e6:.1f} MB with "
+            f"{DEFAULT_JSON_DECODER.__module__}.loads\n"
+        )
+    finally:
+        loop.close()
+
+
+def main() -> None:
+    """Run the benchmarks."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--readings", type=int, default=100_000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    readings = make_readings(args.readings)
+    benchmark_reading_time(readings, args.repeat)
+    benchmark_json(readings, args.repeat)
+
+
+if __name__ == "__main__":
+    main()
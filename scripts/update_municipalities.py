@@ -1,6 +1,6 @@
 #!/usr/bin/env python3
 """
-Update municipalities.py with verified water consumption municipalities.
+Update municipalities.json with verified water consumption municipalities.
 
 This script uses Playwright to automate browser verification since City4U portal
 pages use Angular/JavaScript to dynamically load menu items.
@@ -12,16 +12,18 @@ Prerequisites:
 This script:
 1. Fetches all municipalities from City4U API
 2. Uses headless browser to check each for water consumption menu
-3. Updates municipalities.py with verified list
+3. Updates the municipalities.json catalogue with the verified list
 
 Usage:
-    python3 scripts/update_municipalities.py
+    python3 scripts/update_municipalities.py [--concurrency 8] [--delay 0.1]
 
 Environment variables:
     http_proxy, https_proxy - Proxy configuration (automatically detected)
 """
 
+import argparse
 import asyncio
+import json
 import os
 import re
 import sys
@@ -29,9 +31,55 @@ from datetime import datetime
 from pathlib import Path
 
 import aiohttp
-from playwright.async_api import Browser, Page, async_playwright
+from playwright.async_api import Browser
+from playwright.async_api import Error as PlaywrightError
+from playwright.async_api import Page
+from playwright.async_api import TimeoutError as PlaywrightTimeoutError
+from playwright.async_api import async_playwright
 
 type MunicipalityData = dict[str, str | int]
+# (has_water, error_message, logo_url) of a portal page check
+type CheckResult = tuple[bool, str, str | None]
+
+# Portal pages checked at once; each check mostly waits on the network and
+# the page's JavaScript, so this scales with cores rather than being bound by
+# a single one
+DEFAULT_CONCURRENCY = min(8, os.cpu_count() or 1)
+
+# The water consumption menu item, and the personal area menu that lists it
+WATER_CONSUMPTION_TEXT = "צריכת המים שלי"
+PERSONAL_AREA_TEXTS = ("איזור אישי", "אזור אישי")
+MENU_TIMEOUT = 15000  # ms to wait for Angular to render the menu
+MENU_SETTLE_TIMEOUT = 500  # ms for items to follow a menu rendered without them
+
+# Resolves once the menu item, or at least the personal area menu, is in the
+# DOM. textContent includes collapsed submenus, like page.content() does.
+MENU_STATE_JS = """
+([item, menus]) => {
+    const text = document.body ? document.body.textContent : "";
+    if (text.includes(item)) {
+        return "item";
+    }
+    return menus.some((menu) => text.includes(menu)) ? "menu" : false;
+}
+"""
+
+
+class RateLimiter:  # pylint: disable=too-few-public-methods
+    """Space page loads evenly across all workers."""
+
+    def __init__(self, delay: float) -> None:
+        self._delay = delay
+        self._next_start = 0.0
+
+    async def wait(self) -> None:
+        """Wait for this caller's turn to start a page load."""
+        # Reserve the next start time before sleeping, so workers queue up
+        now = asyncio.get_running_loop().time()
+        start = max(now, self._next_start)
+        self._next_start = start + self._delay
+        if start > now:
+            await asyncio.sleep(start - now)
 
 
 class MunicipalityVerifier:
@@ -91,22 +139,24 @@ class MunicipalityVerifier:
         url = f"https://city4u.co.il/PortalServicesSite/_portal/{customer_id}"
 
         try:
-            # Navigate to the portal page
-            response = await page.goto(url, wait_until="networkidle", timeout=30000)
+            # Navigate to the portal page; the menu is awaited below instead
+            # of every request the page makes
+            response = await page.goto(
+                url, wait_until="domcontentloaded", timeout=30000
+            )
 
             if response is None or response.status != 200:
                 status = response.status if response else "No response"
                 return False, f"HTTP {status}", None
 
-            # Wait for Angular to fully load
-            await page.wait_for_timeout(2000)
+            await self._wait_for_menu(page)
 
             # Check for water menu items by looking in the HTML content
             # This is more reliable than query_selector for dynamically loaded content
             content = await page.content()
 
             has_water_section = "מים" in content
-            has_water_consumption = "צריכת המים שלי" in content
+            has_water_consumption = WATER_CONSUMPTION_TEXT in content
 
             has_water = has_water_section and has_water_consumption
 
@@ -127,12 +177,40 @@ class MunicipalityVerifier:
                 return False, "No consumption", logo_url
             return False, "No water menu", logo_url
 
-        except asyncio.TimeoutError:
+        except (asyncio.TimeoutError, PlaywrightTimeoutError):
             return False, "Timeout", None
-        except (RuntimeError, ValueError) as exc:
+        except (RuntimeError, ValueError, PlaywrightError) as exc:
             error_msg = str(exc)[:30]
             return False, f"Error: {error_msg}", None
 
+    @staticmethod
+    async def _wait_for_menu(page: Page) -> None:
+        """
+        Wait until Angular has rendered enough of the menu to judge the page.
+
+        Returns as soon as the water consumption item appears. A menu rendered
+        without it gets MENU_SETTLE_TIMEOUT for late items before the page
+        counts as a definitive negative. Pages that never render a menu are
+        given up on after MENU_TIMEOUT and judged on what they show.
+        """
+        try:
+            handle = await page.wait_for_function(
+                MENU_STATE_JS,
+                arg=[WATER_CONSUMPTION_TEXT, list(PERSONAL_AREA_TEXTS)],
+                timeout=MENU_TIMEOUT,
+                polling=100,
+            )
+        except PlaywrightTimeoutError:
+            return
+
+        if await handle.json_value() == "menu":
+            try:
+                await page.get_by_text(WATER_CONSUMPTION_TEXT).first.wait_for(
+                    state="attached", timeout=MENU_SETTLE_TIMEOUT
+                )
+            except PlaywrightTimeoutError:
+                pass
+
     async def download_logo(
         self, session: aiohttp.ClientSession, logo_path: str, customer_id: int
     ) -> str | None:
@@ -206,13 +284,19 @@ class MunicipalityVerifier:
             return None
 
     async def verify_all_municipalities(  # pylint: disable=too-many-locals
-        self, delay: float = 0.1
+        self, delay: float = 0.1, concurrency: int = DEFAULT_CONCURRENCY
     ) -> list[MunicipalityData]:
         """
         Verify all municipalities for water consumption support.
 
+        Workers, each with its own browser context, take municipalities from
+        a shared queue. Results are reported and returned in the API's order
+        whatever order the checks finish in, so runs are reproducible.
+
         Args:
-            delay: Delay in seconds between requests (default 0.1)
+            delay: Minimum delay in seconds between page loads of all workers
+                (default 0.1)
+            concurrency: Number of pages checked at once
 
         Returns:
             List of municipalities with water support
@@ -221,85 +305,88 @@ class MunicipalityVerifier:
         if not municipalities:
             return []
 
-        total = len(municipalities)
+        candidates: list[tuple[int, str]] = []
+        for muni in municipalities:
+            customer_id = muni.get("CUSTOMER_ID")
+
+            # Convert to int if it's a float (API sometimes returns floats)
+            if isinstance(customer_id, float):
+                customer_id = int(customer_id)
+
+            if not isinstance(customer_id, int):
+                print(f"⚠️  Skipping invalid customer_id: {customer_id}")
+                continue
+            candidates.append((customer_id, str(muni.get("CUSTOMER_NAME_HE", ""))))
+
+        total = len(candidates)
+        concurrency = max(1, min(concurrency, total))
 
         print(f"Checking {total} municipalities for water consumption support...")
-        print(f"Delay between requests: {delay} seconds")
+        print(f"Pages checked at once: {concurrency}")
+        print(f"Delay between page loads: {delay} seconds")
         print("Using headless browser automation (Playwright)\n")
         print(f"{'ID':<10} {'Name (Hebrew)':<40} {'Status':<15}")
         print("=" * 70)
 
-        # Create a new page for checking
         assert self.browser is not None, "Browser not initialized"
-        page = await self.browser.new_page()
+        browser = self.browser
+        rate_limiter = RateLimiter(delay)
+        queue: asyncio.Queue[int] = asyncio.Queue()
+        for position in range(total):
+            queue.put_nowait(position)
+
+        # Finished checks wait here until every earlier one is reported
+        finished: dict[int, CheckResult] = {}
+        next_position = 0
+
+        def report_finished() -> None:
+            nonlocal next_position
+            while next_position in finished:
+                self._report_result(
+                    next_position + 1,
+                    total,
+                    *candidates[next_position],
+                    finished.pop(next_position),
+                )
+                next_position += 1
 
         # Create session for logo downloads
         connector = aiohttp.TCPConnector(ssl=False)
 
-        try:
-            async with aiohttp.ClientSession(
-                connector=connector, trust_env=True
-            ) as session:
-                for idx, muni in enumerate(municipalities, 1):
-                    customer_id = muni.get("CUSTOMER_ID")
-                    name_he = muni.get("CUSTOMER_NAME_HE", "")
-
-                    # Convert to int if it's a float (API sometimes returns floats)
-                    if isinstance(customer_id, float):
-                        customer_id = int(customer_id)
-
-                    if not isinstance(customer_id, int):
-                        print(f"⚠️  Skipping invalid customer_id: {customer_id}")
-                        continue
-
-                    (
-                        has_water,
-                        error,
-                        logo_url,
-                    ) = await self.check_municipality_has_water(page, customer_id)
-
-                    if has_water:
-                        status = "✓ YES"
+        async with aiohttp.ClientSession(
+            connector=connector, trust_env=True
+        ) as session:
+
+            async def worker() -> None:
+                context = await browser.new_context()
+                try:
+                    page = await context.new_page()
+                    while not queue.empty():
+                        position = queue.get_nowait()
+                        customer_id = candidates[position][0]
+
+                        await rate_limiter.wait()
+                        (
+                            has_water,
+                            error,
+                            logo_url,
+                        ) = await self.check_municipality_has_water(page, customer_id)
 
                         # Download logo if available
                         logo_path = None
-                        if logo_url:
+                        if has_water and logo_url:
                             logo_path = await self.download_logo(
                                 session, logo_url, customer_id
                             )
 
-                        self.verified_municipalities.append(
-                            {
-                                "customer_id": customer_id,
-                                "name_he": name_he,
-                                "logo_url": logo_path,
-                            }
-                        )
-                        # Highlight water-supported municipalities
-                        print(
-                            f"\033[92m{customer_id:<10} "
-                            f"{name_he:<40} {status:<15}\033[0m"
-                        )
-                    else:
-                        status = "✗ NO" if not error else f"✗ {error[:10]}"
-                        print(f"{customer_id:<10} {name_he:<40} {status:<15}")
-
-                    self.total_checked += 1
-
-                    # Progress indicator
-                    if idx % 20 == 0:
-                        water_count = len(self.verified_municipalities)
-                        print(
-                            f"\n--- Progress: {idx}/{total} "
-                            f"({water_count} with water) ---\n"
-                        )
-
-                    # Delay between requests
-                    if idx < total:
-                        await asyncio.sleep(delay)
-
-        finally:
-            await page.close()
+                        finished[position] = (has_water, error, logo_path)
+                        report_finished()
+                finally:
+                    await context.close()
+
+            async with asyncio.TaskGroup() as workers:
+                for _ in range(concurrency):
+                    workers.create_task(worker())
 
         print("\n" + "=" * 70)
         print("\nVerification complete!")
@@ -308,7 +395,41 @@ class MunicipalityVerifier:
 
         return self.verified_municipalities
 
-    async def run(self, delay: float = 0.1) -> list[MunicipalityData]:
+    def _report_result(  # pylint: disable=too-many-arguments
+        self,
+        idx: int,
+        total: int,
+        customer_id: int,
+        name_he: str,
+        result: CheckResult,
+    ) -> None:
+        """Print a municipality's check and record it if it has water."""
+        has_water, error, logo_path = result
+        if has_water:
+            status = "✓ YES"
+            self.verified_municipalities.append(
+                {
+                    "customer_id": customer_id,
+                    "name_he": name_he,
+                    "logo_url": logo_path,
+                }
+            )
+            # Highlight water-supported municipalities
+            print(f"\033[92m{customer_id:<10} {name_he:<40} {status:<15}\033[0m")
+        else:
+            status = "✗ NO" if not error else f"✗ {error[:10]}"
+            print(f"{customer_id:<10} {name_he:<40} {status:<15}")
+
+        self.total_checked += 1
+
+        # Progress indicator
+        if idx % 20 == 0:
+            water_count = len(self.verified_municipalities)
+            print(f"\n--- Progress: {idx}/{total} ({water_count} with water) ---\n")
+
+    async def run(
+        self, delay: float = 0.1, concurrency: int = DEFAULT_CONCURRENCY
+    ) -> list[MunicipalityData]:
         """Run the verification process."""
         async with async_playwright() as p:
             # Launch browser with proxy if configured
@@ -320,108 +441,45 @@ class MunicipalityVerifier:
             self.browser = await p.chromium.launch(**launch_options)
 
             try:
-                verified = await self.verify_all_municipalities(delay)
+                verified = await self.verify_all_municipalities(delay, concurrency)
                 return verified
             finally:
                 await self.browser.close()
 
 
-def generate_municipalities_py(verified_municipalities: list[MunicipalityData]) -> str:
-    """Generate the content for municipalities.py"""
-
-    # Sort by Hebrew name
-    water_munis_sorted = sorted(verified_municipalities, key=lambda x: x["name_he"])
+# MIME types of the logo file extensions written by download_logo
+LOGO_TYPES = {"jpg": "image/jpeg", "png": "image/png", "gif": "image/gif"}
 
-    # Generate enum values
-    enum_lines = []
-    for muni in water_munis_sorted:
-        cid = muni["customer_id"]
-        name_he = muni["name_he"]
-        enum_lines.append(f"    ID_{cid} = {cid}  # {name_he}")
 
-    # Generate Municipality instances
-    muni_lines = []
-    for muni in water_munis_sorted:
-        muni_lines.append("    Municipality(")
-        muni_lines.append(f"        customer_id=City4uID.ID_{muni['customer_id']},")
+def generate_catalogue_json(verified_municipalities: list[MunicipalityData]) -> str:
+    """Generate the content for municipalities.json.
 
-        muni_lines.append(f'        name_he="{muni["name_he"]}",')
-        # Add logo_url if available
+    Municipalities are sorted by Hebrew name and written one per line, so
+    updates show up as readable diffs.
+    """
+    entries = []
+    for muni in sorted(verified_municipalities, key=lambda x: x["name_he"]):
+        entry: MunicipalityData = {
+            "customer_id": int(muni["customer_id"]),
+            "name_he": muni["name_he"],
+        }
         logo_url = muni.get("logo_url")
         if logo_url:
-            muni_lines.append(f'        logo_url="{logo_url}",')
-        muni_lines.append("    ),")
+            entry["logo_url"] = logo_url
+            entry["logo_type"] = LOGO_TYPES[str(logo_url).rsplit(".", 1)[-1]]
+        entries.append("    " + json.dumps(entry, ensure_ascii=False))
 
-    enum_section = "\n".join(enum_lines)
-    muni_section = "\n".join(muni_lines)
     verification_date = datetime.now().strftime("%Y-%m-%d")
-
-    # pylint: disable=duplicate-code
-    content_template = '''"""Municipality data for City4U integration.
-
-This list contains municipalities verified to have water consumption support.
-Verification checks for water menu in the portal page.
-
-To update this list, run:
-    python3 scripts/update_municipalities.py
-
-Last updated: {verification_date}
-Total municipalities: {total_count}
-"""
-
-from dataclasses import dataclass
-from enum import IntEnum
-
-
-class City4uID(IntEnum):
-    """City4U customer IDs for municipalities with water consumption support."""
-
-{enum_section}
-
-
-@dataclass
-class Municipality:
-    """Represents a municipality in the City4U system."""
-
-    customer_id: City4uID
-    name_he: str
-    logo_url: str | None = None
-
-
-# Verified municipalities with water consumption support
-MUNICIPALITIES = [
-{muni_section}
-]
-
-
-# Sorted lists for UI display
-MUNICIPALITIES_SORTED_HE = sorted(MUNICIPALITIES, key=lambda m: m.name_he)
-
-
-def get_municipality_by_id(customer_id: int) -> Municipality | None:
-    """Get municipality by customer ID."""
-    for muni in MUNICIPALITIES:
-        if muni.customer_id == customer_id:
-            return muni
-    return None
-
-
-def get_municipality_name(customer_id: int) -> str:
-    """Get municipality name by customer ID."""
-    muni = get_municipality_by_id(customer_id)
-    if muni:
-        return muni.name_he
-    return f"Unknown ({{customer_id}})"
-'''
-
-    content = content_template.format(
-        verification_date=verification_date,
-        total_count=len(verified_municipalities),
-        enum_section=enum_section,
-        muni_section=muni_section,
-    )
-
-    return content
+    lines = [
+        "{",
+        '  "version": 1,',
+        f'  "updated": "{verification_date}",',
+        '  "municipalities": [',
+        ",\n".join(entries),
+        "  ]",
+        "}",
+    ]
+    return "\n".join(lines) + "\n"
 
 
 def generate_supported_municipalities_md(
@@ -479,12 +537,12 @@ python3 scripts/update_municipalities.py
 def update_municipalities_file(
     verified_municipalities: list[dict[str, str | int]],
 ) -> None:
-    """Update municipalities.py and SUPPORTED_MUNICIPALITIES.md with verified data."""
-    # Update municipalities.py
-    py_content = generate_municipalities_py(verified_municipalities)
-    py_path = Path("custom_components/city4u/municipalities.py")
-    py_path.write_text(py_content, encoding="utf-8")
-    print(f"\n✓ Updated {py_path}")
+    """Update municipalities.json and SUPPORTED_MUNICIPALITIES.md with verified data."""
+    # Update the catalogue loaded by the integration
+    json_content = generate_catalogue_json(verified_municipalities)
+    json_path = Path("custom_components/city4u/municipalities.json")
+    json_path.write_text(json_content, encoding="utf-8")
+    print(f"\n✓ Updated {json_path}")
 
     # Update SUPPORTED_MUNICIPALITIES.md
     md_content = generate_supported_municipalities_md(verified_municipalities)
@@ -499,6 +557,21 @@ def update_municipalities_file(
 
 async def main() -> None:
     """Main execution function."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument(
+        "--concurrency",
+        type=int,
+        default=DEFAULT_CONCURRENCY,
+        help=f"portal pages checked at once (default {DEFAULT_CONCURRENCY})",
+    )
+    parser.add_argument(
+        "--delay",
+        type=float,
+        default=0.1,
+        help="minimum seconds between page loads across all pages (default 0.1)",
+    )
+    args = parser.parse_args()
+
     print("=" * 70)
     print("City4U Municipality Verification and Update Tool")
     print("=" * 70)
@@ -507,7 +580,7 @@ async def main() -> None:
     verifier = MunicipalityVerifier()
 
     try:
-        verified = await verifier.run(delay=0.1)
+        verified = await verifier.run(delay=args.delay, concurrency=args.concurrency)
 
         if verified:
             update_municipalities_file(verified)
@@ -526,7 +599,7 @@ async def main() -> None:
         if verifier.verified_municipalities:
             num_partial = len(verifier.verified_municipalities)
             print(f"\nPartially verified {num_partial} municipalities so far.")
-            response = input("Update municipalities.py with partial results? [y/N]: ")
+            response = input("Update municipalities.json with partial results? [y/N]: ")
             if response.lower() == "y":
                 update_municipalities_file(verifier.verified_municipalities)
                 print("✓ Partial results saved")
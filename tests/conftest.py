@@ -7,16 +7,20 @@ Pylint warnings disabled for this file:
 # pylint: disable=redefined-outer-name,unused-argument
 
 import json
-from collections.abc import Generator
+from collections.abc import AsyncIterator, Generator
 from typing import Any
 from unittest.mock import AsyncMock, MagicMock, patch
 
 import pytest
 from homeassistant.const import CONF_PASSWORD, CONF_USERNAME
+from multidict import CIMultiDict
 from pytest_homeassistant_custom_component.common import MockConfigEntry
 
-from custom_components.city4u.api import City4UApiClient, City4UCredentials
+from custom_components.city4u.api import City4UApiClient, City4UCredentials, Reading
 from custom_components.city4u.const import CONF_CUSTOMER_ID, CONF_METER_NUMBER, DOMAIN
+from custom_components.city4u.municipalities import load_registry
+from custom_components.city4u.readings import ReadingSnapshot, ReadingStore
+from custom_components.city4u.resilience import City4URetryPolicy
 from custom_components.city4u.sensor import City4UWaterConsumptionSensor
 
 
@@ -36,23 +40,22 @@ def mock_config_entry() -> MockConfigEntry:
     )
 
 
+# A reading as returned by the API for the mocked meter
+API_READING: dict[str, Any] = {
+    "totalWaterDataWithMultiplier": 123.45,
+    "readingTime": "2025-01-01T12:00:00",
+    "MeterNumber": "test_meter",
+    "ExternalWaterCardId": "12345",
+    "SiteExternalReferenceId": "67890",
+}
+
+
 @pytest.fixture
 def mock_api() -> MagicMock:
     """Create a mock API client."""
     api = MagicMock()
     api.authenticate = AsyncMock()
-    api.fetch_water_data = AsyncMock(
-        return_value=[
-            {
-                "totalWaterDataWithMultiplier": 123.45,
-                "readingTime": "2025-01-01T12:00:00",
-                "MeterNumber": "test_meter",
-                "ExternalWaterCardId": "12345",
-                "SiteExternalReferenceId": "67890",
-            }
-        ]
-    )
-    api.fetch_all_historical_data = AsyncMock(return_value=[])
+    api.fetch_new_readings = AsyncMock(return_value=[Reading.from_api(API_READING)])
     api.is_token_valid = MagicMock(return_value=True)
     api.meter_number = "test_meter"
     api.customer_id = "123456"
@@ -63,16 +66,18 @@ def mock_api() -> MagicMock:
 def mock_coordinator(mock_api: MagicMock) -> MagicMock:
     """Create a mock coordinator."""
     coordinator = MagicMock()
-    coordinator.data = [
-        {
-            "totalWaterDataWithMultiplier": "123.45",
-            "readingTime": "2025-01-01T12:00:00",
-            "MeterNumber": "test_meter",
-            "ExternalWaterCardId": "12345",
-            "SiteExternalReferenceId": "67890",
-            "additionalField": "test_value",
-        }
-    ]
+    coordinator.data = create_reading_snapshot(
+        [
+            {
+                "totalWaterDataWithMultiplier": "123.45",
+                "readingTime": "2025-01-01T12:00:00",
+                "MeterNumber": "test_meter",
+                "ExternalWaterCardId": "12345",
+                "SiteExternalReferenceId": "67890",
+                "additionalField": "test_value",
+            }
+        ]
+    )
     coordinator.async_config_entry_first_refresh = AsyncMock()
     coordinator.async_request_refresh = AsyncMock()
     coordinator.last_update_success = True
@@ -90,14 +95,14 @@ def mock_session() -> MagicMock:
 def bypass_setup_fixture() -> Generator[None, None, None]:
     """Bypass the actual setup."""
     with patch(
-        "custom_components.city4u.async_get_clientsession",
+        "custom_components.city4u.async_get_session",
         return_value=MagicMock(),
     ):
         yield
 
 
 # Sample data fixtures for parametrized tests
-SAMPLE_WATER_DATA = {
+SAMPLE_WATER_DATA: dict[str, Any] = {
     "valid_single": [
         {
             "totalWaterDataWithMultiplier": 123.45,
@@ -148,10 +153,13 @@ def sensor(
     mock_coordinator: MagicMock, mock_api: MagicMock
 ) -> City4UWaterConsumptionSensor:
     """Create a City4U sensor."""
-    return City4UWaterConsumptionSensor(
+    sensor = City4UWaterConsumptionSensor(
         coordinator=mock_coordinator,
         api=mock_api,
+        municipalities=load_registry(),
     )
+    sensor.async_write_ha_state = MagicMock()  # type: ignore[method-assign]
+    return sensor
 
 
 @pytest.fixture
@@ -160,10 +168,13 @@ def delayed_data_sensor(
 ) -> City4UWaterConsumptionSensor:
     """Create a City4U sensor for delayed data tests."""
     mock_coordinator.data = None  # Start with no data
-    return City4UWaterConsumptionSensor(
+    sensor = City4UWaterConsumptionSensor(
         coordinator=mock_coordinator,
         api=mock_api,
+        municipalities=load_registry(),
     )
+    sensor.async_write_ha_state = MagicMock()  # type: ignore[method-assign]
+    return sensor
 
 
 @pytest.fixture
@@ -175,7 +186,19 @@ def city4u_client(mock_session: MagicMock) -> City4UApiClient:
         customer_id="123456",
         meter_number="test_meter",
     )
-    return City4UApiClient(credentials=credentials, session=mock_session)
+    # Retry without waiting, so transient failures do not slow the tests
+    return City4UApiClient(
+        credentials=credentials,
+        session=mock_session,
+        retry_policy=City4URetryPolicy(base_delay=0),
+    )
+
+
+@pytest.fixture
+def mock_setup_entry() -> Generator[AsyncMock, None, None]:
+    """Keep created entries from being set up against the real API."""
+    with patch("custom_components.city4u.async_setup_entry", return_value=True) as mock:
+        yield mock
 
 
 @pytest.fixture
@@ -193,12 +216,51 @@ def create_mock_response(
     status: int,
     json_data: dict[str, Any] | list[dict[str, Any]] | None = None,
     text: str = "",
+    headers: dict[str, str] | None = None,
 ) -> MagicMock:
     """Create a mock aiohttp response with proper async methods."""
     mock_response = MagicMock()
     mock_response.status = status
+    mock_response.headers = CIMultiDict(headers or {})
     # If json_data is provided, serialize it to text so response.text() returns valid JSON
     response_text = json.dumps(json_data) if json_data is not None else text
     mock_response.json = AsyncMock(return_value=json_data)
     mock_response.text = AsyncMock(return_value=response_text)
+    mock_response.read = AsyncMock(return_value=response_text.encode())
+    mock_response.content_length = len(response_text.encode())
+    mock_response.content.iter_chunked = MagicMock(
+        side_effect=lambda size: iter_chunks(response_text.encode(), size)
+    )
     return mock_response
+
+
+async def iter_chunks(body: bytes, size: int) -> AsyncIterator[bytes]:
+    """Yield a response body in chunks, like StreamReader.iter_chunked."""
+    for start in range(0, len(body), size):
+        yield body[start : start + size]
+
+
+def readings_from_api(readings: list[dict[str, Any]]) -> list[Reading]:
+    """Normalize raw API records like the API client does."""
+    return [Reading.from_api(reading) for reading in readings]
+
+
+def create_reading_snapshot(
+    readings: list[dict[str, Any]] | None,
+) -> ReadingSnapshot | None:
+    """Create coordinator data holding the given raw API readings."""
+    if readings is None:
+        return None
+    store = ReadingStore()
+    store.extend(readings_from_api(readings))
+    return store.snapshot()
+
+
+def set_coordinator_data(
+    sensor: City4UWaterConsumptionSensor,
+    coordinator: MagicMock,
+    readings: list[dict[str, Any]] | None,
+) -> None:
+    """Publish raw API readings to a sensor through its coordinator."""
+    coordinator.data = create_reading_snapshot(readings)
+    sensor._handle_coordinator_update()  # pylint: disable=protected-access
@@ -0,0 +1,99 @@
+"""Test the City4U per-account poll scheduler."""
+
+# pylint: disable=protected-access
+
+import asyncio
+from collections.abc import Generator
+from datetime import timedelta
+from unittest.mock import AsyncMock, patch
+
+import pytest
+from homeassistant.core import HomeAssistant
+
+from custom_components.city4u.account import City4UAccountScheduler
+from custom_components.city4u.const import ACCOUNT_POLL_SLOT
+
+
+@pytest.fixture(autouse=True)
+def no_batch_window() -> Generator[None]:
+    """Run batches without waiting for other meters."""
+    with patch("custom_components.city4u.account.ACCOUNT_BATCH_WINDOW", 0):
+        yield
+
+
+async def test_refresh_fetches_only_requesting_meters(hass: HomeAssistant) -> None:
+    """Test a refresh leaves meters that did not ask alone."""
+    scheduler = City4UAccountScheduler(hass)
+    fetch_a, fetch_b = AsyncMock(), AsyncMock()
+    scheduler.async_add_meter("a", fetch_a)
+    scheduler.async_add_meter("b", fetch_b)
+
+    await scheduler.async_refresh("a")
+
+    fetch_a.assert_awaited_once()
+    fetch_b.assert_not_awaited()
+
+
+async def test_concurrent_refreshes_share_one_batch(hass: HomeAssistant) -> None:
+    """Test meters refreshed together are fetched once each, in one batch."""
+    scheduler = City4UAccountScheduler(hass)
+    fetches = {key: AsyncMock() for key in "abcde"}
+    for key, fetch in fetches.items():
+        scheduler.async_add_meter(key, fetch)
+
+    with patch.object(
+        scheduler, "_async_run_batch", wraps=scheduler._async_run_batch
+    ) as run_batch:
+        await asyncio.gather(*(scheduler.async_refresh(key) for key in fetches))
+
+    run_batch.assert_called_once()
+    for fetch in fetches.values():
+        fetch.assert_awaited_once()
+
+
+async def test_refresh_raises_fetch_error_to_requester(hass: HomeAssistant) -> None:
+    """Test a failed fetch is raised only to the meter that asked for it."""
+    scheduler = City4UAccountScheduler(hass)
+    fetch_b = AsyncMock()
+    scheduler.async_add_meter("a", AsyncMock(side_effect=ValueError))
+    remove_b = scheduler.async_add_meter("b", fetch_b)
+
+    results = await asyncio.gather(
+        scheduler.async_refresh("a"),
+        scheduler.async_refresh("b"),
+        return_exceptions=True,
+    )
+    assert isinstance(results[0], ValueError)
+    assert results[1] is None
+    fetch_b.assert_awaited_once()
+
+    remove_b()
+    assert scheduler.meter_count == 1
+
+
+@pytest.mark.parametrize(
+    ("now", "interval", "due"),
+    [
+        # Intervals that drifted apart end on the same slot
+        (10.0, 1000.0, ACCOUNT_POLL_SLOT),
+        (12.0, 1700.0, ACCOUNT_POLL_SLOT),
+        (20.0, 4 * ACCOUNT_POLL_SLOT, 4 * ACCOUNT_POLL_SLOT),
+        # Already on a slot
+        (ACCOUNT_POLL_SLOT, ACCOUNT_POLL_SLOT, 2 * ACCOUNT_POLL_SLOT),
+        # Too short to reach the next slot
+        (100.0, 600.0, 700.0),
+    ],
+)
+def test_snap_interval_to_account_slot(
+    hass: HomeAssistant, now: float, interval: float, due: float
+) -> None:
+    """Test meters' next polls are snapped to the slots of their account."""
+    scheduler = City4UAccountScheduler(hass)
+    # The first interval snapped sets the slots
+    assert scheduler.async_snap_interval(
+        timedelta(seconds=ACCOUNT_POLL_SLOT), 0.0
+    ) == timedelta(seconds=ACCOUNT_POLL_SLOT)
+
+    assert scheduler.async_snap_interval(timedelta(seconds=interval), now) == timedelta(
+        seconds=due - now
+    )
@@ -1,14 +1,24 @@
 """Test the City4U API client."""
 
-from datetime import datetime, timedelta
-from unittest.mock import MagicMock
+import asyncio
+import json
+from collections.abc import AsyncIterator
+from datetime import UTC, datetime, timedelta
+from typing import Any
+from unittest.mock import MagicMock, patch
 
 import aiohttp
 import pytest
 
-from custom_components.city4u.api import City4UApiClient
+from custom_components.city4u.api import (
+    City4UApiClient,
+    City4UAuthRegistry,
+    City4UCredentials,
+    City4URequestLimiter,
+    Reading,
+)
 
-from .conftest import create_mock_response
+from .conftest import create_mock_response, readings_from_api
 
 
 async def test_authenticate_success(
@@ -51,12 +61,14 @@ async def test_authenticate_failure(
         await city4u_client.authenticate()
 
     assert city4u_client.token is None
+    # Server errors are retried, rejected credentials are not
+    assert mock_session.post.call_count == (3 if status_code >= 500 else 1)
 
 
-async def test_fetch_water_data_success(
+async def test_fetch_new_readings_success(
     city4u_client: City4UApiClient, mock_session: MagicMock
 ) -> None:
-    """Test successful water data fetching."""
+    """Test the data request and the readings it returns."""
     city4u_client.set_token("test_token")
 
     expected_data = [
@@ -70,9 +82,11 @@ async def test_fetch_water_data_success(
     mock_response = create_mock_response(200, json_data=expected_data)
     mock_session.get.return_value.__aenter__.return_value = mock_response
 
-    data = await city4u_client.fetch_water_data()
+    data = await city4u_client.fetch_new_readings()
 
-    assert data == expected_data
+    assert [reading.raw for reading in data] == expected_data
+    assert data[0].meter_number == "test_meter"
+    assert data[0].value == 123.45
     mock_session.get.assert_called_once()
     args, kwargs = mock_session.get.call_args
     assert "123456" in args[0]
@@ -88,7 +102,7 @@ async def test_fetch_water_data_success(
         (500, "Internal Server Error"),
     ],
 )
-async def test_fetch_water_data_failure(
+async def test_fetch_new_readings_failure(
     city4u_client: City4UApiClient,
     mock_session: MagicMock,
     status_code: int,
@@ -101,7 +115,7 @@ async def test_fetch_water_data_failure(
     mock_session.get.return_value.__aenter__.return_value = mock_response
 
     with pytest.raises(aiohttp.ClientResponseError):
-        await city4u_client.fetch_water_data()
+        await city4u_client.fetch_new_readings()
 
 
 @pytest.mark.parametrize(
@@ -129,3 +143,466 @@ def test_token_validation(
     city4u_client.set_token(token, expires_at)
 
     assert city4u_client.is_token_valid() is expected
+
+
+async def test_fetch_new_readings_incremental(
+    city4u_client: City4UApiClient, mock_session: MagicMock
+) -> None:
+    """Test only readings newer than the last fetch are returned."""
+    city4u_client.set_token("test_token")
+
+    first_payload = [
+        {"totalWaterDataWithMultiplier": 100.0, "readingTime": "2025-01-01T10:00:00"},
+        {"totalWaterDataWithMultiplier": 110.0, "readingTime": "2025-01-01T11:00:00"},
+    ]
+    second_payload = [
+        *first_payload,
+        {"totalWaterDataWithMultiplier": 120.0, "readingTime": "2025-01-01T12:00:00"},
+    ]
+
+    mock_session.get.return_value.__aenter__.return_value = create_mock_response(
+        200, json_data=first_payload
+    )
+    assert await city4u_client.fetch_new_readings() == readings_from_api(first_payload)
+    assert city4u_client.last_reading_time == "2025-01-01T11:00:00"
+
+    mock_session.get.return_value.__aenter__.return_value = create_mock_response(
+        200, json_data=first_payload
+    )
+    assert await city4u_client.fetch_new_readings() == []
+
+    mock_session.get.return_value.__aenter__.return_value = create_mock_response(
+        200, json_data=second_payload
+    )
+    assert await city4u_client.fetch_new_readings() == readings_from_api(
+        second_payload[2:]
+    )
+    assert city4u_client.last_reading_time == "2025-01-01T12:00:00"
+
+    city4u_client.reset_last_reading_time()
+    assert await city4u_client.fetch_new_readings() == readings_from_api(second_payload)
+
+
+async def test_fetch_new_readings_normalizes_only_new_records(
+    city4u_client: City4UApiClient, mock_session: MagicMock
+) -> None:
+    """Test records up to the watermark are never turned into readings."""
+    city4u_client.set_token("test_token")
+    payload = [
+        {
+            "totalWaterDataWithMultiplier": float(hour),
+            "readingTime": f"2025-01-01T{hour:02}:00:00",
+        }
+        for hour in range(24)
+    ]
+    city4u_client.reset_last_reading_time("2025-01-01T21:00:00")
+    mock_session.get.return_value.__aenter__.return_value = create_mock_response(
+        200, json_data=payload
+    )
+
+    with patch.object(Reading, "from_api", wraps=Reading.from_api) as from_api:
+        readings = await city4u_client.fetch_new_readings()
+
+    assert readings == readings_from_api(payload[22:])
+    assert [call.args[0] for call in from_api.call_args_list] == payload[22:]
+    assert city4u_client.last_reading_time == "2025-01-01T23:00:00"
+
+
+def _record(reading_time: str, value: float, **extra: Any) -> dict[str, Any]:
+    return {
+        "totalWaterDataWithMultiplier": value,
+        "readingTime": reading_time,
+        **extra,
+    }
+
+
+HISTORY = [_record("2025-01-01T10:00:00", 100.0), _record("2025-01-01T11:00:00", 110.0)]
+
+
+@pytest.mark.parametrize(
+    ("appended", "watermark"),
+    [
+        (
+            [
+                _record("2025-01-01T12:00:00", 120.0),
+                _record("2025-01-01T09:00:00", 95.0),
+            ],
+            "2025-01-01T12:00:00",
+        ),
+        (
+            [_record("2025-01-01T11:00:00", 111.0, readingType="Actual")],
+            "2025-01-01T11:00:00",
+        ),
+        ([_record("2025-01-01T08:00:00", 90.0)], "2025-01-01T11:00:00"),
+    ],
+    ids=["backdated_after_new", "adjustment_at_watermark", "only_backdated"],
+)
+async def test_fetch_new_readings_returns_appended_records(
+    city4u_client: City4UApiClient,
+    appended: list[dict[str, Any]],
+    watermark: str,
+) -> None:
+    """Test every record appended to the history is returned once."""
+    city4u_client.prime_payload(json.dumps(HISTORY).encode())
+    assert await city4u_client.fetch_new_readings() == readings_from_api(HISTORY)
+
+    city4u_client.prime_payload(json.dumps([*HISTORY, *appended]).encode())
+    assert await city4u_client.fetch_new_readings() == readings_from_api(appended)
+    # The newest reading time only moves forward
+    assert city4u_client.last_reading_time == watermark
+
+    city4u_client.prime_payload(json.dumps([*HISTORY, *appended]).encode())
+    assert await city4u_client.fetch_new_readings() == []
+
+
+async def test_fetch_new_readings_restored_position(
+    city4u_client: City4UApiClient,
+) -> None:
+    """Test a restored position finds records appended while stopped."""
+    backdated = _record("2025-01-01T09:00:00", 95.0)
+    city4u_client.reset_last_reading_time(
+        "2025-01-01T11:00:00", 2, ["2025-01-01T11:00:00", 110.0]
+    )
+
+    city4u_client.prime_payload(json.dumps([*HISTORY, backdated]).encode())
+    assert await city4u_client.fetch_new_readings() == readings_from_api([backdated])
+    assert city4u_client.records_seen == 3
+    assert city4u_client.last_record == ["2025-01-01T09:00:00", 95.0]
+
+
+async def test_fetch_new_readings_rewritten_history(
+    city4u_client: City4UApiClient,
+) -> None:
+    """Test readings newer than the watermark are used if the history changed."""
+    newer = _record("2025-01-01T12:00:00", 120.0)
+    city4u_client.reset_last_reading_time(
+        "2025-01-01T11:00:00", 2, ["2025-01-01T11:00:00", 105.0]
+    )
+
+    city4u_client.prime_payload(json.dumps([*HISTORY, newer]).encode())
+    assert await city4u_client.fetch_new_readings() == readings_from_api([newer])
+
+
+async def test_fetch_new_readings_conditional_request(
+    city4u_client: City4UApiClient, mock_session: MagicMock
+) -> None:
+    """Test the server's validators are sent back and a 304 is not decoded."""
+    city4u_client.set_token("test_token")
+    payload = [
+        {"totalWaterDataWithMultiplier": 100.0, "readingTime": "2025-01-01T10:00:00"}
+    ]
+    mock_session.get.return_value.__aenter__.return_value = create_mock_response(
+        200,
+        json_data=payload,
+        headers={
+            "ETag": '"v1"',
+            "Last-Modified": "Wed, 01 Jan 2025 10:05:00 GMT",
+        },
+    )
+    assert await city4u_client.fetch_new_readings() == readings_from_api(payload)
+
+    not_modified = create_mock_response(304)
+    mock_session.get.return_value.__aenter__.return_value = not_modified
+    assert await city4u_client.fetch_new_readings() == []
+
+    headers = mock_session.get.call_args.kwargs["headers"]
+    assert headers["If-None-Match"] == '"v1"'
+    assert headers["If-Modified-Since"] == "Wed, 01 Jan 2025 10:05:00 GMT"
+    not_modified.read.assert_not_called()
+
+    city4u_client.reset_last_reading_time()
+    mock_session.get.return_value.__aenter__.return_value = create_mock_response(
+        200, json_data=payload
+    )
+    assert await city4u_client.fetch_new_readings() == readings_from_api(payload)
+    assert "If-None-Match" not in mock_session.get.call_args.kwargs["headers"]
+
+
+def _client_with_decoder(
+    mock_session: MagicMock, decoder: MagicMock
+) -> City4UApiClient:
+    client = City4UApiClient(
+        credentials=City4UCredentials(
+            username="test_user",
+            password="test_password",
+            customer_id="123456",
+            meter_number="test_meter",
+        ),
+        session=mock_session,
+        json_decoder=decoder,
+    )
+    client.set_token("test_token")
+    return client
+
+
+async def test_fetch_new_readings_skips_unchanged_payload(
+    mock_session: MagicMock,
+) -> None:
+    """Test the payload is decoded by the client's decoder, and only if changed."""
+    decoder = MagicMock(wraps=json.loads)
+    client = _client_with_decoder(mock_session, decoder)
+    payload = [
+        {"totalWaterDataWithMultiplier": 100.0, "readingTime": "2025-01-01T10:00:00"}
+    ]
+    mock_session.get.return_value.__aenter__.return_value = create_mock_response(
+        200, json_data=payload
+    )
+    assert await client.fetch_new_readings() == readings_from_api(payload)
+    decoder.assert_called_once()
+
+    assert await client.fetch_new_readings() == []
+    decoder.assert_called_once()
+
+
+async def test_fetch_new_readings_invalid_json(
+    city4u_client: City4UApiClient, mock_session: MagicMock
+) -> None:
+    """Test an invalid payload raises and is decoded again on the next poll."""
+    city4u_client.set_token("test_token")
+    mock_session.get.return_value.__aenter__.return_value = create_mock_response(
+        200, text='[{"readingTime": "2025-01-01T12:00:00"}'
+    )
+
+    with pytest.raises(aiohttp.ClientPayloadError):
+        await city4u_client.fetch_new_readings()
+    with pytest.raises(aiohttp.ClientPayloadError):
+        await city4u_client.fetch_new_readings()
+
+
+async def test_fetch_new_readings_decodes_while_downloading(
+    mock_session: MagicMock,
+) -> None:
+    """Test records are decoded before the payload has finished downloading."""
+    decoder = MagicMock(wraps=json.loads)
+    client = _client_with_decoder(mock_session, decoder)
+    body = json.dumps(HISTORY).encode()
+    middle = body.index(b"},") + 2
+
+    async def iter_chunked(_size: int) -> AsyncIterator[bytes]:
+        yield body[:middle]
+        # The first record was decoded while the rest is downloading
+        decoder.assert_called_once()
+        yield body[middle:]
+
+    response = create_mock_response(200, text=body.decode())
+    response.content.iter_chunked = iter_chunked
+    mock_session.get.return_value.__aenter__.return_value = response
+
+    assert await client.fetch_new_readings() == readings_from_api(HISTORY)
+    assert decoder.call_count == 2
+
+
+async def test_fetch_new_readings_interrupted_download(
+    city4u_client: City4UApiClient, mock_session: MagicMock
+) -> None:
+    """Test a download that fails halfway is read in full on the next poll."""
+    city4u_client.set_token("test_token")
+    body = json.dumps(HISTORY).encode()
+
+    async def iter_chunked(_size: int) -> AsyncIterator[bytes]:
+        yield body[:20]
+        raise aiohttp.ClientPayloadError("Connection reset")
+
+    response = create_mock_response(200, text=body.decode())
+    response.content.iter_chunked = iter_chunked
+    mock_session.get.return_value.__aenter__.return_value = response
+    with pytest.raises(aiohttp.ClientPayloadError):
+        await city4u_client.fetch_new_readings()
+
+    mock_session.get.return_value.__aenter__.return_value = create_mock_response(
+        200, json_data=HISTORY
+    )
+    assert await city4u_client.fetch_new_readings() == readings_from_api(HISTORY)
+
+
+async def test_fetch_new_readings_parses_chunks(
+    city4u_client: City4UApiClient, mock_session: MagicMock
+) -> None:
+    """Test readings are parsed from a payload downloaded in small chunks."""
+    city4u_client.set_token("test_token")
+    payload = [
+        {
+            "totalWaterDataWithMultiplier": float(hour),
+            "readingTime": f"2025-01-01T{hour:02d}:00:00",
+        }
+        for hour in range(24)
+    ]
+    mock_session.get.return_value.__aenter__.return_value = create_mock_response(
+        200, json_data=payload
+    )
+
+    with patch("custom_components.city4u.api.STREAM_CHUNK_SIZE", 7):
+        readings = await city4u_client.fetch_new_readings()
+
+    assert readings == readings_from_api(payload)
+    assert city4u_client.last_poll_time is not None
+    response = mock_session.get.return_value.__aenter__.return_value
+    response.content.iter_chunked.assert_called_once_with(7)
+
+
+async def test_fetch_new_readings_retries_transient_errors(
+    city4u_client: City4UApiClient, mock_session: MagicMock
+) -> None:
+    """Test a server error is retried."""
+    city4u_client.set_token("test_token")
+    payload = [
+        {"totalWaterDataWithMultiplier": 100.0, "readingTime": "2025-01-01T10:00:00"}
+    ]
+    mock_session.get.return_value.__aenter__.side_effect = [
+        create_mock_response(503, text="Service Unavailable"),
+        create_mock_response(200, json_data=payload),
+    ]
+
+    assert await city4u_client.fetch_new_readings() == readings_from_api(payload)
+    assert mock_session.get.call_count == 2
+
+
+@pytest.mark.parametrize(
+    ("payload", "expected_index"),
+    [
+        ([], None),
+        (
+            [
+                {
+                    "totalWaterDataWithMultiplier": 100.0,
+                    "readingTime": "2025-01-01T10:00:00",
+                },
+                {
+                    "totalWaterDataWithMultiplier": 110.0,
+                    "readingTime": "2025-01-01T11:00:00",
+                },
+            ],
+            0,
+        ),
+    ],
+    ids=["empty", "readings"],
+)
+async def test_probe(
+    city4u_client: City4UApiClient,
+    mock_session: MagicMock,
+    payload: list[dict[str, Any]],
+    expected_index: int | None,
+) -> None:
+    """Test the probe returns the first reading and the raw payload."""
+    city4u_client.set_token("test_token")
+    mock_response = create_mock_response(200, json_data=payload)
+    mock_session.get.return_value.__aenter__.return_value = mock_response
+
+    first_reading, body = await city4u_client.probe()
+
+    assert body == await mock_response.read()
+    if expected_index is None:
+        assert first_reading is None
+    else:
+        assert first_reading == Reading.from_api(payload[expected_index])
+
+
+async def test_prime_payload(
+    city4u_client: City4UApiClient, mock_session: MagicMock
+) -> None:
+    """Test a primed payload is served without a request, then fingerprinted."""
+    city4u_client.set_token("test_token")
+    payload = [
+        {"totalWaterDataWithMultiplier": 100.0, "readingTime": "2025-01-01T10:00:00"}
+    ]
+    mock_response = create_mock_response(200, json_data=payload)
+
+    city4u_client.prime_payload(await mock_response.read())
+    assert await city4u_client.fetch_new_readings() == readings_from_api(payload)
+    mock_session.get.assert_not_called()
+    assert city4u_client.last_poll_time is not None
+
+    # The next poll downloads the payload and finds it unchanged
+    mock_session.get.return_value.__aenter__.return_value = mock_response
+    assert await city4u_client.fetch_new_readings() == []
+    mock_session.get.assert_called_once()
+
+
+async def test_authenticate_single_flight_shared_token(
+    mock_session: MagicMock,
+) -> None:
+    """Test clients of one account share a token and log in only once."""
+    registry = City4UAuthRegistry()
+    clients = [
+        City4UApiClient(
+            credentials=City4UCredentials(
+                username="test_user",
+                password="test_password",
+                customer_id="123456",
+                meter_number=f"meter_{index}",
+            ),
+            session=mock_session,
+            auth_state=registry.get("123456", "test_user"),
+        )
+        for index in range(3)
+    ]
+    mock_response = create_mock_response(200, json_data={"UserToken": "shared"})
+    mock_session.post.return_value.__aenter__.return_value = mock_response
+
+    await asyncio.gather(*(client.authenticate() for client in clients))
+
+    mock_session.post.assert_called_once()
+    assert all(client.token == "shared" for client in clients)
+    assert registry.get("123456", "other_user") is not registry.get(
+        "123456", "test_user"
+    )
+
+
+async def test_request_limiter_caps_concurrency() -> None:
+    """Test the request limiter never lets more than the cap run at once."""
+    limiter = City4URequestLimiter(max_concurrency=2, requests_per_second=1000)
+    running = 0
+    peak = 0
+
+    async def request() -> None:
+        nonlocal running, peak
+        async with limiter.slot():
+            running += 1
+            peak = max(peak, running)
+            await asyncio.sleep(0.01)
+            running -= 1
+
+    await asyncio.gather(*(request() for _ in range(6)))
+
+    assert peak == 2
+
+    peak = 0
+    limiter.configure(max_concurrency=3, requests_per_second=1000)
+    await asyncio.gather(*(request() for _ in range(6)))
+
+    assert peak == 3
+
+
+@pytest.mark.parametrize(
+    "record",
+    [
+        {
+            "MeterNumber": "111",
+            "ExternalWaterCardId": 222,
+            "SiteExternalReferenceId": "333",
+        },
+        {
+            "meterNumber": "111",
+            "externalWaterCardId": 222,
+            "siteExternalReferenceId": "333",
+        },
+    ],
+    ids=["pascal_case", "camel_case"],
+)
+def test_reading_from_api_resolves_identifiers(record: dict[str, Any]) -> None:
+    """Test identifiers are resolved whichever case the API uses."""
+    reading = Reading.from_api(
+        {
+            "totalWaterDataWithMultiplier": "12.5",
+            "readingTime": "2025-01-01T12:00:00",
+            **record,
+        }
+    )
+
+    assert reading.value == 12.5
+    assert reading.time == datetime(2025, 1, 1, 10, tzinfo=UTC)
+    assert (reading.meter_number, reading.property_id, reading.site_id) == (
+        "111",
+        "222",
+        "333",
+    )
@@ -6,12 +6,22 @@ import pytest
 from homeassistant.const import CONF_PASSWORD, CONF_USERNAME
 from homeassistant.core import HomeAssistant
 from homeassistant.data_entry_flow import FlowResultType
+from pytest_homeassistant_custom_component.common import MockConfigEntry
 
 from custom_components.city4u.config_flow import CannotConnect, InvalidAuth
 from custom_components.city4u.const import (
+    CONF_AUTO_IMPORT_STATISTICS,
+    CONF_CONNECT_TIMEOUT,
     CONF_CUSTOMER_ID,
+    CONF_MAX_CONCURRENT_REQUESTS,
+    CONF_MAX_REQUESTS_PER_SECOND,
     CONF_METER_NUMBER,
     CONF_MUNICIPALITY,
+    CONF_READ_TIMEOUT,
+    CONF_TOTAL_TIMEOUT,
+    DEFAULT_CONNECT_TIMEOUT,
+    DEFAULT_MAX_CONCURRENT_REQUESTS,
+    DEFAULT_TOTAL_TIMEOUT,
     DOMAIN,
 )
 
@@ -35,7 +45,9 @@ async def test_user_form_shown(hass: HomeAssistant) -> None:
     assert result["step_id"] == "user"
 
 
-@pytest.mark.usefixtures("mock_validate_input", "enable_custom_integrations")
+@pytest.mark.usefixtures(
+    "mock_validate_input", "mock_setup_entry", "enable_custom_integrations"
+)
 async def test_create_entry_success(hass: HomeAssistant) -> None:
     """Test we create an entry with valid input."""
     result = await hass.config_entries.flow.async_init(
@@ -90,7 +102,9 @@ async def test_config_flow_errors(
     assert result["errors"] == {"base": expected_error}
 
 
-@pytest.mark.usefixtures("mock_validate_input", "enable_custom_integrations")
+@pytest.mark.usefixtures(
+    "mock_validate_input", "mock_setup_entry", "enable_custom_integrations"
+)
 async def test_meter_number_defaults_to_username(hass: HomeAssistant) -> None:
     """Test meter number defaults to username when empty."""
     result = await hass.config_entries.flow.async_init(
@@ -110,3 +124,180 @@ async def test_meter_number_defaults_to_username(hass: HomeAssistant) -> None:
     )
 
     assert result["data"][CONF_METER_NUMBER] == "test_user"
+
+
+@pytest.mark.parametrize(
+    ("municipality", "customer_id"),
+    [("בני ברק", "261000"), (" בְּנֵי  בְּרַק ", "261000"), ("261000", "261000")],
+    ids=["hebrew", "normalized", "customer_id"],
+)
+@pytest.mark.usefixtures(
+    "mock_validate_input", "mock_setup_entry", "enable_custom_integrations"
+)
+async def test_typed_municipality(
+    hass: HomeAssistant, municipality: str, customer_id: str
+) -> None:
+    """Test an exactly typed municipality is picked without asking."""
+    result = await hass.config_entries.flow.async_init(
+        DOMAIN, context={"source": "user"}
+    )
+
+    result = await hass.config_entries.flow.async_configure(
+        result["flow_id"],
+        user_input={**VALID_USER_INPUT, CONF_MUNICIPALITY: municipality},
+    )
+
+    assert result["type"] == FlowResultType.CREATE_ENTRY
+    assert result["data"][CONF_CUSTOMER_ID] == customer_id
+
+
+@pytest.mark.parametrize(
+    ("municipality", "first_choice"),
+    [
+        ("Bnei Brak", "בני ברק"),
+        ("בני ב", "בני ברק"),
+        ("רמת גן", "רמת ישי"),
+        ("Beit Shemesh", "בת ים"),
+    ],
+    ids=["english", "hebrew_prefix", "fuzzy_hebrew", "fuzzy_english"],
+)
+@pytest.mark.usefixtures("enable_custom_integrations")
+async def test_inexact_municipality_asks(
+    hass: HomeAssistant,
+    mock_validate_input: AsyncMock,
+    municipality: str,
+    first_choice: str,
+) -> None:
+    """Test a municipality that is not typed exactly is confirmed by the user."""
+    result = await hass.config_entries.flow.async_init(
+        DOMAIN, context={"source": "user"}
+    )
+
+    result = await hass.config_entries.flow.async_configure(
+        result["flow_id"],
+        user_input={**VALID_USER_INPUT, CONF_MUNICIPALITY: municipality},
+    )
+
+    assert result["type"] == FlowResultType.FORM
+    assert result["step_id"] == "municipality"
+    mock_validate_input.assert_not_called()
+    assert result["data_schema"] is not None
+    selector = result["data_schema"].schema[CONF_CUSTOMER_ID]
+    assert selector.config["options"][0]["label"] == first_choice
+
+
+@pytest.mark.usefixtures("enable_custom_integrations")
+async def test_unknown_municipality(
+    hass: HomeAssistant, mock_validate_input: AsyncMock
+) -> None:
+    """Test a municipality that matches nothing re-shows the form."""
+    result = await hass.config_entries.flow.async_init(
+        DOMAIN, context={"source": "user"}
+    )
+
+    result = await hass.config_entries.flow.async_configure(
+        result["flow_id"],
+        user_input={**VALID_USER_INPUT, CONF_MUNICIPALITY: "זזזזזזזז"},
+    )
+
+    assert result["type"] == FlowResultType.FORM
+    assert result["step_id"] == "user"
+    assert result["errors"] == {"base": "unknown_municipality"}
+    mock_validate_input.assert_not_called()
+
+
+@pytest.mark.usefixtures("mock_setup_entry", "enable_custom_integrations")
+async def test_ambiguous_municipality_offers_ranked_matches(
+    hass: HomeAssistant, mock_validate_input: AsyncMock
+) -> None:
+    """Test only the best matches are offered after an ambiguous municipality."""
+    result = await hass.config_entries.flow.async_init(
+        DOMAIN, context={"source": "user"}
+    )
+    # The free-text form does not carry the catalogue
+    assert result["data_schema"] is not None
+    assert result["data_schema"].schema[CONF_MUNICIPALITY] is str
+
+    result = await hass.config_entries.flow.async_configure(
+        result["flow_id"],
+        user_input={**VALID_USER_INPUT, CONF_MUNICIPALITY: "Lod"},
+    )
+
+    assert result["type"] == FlowResultType.FORM
+    assert result["step_id"] == "municipality"
+    mock_validate_input.assert_not_called()
+    assert result["data_schema"] is not None
+    selector = result["data_schema"].schema[CONF_CUSTOMER_ID]
+    assert [option["label"] for option in selector.config["options"]] == [
+        "אלעד",
+        "לוד",
+    ]
+    customer_id = selector.config["options"][1]["value"]
+
+    result = await hass.config_entries.flow.async_configure(
+        result["flow_id"], user_input={CONF_CUSTOMER_ID: customer_id}
+    )
+
+    assert result["type"] == FlowResultType.CREATE_ENTRY
+    assert result["data"][CONF_CUSTOMER_ID] == customer_id
+    assert result["data"][CONF_USERNAME] == "test_user"
+    assert CONF_MUNICIPALITY not in result["data"]
+
+
+@pytest.mark.usefixtures("enable_custom_integrations")
+async def test_options_flow(
+    hass: HomeAssistant, mock_config_entry: MockConfigEntry
+) -> None:
+    """Test setting statistics import, timeouts and request limits in the options."""
+    mock_config_entry.add_to_hass(hass)
+
+    result = await hass.config_entries.options.async_init(mock_config_entry.entry_id)
+    assert result["type"] == FlowResultType.FORM
+    assert result["step_id"] == "init"
+
+    result = await hass.config_entries.options.async_configure(
+        result["flow_id"],
+        user_input={
+            CONF_AUTO_IMPORT_STATISTICS: True,
+            CONF_READ_TIMEOUT: 45,
+            CONF_MAX_REQUESTS_PER_SECOND: 0.5,
+        },
+    )
+
+    assert result["type"] == FlowResultType.CREATE_ENTRY
+    assert mock_config_entry.options == {
+        CONF_AUTO_IMPORT_STATISTICS: True,
+        CONF_CONNECT_TIMEOUT: DEFAULT_CONNECT_TIMEOUT,
+        CONF_READ_TIMEOUT: 45,
+        CONF_TOTAL_TIMEOUT: DEFAULT_TOTAL_TIMEOUT,
+        CONF_MAX_CONCURRENT_REQUESTS: DEFAULT_MAX_CONCURRENT_REQUESTS,
+        CONF_MAX_REQUESTS_PER_SECOND: 0.5,
+    }
+
+
+@pytest.mark.usefixtures("mock_setup_entry", "enable_custom_integrations")
+async def test_reauth_flow(
+    hass: HomeAssistant,
+    mock_config_entry: MockConfigEntry,
+    mock_validate_input: AsyncMock,
+) -> None:
+    """Test a rejected password is replaced through re-authentication."""
+    mock_config_entry.add_to_hass(hass)
+    result = await mock_config_entry.start_reauth_flow(hass)
+    assert result["type"] == FlowResultType.FORM
+    assert result["step_id"] == "reauth_confirm"
+
+    mock_validate_input.side_effect = InvalidAuth
+    result = await hass.config_entries.flow.async_configure(
+        result["flow_id"], user_input={CONF_PASSWORD: "wrong_password"}
+    )
+    assert result["errors"] == {"base": "invalid_auth"}
+
+    mock_validate_input.side_effect = None
+    result = await hass.config_entries.flow.async_configure(
+        result["flow_id"], user_input={CONF_PASSWORD: "new_password"}
+    )
+    assert result["type"] == FlowResultType.ABORT
+    assert result["reason"] == "reauth_successful"
+    assert mock_config_entry.data[CONF_PASSWORD] == "new_password"
+    assert mock_config_entry.data[CONF_USERNAME] == "test_user"
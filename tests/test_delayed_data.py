@@ -7,6 +7,8 @@ import pytest
 
 from custom_components.city4u.sensor import City4UWaterConsumptionSensor
 
+from .conftest import set_coordinator_data
+
 
 @pytest.mark.parametrize(
     ("data", "expected_value", "description"),
@@ -51,7 +53,7 @@ def test_delayed_data_values(
     description: str,
 ) -> None:
     """Test sensor handles delayed data entries correctly."""
-    mock_coordinator.data = data
+    set_coordinator_data(delayed_data_sensor, mock_coordinator, data)
     assert delayed_data_sensor.native_value == expected_value, description
 
 
@@ -71,13 +73,17 @@ def test_invalid_reading_time(
     invalid_reading_time: str,
 ) -> None:
     """Test handling of invalid reading time formats."""
-    mock_coordinator.data = [
-        {
-            "totalWaterDataWithMultiplier": "100.0",
-            "readingTime": invalid_reading_time,
-            "validField": "test_value",
-        }
-    ]
+    set_coordinator_data(
+        delayed_data_sensor,
+        mock_coordinator,
+        [
+            {
+                "totalWaterDataWithMultiplier": "100.0",
+                "readingTime": invalid_reading_time,
+                "validField": "test_value",
+            }
+        ],
+    )
 
     # Value should still be parsed
     assert delayed_data_sensor.native_value == 100.0
@@ -134,7 +140,7 @@ def test_same_timestamp_uses_last(
     expected_type: str,
 ) -> None:
     """Test that last entry is used when timestamps are identical."""
-    mock_coordinator.data = readings
+    set_coordinator_data(delayed_data_sensor, mock_coordinator, readings)
 
     assert delayed_data_sensor.native_value == expected_value
     attributes = delayed_data_sensor.extra_state_attributes
@@ -151,12 +157,16 @@ def test_reading_time_in_attributes_after_update(
     assert delayed_data_sensor.native_value is None
 
     # Update with valid data
-    mock_coordinator.data = [
-        {
-            "totalWaterDataWithMultiplier": "100.0",
-            "readingTime": "2025-01-01T12:00:00",
-        }
-    ]
+    set_coordinator_data(
+        delayed_data_sensor,
+        mock_coordinator,
+        [
+            {
+                "totalWaterDataWithMultiplier": "100.0",
+                "readingTime": "2025-01-01T12:00:00",
+            }
+        ],
+    )
 
     assert delayed_data_sensor.native_value == 100.0
     attributes = delayed_data_sensor.extra_state_attributes
@@ -0,0 +1,72 @@
+"""Test the handoff from the config flow to entry setup."""
+
+from datetime import datetime, timedelta
+from unittest.mock import MagicMock
+
+from homeassistant.core import HomeAssistant
+from homeassistant.util import dt as dt_util
+from pytest_homeassistant_custom_component.common import async_fire_time_changed
+
+from custom_components.city4u.api import City4UCredentials
+from custom_components.city4u.const import SETUP_HANDOFF_TTL
+from custom_components.city4u.handoff import (
+    City4USetupHandoff,
+    async_pop_handoff,
+    async_store_handoff,
+)
+
+CREDENTIALS = City4UCredentials(
+    username="test_user",
+    password="test_password",
+    customer_id="123456",
+    meter_number="test_meter",
+)
+
+
+def _handoff(token: str = "test_token") -> City4USetupHandoff:
+    return City4USetupHandoff(
+        token=token, expires_at=datetime(2030, 1, 1), payload=b"[]"
+    )
+
+
+async def test_handoff_popped_once(hass: HomeAssistant) -> None:
+    """Test a handoff is handed out once, to the same meter only."""
+    async_store_handoff(hass, CREDENTIALS, _handoff("old_token"))
+    async_store_handoff(hass, CREDENTIALS, _handoff())
+
+    other_meter = City4UCredentials(
+        username="test_user",
+        password="test_password",
+        customer_id="123456",
+        meter_number="other_meter",
+    )
+    assert async_pop_handoff(hass, other_meter) is None
+    assert async_pop_handoff(hass, CREDENTIALS) == _handoff()
+    assert async_pop_handoff(hass, CREDENTIALS) is None
+
+
+async def test_handoff_expires(hass: HomeAssistant) -> None:
+    """Test a handoff no setup asked for is dropped."""
+    async_store_handoff(hass, CREDENTIALS, _handoff())
+
+    async_fire_time_changed(
+        hass, dt_util.utcnow() + timedelta(seconds=SETUP_HANDOFF_TTL + 1)
+    )
+    await hass.async_block_till_done()
+
+    assert async_pop_handoff(hass, CREDENTIALS) is None
+
+
+def test_handoff_apply() -> None:
+    """Test the token is only used when the client has no valid one."""
+    api = MagicMock()
+    api.is_token_valid.return_value = False
+    _handoff().apply(api)
+    api.set_token.assert_called_once_with("test_token", datetime(2030, 1, 1))
+    api.prime_payload.assert_called_once_with(b"[]")
+
+    api = MagicMock()
+    api.is_token_valid.return_value = True
+    _handoff().apply(api)
+    api.set_token.assert_not_called()
+    api.prime_payload.assert_called_once_with(b"[]")
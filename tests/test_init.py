@@ -1,13 +1,31 @@
 """Test City4U integration setup."""
 
+from collections.abc import Generator
+from datetime import datetime, timedelta
+from typing import Any
 from unittest.mock import AsyncMock, MagicMock, patch
 
+import aiohttp
 import pytest
+from freezegun.api import FrozenDateTimeFactory
 from homeassistant.config_entries import ConfigEntryState
+from homeassistant.const import CONF_PASSWORD, CONF_USERNAME
 from homeassistant.core import HomeAssistant
 from pytest_homeassistant_custom_component.common import MockConfigEntry
 
-from custom_components.city4u.const import DOMAIN
+from custom_components.city4u.api import Reading
+from custom_components.city4u.config_flow import validate_input
+from custom_components.city4u.const import (
+    CONF_CUSTOMER_ID,
+    CONF_MAX_CONCURRENT_REQUESTS,
+    CONF_MAX_REQUESTS_PER_SECOND,
+    CONF_METER_NUMBER,
+    DOMAIN,
+    MAX_SCAN_INTERVAL,
+    MIN_SCAN_INTERVAL,
+)
+
+from .conftest import API_READING, create_mock_response, create_reading_snapshot
 
 
 @pytest.mark.usefixtures("enable_custom_integrations")
@@ -21,7 +39,7 @@ async def test_setup_entry_success(
 
     with (
         patch(
-            "custom_components.city4u.async_get_clientsession",
+            "custom_components.city4u.async_get_session",
             return_value=MagicMock(),
         ),
         patch(
@@ -34,7 +52,7 @@ async def test_setup_entry_success(
     ):
         mock_coordinator = MagicMock()
         mock_coordinator.async_config_entry_first_refresh = AsyncMock()
-        mock_coordinator.data = mock_api.fetch_water_data.return_value
+        mock_coordinator.data = create_reading_snapshot([API_READING])
         mock_coordinator_class.return_value = mock_coordinator
 
         await hass.config_entries.async_setup(mock_config_entry.entry_id)
@@ -56,7 +74,7 @@ async def test_unload_entry_success(
 
     with (
         patch(
-            "custom_components.city4u.async_get_clientsession",
+            "custom_components.city4u.async_get_session",
             return_value=MagicMock(),
         ),
         patch(
@@ -69,7 +87,7 @@ async def test_unload_entry_success(
     ):
         mock_coordinator = MagicMock()
         mock_coordinator.async_config_entry_first_refresh = AsyncMock()
-        mock_coordinator.data = mock_api.fetch_water_data.return_value
+        mock_coordinator.data = create_reading_snapshot([API_READING])
         mock_coordinator_class.return_value = mock_coordinator
 
         await hass.config_entries.async_setup(mock_config_entry.entry_id)
@@ -82,3 +100,360 @@ async def test_unload_entry_success(
 
         assert mock_config_entry.state == ConfigEntryState.NOT_LOADED
         assert mock_config_entry.entry_id not in hass.data[DOMAIN]
+        assert hass.services.has_service(DOMAIN, "force_update")
+
+
+@pytest.mark.usefixtures("enable_custom_integrations")
+async def test_services_survive_reload_of_last_entry(
+    hass: HomeAssistant,
+    mock_config_entry: MockConfigEntry,
+    mock_api: MagicMock,
+) -> None:
+    """Test services stay registered when the only entry reloads."""
+    mock_config_entry.add_to_hass(hass)
+
+    with (
+        patch(
+            "custom_components.city4u.async_get_session",
+            return_value=MagicMock(),
+        ),
+        patch(
+            "custom_components.city4u.City4UApiClient",
+            return_value=mock_api,
+        ),
+        patch(
+            "custom_components.city4u.DataUpdateCoordinator"
+        ) as mock_coordinator_class,
+    ):
+        mock_coordinator = MagicMock()
+        mock_coordinator.async_config_entry_first_refresh = AsyncMock()
+        mock_coordinator.async_refresh = AsyncMock()
+        mock_coordinator.data = create_reading_snapshot([API_READING])
+        mock_coordinator_class.return_value = mock_coordinator
+
+        await hass.config_entries.async_setup(mock_config_entry.entry_id)
+        await hass.async_block_till_done()
+
+        # Changed options reload the entry through its update listener
+        hass.config_entries.async_update_entry(
+            mock_config_entry,
+            options={**mock_config_entry.options, CONF_MAX_CONCURRENT_REQUESTS: 1},
+        )
+        await hass.async_block_till_done()
+
+        assert mock_config_entry.state is ConfigEntryState.LOADED
+        assert mock_coordinator_class.call_count == 2
+        assert hass.services.has_service(DOMAIN, "force_update")
+        assert hass.services.has_service(DOMAIN, "import_historical")
+
+        await hass.services.async_call(DOMAIN, "force_update", blocking=True)
+        mock_coordinator.async_refresh.assert_awaited_once()
+
+
+@pytest.mark.usefixtures("enable_custom_integrations")
+async def test_setup_entry_warm_start_from_cache(
+    hass: HomeAssistant,
+    hass_storage: dict[str, Any],
+    mock_config_entry: MockConfigEntry,
+    mock_api: MagicMock,
+) -> None:
+    """Test setup serves cached readings without logging in first."""
+    mock_config_entry.add_to_hass(hass)
+    cached = create_reading_snapshot([API_READING])
+    assert cached is not None
+    hass_storage[f"{DOMAIN}.{mock_config_entry.entry_id}"] = {
+        "version": 1,
+        "minor_version": 1,
+        "key": f"{DOMAIN}.{mock_config_entry.entry_id}",
+        "data": {
+            "readings": cached.store.as_dict(),
+            "last_reading_time": "2025-01-01T12:00:00",
+            "records_seen": 1,
+            "last_record": ["2025-01-01T12:00:00", 123.45],
+            "token": "cached_token",
+            "token_expires_at": None,
+        },
+    }
+
+    with (
+        patch(
+            "custom_components.city4u.async_get_session",
+            return_value=MagicMock(),
+        ),
+        patch(
+            "custom_components.city4u.City4UApiClient",
+            return_value=mock_api,
+        ),
+        patch(
+            "custom_components.city4u.DataUpdateCoordinator"
+        ) as mock_coordinator_class,
+        patch(
+            "custom_components.city4u.poll_offset",
+            return_value=timedelta(0),
+        ),
+    ):
+        mock_coordinator = MagicMock()
+        mock_coordinator.async_config_entry_first_refresh = AsyncMock()
+        mock_coordinator.async_refresh = AsyncMock()
+        mock_coordinator_class.return_value = mock_coordinator
+
+        def _set_updated_data(data: Any) -> None:
+            mock_coordinator.data = data
+
+        mock_coordinator.async_set_updated_data.side_effect = _set_updated_data
+
+        await hass.config_entries.async_setup(mock_config_entry.entry_id)
+        await hass.async_block_till_done(wait_background_tasks=True)
+
+        assert mock_config_entry.state is ConfigEntryState.LOADED
+        mock_api.authenticate.assert_not_called()
+        mock_coordinator.async_config_entry_first_refresh.assert_not_called()
+        mock_coordinator.async_refresh.assert_called_once()
+        mock_api.reset_last_reading_time.assert_called_once_with(
+            "2025-01-01T12:00:00", 1, ["2025-01-01T12:00:00", 123.45]
+        )
+        assert mock_coordinator.data.value == 123.45
+
+
+@pytest.mark.usefixtures("enable_custom_integrations")
+async def test_setup_entry_reuses_config_flow_login(
+    hass: HomeAssistant,
+    mock_config_entry: MockConfigEntry,
+    mock_session: MagicMock,
+) -> None:
+    """Test adding a meter costs one login and one data fetch in total."""
+    mock_session.post.return_value.__aenter__.return_value = create_mock_response(
+        200, json_data={"UserToken": "test_token"}
+    )
+    mock_session.get.return_value.__aenter__.return_value = create_mock_response(
+        200, json_data=[API_READING]
+    )
+
+    with (
+        patch(
+            "custom_components.city4u.config_flow.async_get_session",
+            return_value=mock_session,
+        ),
+        patch(
+            "custom_components.city4u.async_get_session",
+            return_value=mock_session,
+        ),
+        patch("custom_components.city4u.account.ACCOUNT_BATCH_WINDOW", 0),
+    ):
+        await validate_input(hass, dict(mock_config_entry.data))
+        mock_config_entry.add_to_hass(hass)
+        await hass.config_entries.async_setup(mock_config_entry.entry_id)
+        await hass.async_block_till_done()
+
+        assert mock_config_entry.state is ConfigEntryState.LOADED
+        mock_session.post.assert_called_once()
+        mock_session.get.assert_called_once()
+        coordinator = hass.data[DOMAIN][mock_config_entry.entry_id]["coordinator"]
+        assert coordinator.data.value == 123.45
+
+        await hass.config_entries.async_unload(mock_config_entry.entry_id)
+        await hass.async_block_till_done()
+
+
+@pytest.fixture(name="mock_cache")
+def mock_cache_fixture() -> Generator[MagicMock]:
+    """Replace the reading cache with an empty one."""
+    with patch("custom_components.city4u.City4UReadingCache") as mock_cache_class:
+        cache = mock_cache_class.return_value
+        cache.async_restore = AsyncMock(return_value=False)
+        yield cache
+
+
+async def _async_setup_with_api(
+    hass: HomeAssistant, entry: MockConfigEntry, api: MagicMock
+) -> Any:
+    """Set up entry with api and return its coordinator."""
+    entry.add_to_hass(hass)
+    with (
+        patch("custom_components.city4u.async_get_session", return_value=MagicMock()),
+        patch("custom_components.city4u.City4UApiClient", return_value=api),
+        patch("custom_components.city4u.account.ACCOUNT_BATCH_WINDOW", 0),
+    ):
+        await hass.config_entries.async_setup(entry.entry_id)
+        await hass.async_block_till_done()
+    return hass.data[DOMAIN].get(entry.entry_id, {}).get("coordinator")
+
+
+@pytest.mark.usefixtures("enable_custom_integrations")
+async def test_cache_saved_only_on_changes(
+    hass: HomeAssistant,
+    mock_config_entry: MockConfigEntry,
+    mock_api: MagicMock,
+    mock_cache: MagicMock,
+) -> None:
+    """Test polls that find nothing new do not rewrite the cache."""
+    coordinator = await _async_setup_with_api(hass, mock_config_entry, mock_api)
+    assert mock_cache.async_schedule_save.call_count == 1
+
+    mock_api.fetch_new_readings.return_value = []
+    with patch("custom_components.city4u.account.ACCOUNT_BATCH_WINDOW", 0):
+        await coordinator.async_refresh()
+    assert mock_cache.async_schedule_save.call_count == 1
+
+    # A new token is worth saving even without new readings
+    mock_api.is_token_valid.return_value = False
+
+    def _login() -> None:
+        mock_api.token = "new_token"
+
+    mock_api.authenticate.side_effect = _login
+    with patch("custom_components.city4u.account.ACCOUNT_BATCH_WINDOW", 0):
+        await coordinator.async_refresh()
+    assert mock_cache.async_schedule_save.call_count == 2
+
+
+def _auth_error(status: int) -> aiohttp.ClientResponseError:
+    return aiohttp.ClientResponseError(MagicMock(), (), status=status)
+
+
+@pytest.mark.usefixtures("enable_custom_integrations", "mock_cache")
+async def test_rejected_token_logs_in_again(
+    hass: HomeAssistant,
+    mock_config_entry: MockConfigEntry,
+    mock_api: MagicMock,
+) -> None:
+    """Test a token the server rejects is replaced by a fresh login."""
+    mock_api.token = "stale_token"
+    mock_api.fetch_new_readings.side_effect = [
+        _auth_error(401),
+        [Reading.from_api(API_READING)],
+    ]
+
+    coordinator = await _async_setup_with_api(hass, mock_config_entry, mock_api)
+
+    assert mock_config_entry.state is ConfigEntryState.LOADED
+    mock_api.set_token.assert_called_once_with(None)
+    # Once during setup, and once after the token was rejected
+    assert mock_api.authenticate.await_count == 2
+    assert coordinator.data.value == 123.45
+
+
+@pytest.mark.parametrize(
+    ("login_error", "expected_state"),
+    [
+        (_auth_error(401), ConfigEntryState.SETUP_ERROR),
+        (None, ConfigEntryState.SETUP_RETRY),
+    ],
+    ids=["login_rejected", "data_rejected_after_login"],
+)
+@pytest.mark.usefixtures("enable_custom_integrations", "mock_cache")
+async def test_rejected_token_after_fresh_login(
+    hass: HomeAssistant,
+    mock_config_entry: MockConfigEntry,
+    mock_api: MagicMock,
+    login_error: Exception | None,
+    expected_state: ConfigEntryState,
+) -> None:
+    """Test only a rejected fresh login is an authentication failure."""
+    mock_api.authenticate.side_effect = [None, login_error]
+    mock_api.fetch_new_readings.side_effect = _auth_error(401)
+
+    await _async_setup_with_api(hass, mock_config_entry, mock_api)
+
+    assert mock_config_entry.state is expected_state
+    reauth = hass.config_entries.flow.async_progress_by_handler(DOMAIN)
+    assert bool(reauth) is (login_error is not None)
+
+
+def _readings_every(interval: timedelta, last: str, count: int) -> list[Reading]:
+    """Return count readings interval apart, the last one at last."""
+    last_time = datetime.fromisoformat(last)
+    return [
+        Reading.from_api(
+            {
+                **API_READING,
+                "readingTime": (last_time - interval * index).isoformat(),
+            }
+        )
+        for index in reversed(range(count))
+    ]
+
+
+@pytest.mark.usefixtures("enable_custom_integrations", "mock_cache")
+async def test_batched_meters_keep_their_own_poll_interval(
+    hass: HomeAssistant, freezer: FrozenDateTimeFactory
+) -> None:
+    """Test a meter's batched polls leave its siblings' schedules alone."""
+    fast_readings = _readings_every(timedelta(minutes=15), "2025-01-01T12:30:00", 3)
+    slow_readings = _readings_every(timedelta(days=1), "2025-01-01T12:30:00", 3)
+    assert fast_readings[-1].time is not None
+    freezer.move_to(fast_readings[-1].time + timedelta(minutes=1))
+
+    fast_api, slow_api = MagicMock(), MagicMock()
+    for api, readings in ((fast_api, fast_readings), (slow_api, slow_readings)):
+        api.token = "test_token"
+        api.authenticate = AsyncMock()
+        api.is_token_valid.return_value = True
+        api.fetch_new_readings = AsyncMock(side_effect=[readings, [], [], []])
+
+    entries = [
+        MockConfigEntry(
+            domain=DOMAIN,
+            unique_id=f"city4u_123456_{meter}",
+            data={
+                CONF_USERNAME: "test_user",
+                CONF_PASSWORD: "test_password",
+                CONF_CUSTOMER_ID: "123456",
+                CONF_METER_NUMBER: meter,
+            },
+        )
+        for meter in ("fast_meter", "slow_meter")
+    ]
+    fast = await _async_setup_with_api(hass, entries[0], fast_api)
+    slow = await _async_setup_with_api(hass, entries[1], slow_api)
+
+    assert fast.update_interval == timedelta(seconds=MIN_SCAN_INTERVAL)
+    assert slow.update_interval == timedelta(seconds=MAX_SCAN_INTERVAL)
+
+    # The fast meter polls around its expected reading, alone
+    with patch("custom_components.city4u.account.ACCOUNT_BATCH_WINDOW", 0):
+        for _ in range(3):
+            freezer.tick(timedelta(seconds=MIN_SCAN_INTERVAL))
+            await fast.async_refresh()
+
+    assert fast_api.fetch_new_readings.await_count == 4
+    slow_api.fetch_new_readings.assert_awaited_once()
+    assert slow.update_interval == timedelta(seconds=MAX_SCAN_INTERVAL)
+
+
+@pytest.mark.usefixtures("enable_custom_integrations", "mock_cache")
+async def test_strictest_request_limits_apply_to_all_entries(
+    hass: HomeAssistant,
+    mock_config_entry: MockConfigEntry,
+    mock_api: MagicMock,
+) -> None:
+    """Test the shared request limiter uses the strictest options of any entry."""
+    MockConfigEntry(
+        domain=DOMAIN,
+        unique_id="city4u_123456_other_meter",
+        data={**mock_config_entry.data, CONF_METER_NUMBER: "other_meter"},
+        options={
+            CONF_MAX_CONCURRENT_REQUESTS: 2,
+            CONF_MAX_REQUESTS_PER_SECOND: 0.5,
+        },
+    ).add_to_hass(hass)
+
+    mock_config_entry.add_to_hass(hass)
+    with (
+        patch("custom_components.city4u.async_get_session", return_value=MagicMock()),
+        patch("custom_components.city4u.City4UApiClient", return_value=mock_api),
+        patch("custom_components.city4u.account.ACCOUNT_BATCH_WINDOW", 0),
+        patch("custom_components.city4u.City4URequestLimiter") as limiter_class,
+    ):
+        await hass.config_entries.async_setup(mock_config_entry.entry_id)
+        await hass.async_block_till_done()
+
+        limiter_class.assert_called_once_with(2, 0.5)
+
+        # Changed options apply to the shared limiter when the entry reloads
+        hass.config_entries.async_update_entry(
+            mock_config_entry, options={CONF_MAX_CONCURRENT_REQUESTS: 1}
+        )
+        await hass.async_block_till_done()
+
+    limiter_class.return_value.configure.assert_called_with(1, 0.5)
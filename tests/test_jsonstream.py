@@ -0,0 +1,70 @@
+"""Test incremental JSON array parsing."""
+
+import json
+from collections.abc import Callable
+from typing import Any
+from unittest.mock import MagicMock
+
+import orjson
+import pytest
+
+from custom_components.city4u.jsonstream import JsonArrayStream
+
+ITEMS = [
+    {"readingTime": f"2025-01-01T{hour:02d}:00:00", "note": "מים, [ok] {}"}
+    for hour in range(24)
+]
+
+
+DECODERS = pytest.mark.parametrize(
+    "decoder",
+    [json.loads, orjson.loads],  # pylint: disable=no-member
+    ids=["json", "orjson"],
+)
+
+
+@DECODERS
+@pytest.mark.parametrize("chunk_size", [1, 5, 64, 100_000])
+def test_parse_split_chunks(chunk_size: int, decoder: Callable[[bytes], Any]) -> None:
+    """Test items are parsed however the document is split."""
+    body = json.dumps(ITEMS, ensure_ascii=False, indent=1).encode()
+    parser = JsonArrayStream(decoder)
+
+    items = []
+    for start in range(0, len(body), chunk_size):
+        items.extend(parser.feed(body[start : start + chunk_size]))
+    items.extend(parser.close())
+
+    assert items == ITEMS
+
+
+def test_items_decoded_together() -> None:
+    """Test the complete items of a chunk are decoded in one call."""
+    decoder = MagicMock(wraps=json.loads)
+    parser = JsonArrayStream(decoder)
+
+    assert parser.feed(json.dumps(ITEMS).encode()) == ITEMS
+    assert not parser.close()
+    decoder.assert_called_once()
+
+
+def test_items_available_before_end() -> None:
+    """Test complete items are returned before the array ends."""
+    parser = JsonArrayStream()
+
+    assert parser.feed(b'[{"a": 1}, {"b"') == [{"a": 1}]
+    assert parser.feed(b": 2}]") == [{"b": 2}]
+    assert not parser.close()
+
+
+@pytest.mark.parametrize(
+    "body",
+    [b'[{"a": 1}', b'{"a": 1}', b'[{"a": 1}] trailing', b""],
+    ids=["truncated", "not_array", "trailing_data", "empty"],
+)
+def test_invalid_documents(body: bytes) -> None:
+    """Test invalid documents raise ValueError."""
+    parser = JsonArrayStream()
+    with pytest.raises(ValueError):
+        parser.feed(body)
+        parser.close()
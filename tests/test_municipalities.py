@@ -0,0 +1,87 @@
+"""Test the municipality catalogue and registry."""
+
+import json
+
+import pytest
+from homeassistant.core import HomeAssistant
+
+from custom_components.city4u.municipalities import (
+    CATALOGUE_PATH,
+    Municipality,
+    MunicipalityRegistry,
+    async_get_registry,
+    load_registry,
+    normalize_name,
+)
+
+
+@pytest.mark.parametrize(
+    ("name", "expected"),
+    [
+        ("בני ברק", "בני ברק"),
+        ("  בני   ברק ", "בני ברק"),
+        ("יהוד - מונוסון", "יהוד מונוסון"),
+        ("יהוד־מונוסון", "יהוד מונוסון"),
+        ("בְּנֵי בְּרַק", "בני ברק"),
+        ("OneCity", "onecity"),
+    ],
+)
+def test_normalize_name(name: str, expected: str) -> None:
+    """Test spelling noise is removed from names."""
+    assert normalize_name(name) == expected
+
+
+def test_registry_lookups() -> None:
+    """Test lookups by customer ID, name and portal site ID."""
+    registry = load_registry()
+    bnei_brak = registry.by_customer_id(261000)
+    assert bnei_brak is not None
+    assert bnei_brak.name_he == "בני ברק"
+    assert registry.by_customer_id("261000") is bnei_brak
+    assert registry.by_name("בְּנֵי  בְּרַק") is bnei_brak
+    assert registry.by_site_id("261000") is bnei_brak
+
+    assert registry.by_customer_id(1) is None
+    assert registry.by_customer_id("not a number") is None
+    assert registry.by_name("עיר שלא קיימת") is None
+
+
+def test_registry_first_listed_wins() -> None:
+    """Test the first of two municipalities with the same key is returned."""
+    first = Municipality(customer_id=1, name_he="עיר")
+    second = Municipality(customer_id=2, name_he="עיר", site_id="site-2")
+    registry = MunicipalityRegistry([first, second])
+
+    assert len(registry) == 2
+    assert list(registry) == [first, second]
+    assert registry.by_name("עיר") is first
+    assert registry.by_site_id("site-2") is second
+    assert registry.by_site_id(1) is first
+
+
+def test_sorted_he() -> None:
+    """Test municipalities are sorted by Hebrew name for display."""
+    registry = load_registry()
+    names = [municipality.name_he for municipality in registry.sorted_he]
+    assert names == sorted(names)
+    assert len(names) == len(registry)
+
+
+def test_catalogue_logos() -> None:
+    """Test every catalogue logo exists and has a MIME type."""
+    catalogue = json.loads(CATALOGUE_PATH.read_bytes())
+    assert len(load_registry()) == len(catalogue["municipalities"])
+
+    for municipality in load_registry():
+        if municipality.logo_url is None:
+            assert municipality.logo_type is None
+            continue
+        assert (CATALOGUE_PATH.parent / municipality.logo_url).is_file()
+        assert municipality.logo_type in {"image/jpeg", "image/png", "image/gif"}
+
+
+async def test_async_get_registry(hass: HomeAssistant) -> None:
+    """Test the registry is loaded once and cached."""
+    registry = await async_get_registry(hass)
+    assert await async_get_registry(hass) is registry
+    assert registry.by_customer_id(999999) is not None
@@ -0,0 +1,83 @@
+"""Test City4U poll scheduling helpers."""
+
+# pylint: disable=redefined-outer-name
+
+from datetime import timedelta
+
+import pytest
+
+from custom_components.city4u.api import Reading
+from custom_components.city4u.polling import AdaptivePollInterval, poll_offset
+from custom_components.city4u.readings import ReadingStore
+
+HOUR = 3600.0
+
+
+@pytest.fixture
+def daily_store() -> ReadingStore:
+    """Create a store with one reading per day at 03:00."""
+    store = ReadingStore()
+    store.extend(
+        Reading.from_api(
+            {
+                "totalWaterDataWithMultiplier": float(day),
+                "readingTime": f"2025-01-{day:02d}T03:00:00",
+            }
+        )
+        for day in range(1, 11)
+    )
+    return store
+
+
+@pytest.fixture
+def poll_interval() -> AdaptivePollInterval:
+    """Create an adaptive interval between 15 minutes and 6 hours."""
+    return AdaptivePollInterval(
+        base_interval=timedelta(hours=1),
+        min_interval=timedelta(minutes=15),
+        max_interval=timedelta(hours=6),
+    )
+
+
+@pytest.mark.parametrize(
+    ("hours_since_reading", "expected"),
+    [
+        (2, timedelta(hours=6)),
+        (21, timedelta(hours=3)),
+        (23.9, timedelta(minutes=15)),
+        (24.25, timedelta(minutes=15)),
+        (26, timedelta(hours=1)),
+    ],
+    ids=["backs_off", "waits_until_expected", "min_near_expected", "overdue", "capped"],
+)
+def test_next_interval_follows_cadence(
+    daily_store: ReadingStore,
+    poll_interval: AdaptivePollInterval,
+    hours_since_reading: float,
+    expected: timedelta,
+) -> None:
+    """Test the interval tracks the expected arrival of the next reading."""
+    latest = daily_store.tail_timestamps(1)[-1]
+    now = latest + hours_since_reading * HOUR
+
+    assert poll_interval.next_interval(daily_store, 0, now) == expected
+
+
+def test_next_interval_without_history(poll_interval: AdaptivePollInterval) -> None:
+    """Test the base interval is used until a cadence can be learned."""
+    assert poll_interval.next_interval(ReadingStore(), 0, 0.0) == timedelta(hours=1)
+
+
+def test_poll_offset_spreads_keys_evenly() -> None:
+    """Test offsets are stable per key and evenly spaced over the interval."""
+    interval = timedelta(hours=1)
+    keys = [f"123456_user_{index}" for index in range(4)]
+    offsets = {key: poll_offset(key, keys, interval) for key in keys}
+
+    assert sorted(offsets.values()) == [interval * index / 4 for index in range(4)]
+    # Neither the order nor repeats of the keys change the offsets
+    assert offsets == {
+        key: poll_offset(key, [*reversed(keys), *keys], interval) for key in keys
+    }
+    # A key missing from keys is spread along with them
+    assert poll_offset("other", [], interval) == timedelta(0)
@@ -0,0 +1,132 @@
+"""Test the City4U reading store."""
+
+from datetime import UTC, datetime, timedelta
+
+import pytest
+
+from custom_components.city4u.api import parse_reading_time
+from custom_components.city4u.readings import ReadingStore
+
+from .conftest import SAMPLE_WATER_DATA, readings_from_api
+
+
+def test_store_extend_keeps_latest_reading() -> None:
+    """Test values are stored compactly and the latest reading is kept."""
+    store = ReadingStore()
+    added = store.extend(readings_from_api(SAMPLE_WATER_DATA["valid_multiple"]))
+
+    assert added == 3
+    assert len(store) == 3
+    assert [value for _, value in store] == [100.0, 110.0, 120.0]
+    assert store.snapshot().value == 120.0
+    assert store.latest is not None
+    assert store.latest.raw == SAMPLE_WATER_DATA["valid_multiple"][-1]
+
+
+def test_store_skips_invalid_readings() -> None:
+    """Test unparseable readings are not stored but still become latest."""
+    store = ReadingStore()
+    added = store.extend(readings_from_api(SAMPLE_WATER_DATA["invalid_value"]))
+
+    assert added == 0
+    assert len(store) == 0
+    assert store
+    assert store.snapshot().value is None
+    assert store.snapshot().time is not None
+
+
+def test_store_sorts_backdated_readings() -> None:
+    """Test backdated readings are inserted in time order."""
+    store = ReadingStore()
+    store.extend(
+        readings_from_api(
+            [
+                {
+                    "totalWaterDataWithMultiplier": 100.0,
+                    "readingTime": "2025-01-02T12:00:00",
+                },
+                {
+                    "totalWaterDataWithMultiplier": 90.0,
+                    "readingTime": "2025-01-01T12:00:00",
+                },
+            ]
+        )
+    )
+
+    assert [value for _, value in store] == [90.0, 100.0]
+    # The latest reading follows API order, not reading time
+    assert store.snapshot().value == 90.0
+
+
+def test_store_retention_limits() -> None:
+    """Test readings beyond the retention limits are dropped."""
+    readings = [
+        {
+            "totalWaterDataWithMultiplier": float(day),
+            "readingTime": f"2025-01-{day:02d}T12:00:00",
+        }
+        for day in range(1, 11)
+    ]
+
+    by_count = ReadingStore(max_readings=3)
+    by_count.extend(readings_from_api(readings))
+    assert [value for _, value in by_count] == [8.0, 9.0, 10.0]
+
+    by_age = ReadingStore(max_age=timedelta(days=2))
+    by_age.extend(readings_from_api(readings))
+    assert [value for _, value in by_age] == [8.0, 9.0, 10.0]
+
+
+def test_store_snapshot_round_trip() -> None:
+    """Test a store can be restored from its serialized snapshot."""
+    store = ReadingStore()
+    store.extend(readings_from_api(SAMPLE_WATER_DATA["valid_multiple"]))
+
+    restored = ReadingStore()
+    restored.restore(store.as_dict())
+
+    assert list(restored) == list(store)
+    assert restored.snapshot().value == 120.0
+    assert restored.snapshot().time == store.snapshot().time
+    assert restored.latest == store.latest
+
+
+def test_snapshot_equal_until_new_reading() -> None:
+    """Test snapshots only differ when the newest reading changes."""
+    store = ReadingStore()
+    store.extend(readings_from_api(SAMPLE_WATER_DATA["valid_multiple"]))
+    before = store.snapshot()
+
+    store.extend([])
+    assert store.snapshot() == before
+
+    store.extend(
+        readings_from_api(
+            [
+                {
+                    "totalWaterDataWithMultiplier": 130.0,
+                    "readingTime": "2025-01-01T13:00:00",
+                }
+            ]
+        )
+    )
+    assert store.snapshot() != before
+    assert store.snapshot().value == 130.0
+
+
+@pytest.mark.parametrize(
+    ("reading_time", "expected"),
+    [
+        ("2025-01-01T12:00:00", datetime(2025, 1, 1, 10, tzinfo=UTC)),
+        # Israel daylight saving time
+        ("2025-07-01T12:00:00", datetime(2025, 7, 1, 9, tzinfo=UTC)),
+        ("2025-07-01T12:00:00+00:00", datetime(2025, 7, 1, 12, tzinfo=UTC)),
+        ("2025/01/01", None),
+        (None, None),
+    ],
+)
+def test_parse_reading_time(
+    reading_time: str | None, expected: datetime | None
+) -> None:
+    """Test reading times are parsed as Israel local time unless offset."""
+    assert parse_reading_time(reading_time) == expected
@@ -0,0 +1,46 @@
+"""Test hourly resampling of City4U readings."""
+
+import pytest
+
+from custom_components.city4u.resample import (
+    HOUR,
+    HourlyStatistic,
+    hourly_statistics,
+)
+
+# Readings at 00:30, 03:30, a meter reset at 04:15 and 05:00
+TIMESTAMPS = [0.5 * HOUR, 3.5 * HOUR, 4.25 * HOUR, 5 * HOUR]
+VALUES = [10.0, 13.0, 1.0, 2.0]
+
+
+def test_hourly_statistics_interpolates_and_handles_reset() -> None:
+    """Test hours are aligned, gaps interpolated and resets counted from zero."""
+    statistics = list(hourly_statistics(TIMESTAMPS, VALUES))
+
+    assert [hour.start for hour in statistics] == [
+        0,
+        HOUR,
+        2 * HOUR,
+        3 * HOUR,
+        4 * HOUR,
+    ]
+    assert [hour.state for hour in statistics] == pytest.approx(
+        [10.5, 11.5, 12.5, 13.0, 2.0]
+    )
+    # The value before a reset is carried forward, then counting restarts
+    assert [hour.sum for hour in statistics] == pytest.approx([0.5, 1.5, 2.5, 3.0, 5.0])
+
+
+def test_hourly_statistics_resume() -> None:
+    """Test resuming after an imported hour continues its state and sum."""
+    resume = HourlyStatistic(start=3 * HOUR, state=13.0, sum=30.0)
+
+    assert list(hourly_statistics(TIMESTAMPS, VALUES, resume)) == [
+        HourlyStatistic(start=4 * HOUR, state=2.0, sum=32.0)
+    ]
+
+
+def test_hourly_statistics_skips_incomplete_hour() -> None:
+    """Test the hour containing the last reading is not emitted until it ends."""
+    assert not list(hourly_statistics([0.25 * HOUR, 0.75 * HOUR], [1.0, 2.0]))
+    assert not list(hourly_statistics([], []))
@@ -0,0 +1,133 @@
+"""Test retries and circuit breaking of City4U API requests."""
+
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import aiohttp
+import pytest
+
+from custom_components.city4u.resilience import (
+    City4UCircuitBreaker,
+    City4UCircuitOpenError,
+    City4URetryPolicy,
+    City4UTimeouts,
+    async_request_with_retries,
+    is_transient,
+)
+
+HOST = "city4u.co.il"
+NO_WAIT = City4URetryPolicy(attempts=3, base_delay=0)
+
+
+def response_error(status: int) -> aiohttp.ClientResponseError:
+    """Return the error raised for an HTTP error status."""
+    return aiohttp.ClientResponseError(MagicMock(), (), status=status)
+
+
+@pytest.mark.parametrize(
+    ("err", "expected"),
+    [
+        (aiohttp.ClientConnectionError(), True),
+        (TimeoutError(), True),
+        (response_error(503), True),
+        (response_error(429), True),
+        (response_error(401), False),
+        (City4UCircuitOpenError(), False),
+        (ValueError(), False),
+    ],
+)
+def test_is_transient(err: BaseException, expected: bool) -> None:
+    """Test which failures are worth retrying."""
+    assert is_transient(err) is expected
+
+
+def test_retry_delay_is_capped() -> None:
+    """Test the backoff grows exponentially up to the maximum delay."""
+    policy = City4URetryPolicy(base_delay=1.0, max_delay=5.0)
+    with patch("random.uniform", side_effect=lambda low, high: high):
+        assert [policy.delay(retry) for retry in range(5)] == [1, 2, 4, 5, 5]
+
+
+def test_timeouts_per_phase() -> None:
+    """Test timeouts map to aiohttp's connect, socket read and total limits."""
+    timeout = City4UTimeouts(connect=5, read=20, total=90).client_timeout()
+    assert (timeout.connect, timeout.sock_read, timeout.total) == (5, 20, 90)
+
+
+async def test_retries_until_success() -> None:
+    """Test transient failures are retried."""
+    send = AsyncMock(side_effect=[aiohttp.ClientConnectionError(), "ok"])
+    result = await async_request_with_retries(
+        send, host=HOST, context="Test", retry_policy=NO_WAIT
+    )
+    assert result == "ok"
+    assert send.await_count == 2
+
+
+async def test_gives_up_after_attempts() -> None:
+    """Test the last transient failure is raised once attempts run out."""
+    send = AsyncMock(side_effect=response_error(502))
+    with pytest.raises(aiohttp.ClientResponseError):
+        await async_request_with_retries(
+            send, host=HOST, context="Test", retry_policy=NO_WAIT
+        )
+    assert send.await_count == 3
+
+
+async def test_permanent_failure_not_retried() -> None:
+    """Test errors that would fail again are raised immediately."""
+    send = AsyncMock(side_effect=response_error(401))
+    with pytest.raises(aiohttp.ClientResponseError):
+        await async_request_with_retries(
+            send, host=HOST, context="Test", retry_policy=NO_WAIT
+        )
+    assert send.await_count == 1
+
+
+async def test_circuit_opens_and_probes() -> None:
+    """Test an open circuit fast-fails until a probe succeeds."""
+    breaker = City4UCircuitBreaker(failure_threshold=3, recovery_time=60)
+    failing = AsyncMock(side_effect=aiohttp.ClientConnectionError())
+
+    with patch("time.monotonic", return_value=1000.0):
+        with pytest.raises(aiohttp.ClientConnectionError):
+            await async_request_with_retries(
+                failing,
+                host=HOST,
+                context="Test",
+                retry_policy=NO_WAIT,
+                circuit_breaker=breaker,
+            )
+        assert failing.await_count == 3
+
+        # Other hosts are unaffected, this one fails without a request
+        breaker.before_request("example.com")
+        with pytest.raises(City4UCircuitOpenError):
+            breaker.before_request(HOST)
+
+    with patch("time.monotonic", return_value=1061.0):
+        # A failed probe keeps the circuit open
+        with pytest.raises(aiohttp.ClientConnectionError):
+            await async_request_with_retries(
+                failing,
+                host=HOST,
+                context="Test",
+                retry_policy=City4URetryPolicy(attempts=1),
+                circuit_breaker=breaker,
+            )
+        assert failing.await_count == 4
+        with pytest.raises(City4UCircuitOpenError):
+            breaker.before_request(HOST)
+
+    with patch("time.monotonic", return_value=1122.0):
+        succeeding = AsyncMock(return_value="ok")
+        assert (
+            await async_request_with_retries(
+                succeeding,
+                host=HOST,
+                context="Test",
+                retry_policy=NO_WAIT,
+                circuit_breaker=breaker,
+            )
+            == "ok"
+        )
+        breaker.before_request(HOST)
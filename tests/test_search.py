@@ -0,0 +1,114 @@
+"""Test the municipality search index."""
+
+import pytest
+from homeassistant.core import HomeAssistant
+
+from custom_components.city4u.municipalities import Municipality, load_registry
+from custom_components.city4u.search import (
+    SCORE_EXACT,
+    MunicipalitySearchIndex,
+    SearchMatch,
+    async_get_search_index,
+    confident_match,
+    phonetic_key,
+    search_key,
+)
+
+
+@pytest.fixture(name="search_index", scope="module")
+def search_index_fixture() -> MunicipalitySearchIndex:
+    """Return a search index over the bundled catalogue."""
+    return MunicipalitySearchIndex(load_registry())
+
+
+def test_search_key() -> None:
+    """Test final letters and punctuation are folded away."""
+    assert search_key("בני ברק") == search_key("בני  ברק")
+    assert search_key("רמת השרון") == "רמת השרונ"
+    assert search_key("סח'נין") == "סחנינ"
+    assert search_key("קרית גת ? מרכז") == "קרית גת מרכז"
+
+
+@pytest.mark.parametrize(
+    ("text", "expected"),
+    [
+        ("בני ברק", "bn brk"),
+        ("Bnei Brak", "bn brk"),
+        ("Bney Braq", "bn brk"),
+        ("כפר סבא", "kpr sb"),
+        ("Kfar Saba", "kpr sb"),
+        ("Herzliya", "rsl"),
+        ("הרצליה", "rsl"),
+    ],
+)
+def test_phonetic_key(text: str, expected: str) -> None:
+    """Test Hebrew names and their transliterations share a skeleton."""
+    assert phonetic_key(text) == expected
+
+
+@pytest.mark.parametrize(
+    ("query", "expected"),
+    [
+        ("בני ברק", "בני ברק"),
+        ("בני ב", "בני ברק"),
+        ("ברק", "בני ברק"),
+        ("261000", "בני ברק"),
+        ("Bnei Brak", "בני ברק"),
+        ("Tel Aviv", "תל אביב"),
+        ("Kfar Saba", "מפעל המים כפר סבא"),
+        ("Beer Sheva", "באר שבע"),
+        ("Katzrin", "קצרין"),
+        ("קצרינ", "קצרין"),
+        ("הרצלייה", "הרצליה"),
+        ("Herzlia", "הרצליה"),
+    ],
+)
+def test_search_best_match(
+    search_index: MunicipalitySearchIndex, query: str, expected: str
+) -> None:
+    """Test Hebrew, English, customer ID and misspelled queries."""
+    matches = search_index.search(query)
+    assert matches
+    assert matches[0].municipality.name_he == expected
+
+
+def test_search_ranking(search_index: MunicipalitySearchIndex) -> None:
+    """Test matches are ranked by score, then by name."""
+    matches = search_index.search("בני", limit=3)
+    assert [match.municipality.name_he for match in matches] == [
+        "בני ברק",
+        "בני שמעון",
+        "בנימינה-גבעת עדה",
+    ]
+    assert len(search_index.search("מ", limit=5)) == 5
+
+    exact = search_index.search("בני ברק")[0]
+    assert exact.score == SCORE_EXACT
+
+
+def test_search_no_match(search_index: MunicipalitySearchIndex) -> None:
+    """Test queries that match nothing."""
+    assert search_index.search("") == []
+    assert search_index.search("   ") == []
+    assert search_index.search("זזזזזזזז") == []
+
+
+def test_confident_match() -> None:
+    """Test only a single exact match is picked."""
+    first = Municipality(customer_id=1, name_he="א")
+    second = Municipality(customer_id=2, name_he="ב")
+
+    assert confident_match([]) is None
+    assert confident_match([SearchMatch(first, 1.0)]) is first
+    assert confident_match([SearchMatch(first, 0.5)]) is None
+    assert confident_match([SearchMatch(first, 1.0), SearchMatch(second, 0.9)]) is first
+    assert confident_match([SearchMatch(first, 1.0), SearchMatch(second, 1.0)]) is None
+    assert confident_match([SearchMatch(first, 0.9), SearchMatch(second, 0.8)]) is None
+    assert confident_match([SearchMatch(first, 0.9), SearchMatch(second, 0.2)]) is None
+
+
+async def test_async_get_search_index(hass: HomeAssistant) -> None:
+    """Test the index is built once and shared."""
+    search_index = await async_get_search_index(hass)
+    assert await async_get_search_index(hass) is search_index
+    assert search_index.search("Bnei Brak")[0].municipality.customer_id == 261000
@@ -10,7 +10,11 @@ from homeassistant.const import UnitOfVolume
 from custom_components.city4u.const import DOMAIN
 from custom_components.city4u.sensor import City4UWaterConsumptionSensor
 
-from .conftest import SAMPLE_READING_ALL_FIELDS, SAMPLE_WATER_DATA
+from .conftest import (
+    SAMPLE_READING_ALL_FIELDS,
+    SAMPLE_WATER_DATA,
+    set_coordinator_data,
+)
 
 
 def test_sensor_name(sensor: City4UWaterConsumptionSensor) -> None:
@@ -72,20 +76,18 @@ def test_native_value(
     expected_value: float | None,
 ) -> None:
     """Test native value with various data states."""
-    mock_coordinator.data = data
+    set_coordinator_data(sensor, mock_coordinator, data)
     assert sensor.native_value == expected_value
 
 
 def test_reading_time_in_attributes(sensor: City4UWaterConsumptionSensor) -> None:
     """Test reading_time is in attributes."""
-    _ = sensor.native_value
     attributes = sensor.extra_state_attributes
     assert "reading_time" in attributes
 
 
 def test_additional_fields_included(sensor: City4UWaterConsumptionSensor) -> None:
     """Test additional fields are included in attributes."""
-    _ = sensor.native_value
     attributes = sensor.extra_state_attributes
     assert attributes["additionalField"] == "test_value"
 
@@ -113,8 +115,7 @@ def test_excluded_attributes(
     excluded_field: str,
 ) -> None:
     """Test that specific fields are excluded from attributes."""
-    mock_coordinator.data = [SAMPLE_READING_ALL_FIELDS]
-    _ = sensor.native_value
+    set_coordinator_data(sensor, mock_coordinator, [SAMPLE_READING_ALL_FIELDS])
     attributes = sensor.extra_state_attributes
     assert excluded_field not in attributes
 
@@ -124,15 +125,49 @@ def test_valid_fields_included(
     mock_coordinator: MagicMock,
 ) -> None:
     """Test that valid fields are included in attributes."""
-    mock_coordinator.data = [
-        {
-            "totalWaterDataWithMultiplier": "123.45",
-            "readingTime": "2025-01-01T12:00:00",
-            "validField": "should_be_included",
-            "anotherField": "also_included",
-        }
-    ]
-    _ = sensor.native_value
+    set_coordinator_data(
+        sensor,
+        mock_coordinator,
+        [
+            {
+                "totalWaterDataWithMultiplier": "123.45",
+                "readingTime": "2025-01-01T12:00:00",
+                "validField": "should_be_included",
+                "anotherField": "also_included",
+            }
+        ],
+    )
     attributes = sensor.extra_state_attributes
     assert attributes["validField"] == "should_be_included"
     assert attributes["anotherField"] == "also_included"
+
+
+def test_state_cached_between_updates(
+    sensor: City4UWaterConsumptionSensor,
+    mock_coordinator: MagicMock,
+) -> None:
+    """Test state is computed on coordinator updates, not on property access."""
+    mock_coordinator.data = None
+
+    assert sensor.native_value == 123.45
+    assert sensor.extra_state_attributes["additionalField"] == "test_value"
+
+    sensor._handle_coordinator_update()  # pylint: disable=protected-access
+
+    assert sensor.native_value is None
+
+
+def test_state_not_written_without_new_reading(
+    sensor: City4UWaterConsumptionSensor,
+    mock_coordinator: MagicMock,
+) -> None:
+    """Test unchanged readings do not write state."""
+    sensor._handle_coordinator_update()  # pylint: disable=protected-access
+    sensor.async_write_ha_state.reset_mock()  # type: ignore[attr-defined]
+
+    sensor._handle_coordinator_update()  # pylint: disable=protected-access
+    sensor.async_write_ha_state.assert_not_called()  # type: ignore[attr-defined]
+
+    mock_coordinator.last_update_success = False
+    sensor._handle_coordinator_update()  # pylint: disable=protected-access
+    sensor.async_write_ha_state.assert_called_once()  # type: ignore[attr-defined]
@@ -0,0 +1,153 @@
+"""Test the City4U services."""
+
+# pylint: disable=redefined-outer-name,protected-access
+
+from collections.abc import Generator
+from functools import partial
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+from homeassistant.core import HomeAssistant
+
+from custom_components.city4u.account import City4UAccountScheduler
+from custom_components.city4u.const import (
+    ATTR_MAX_PARALLEL,
+    ATTR_METER_NUMBER,
+    DOMAIN,
+)
+from custom_components.city4u.readings import ReadingStore
+from custom_components.city4u.services import (
+    async_import_statistics,
+    async_setup_services,
+)
+
+from .conftest import SAMPLE_WATER_DATA, readings_from_api
+
+STATISTIC_ID = "city4u:water_consumption_test_meter"
+
+
+@pytest.fixture
+def last_statistics() -> Generator[AsyncMock, None, None]:
+    """Mock the recorder lookup of the last imported statistic."""
+    recorder = MagicMock()
+    recorder.async_add_executor_job = AsyncMock(return_value={})
+    recorder.async_block_till_done = AsyncMock()
+    with patch("custom_components.city4u.services.get_instance", return_value=recorder):
+        yield recorder.async_add_executor_job
+
+
+@pytest.fixture
+def add_statistics() -> Generator[MagicMock, None, None]:
+    """Mock submitting external statistics."""
+    with patch(
+        "custom_components.city4u.services.async_add_external_statistics"
+    ) as add_statistics:
+        yield add_statistics
+
+
+async def test_import_statistics_only_appends_new(
+    hass: HomeAssistant,
+    mock_api: MagicMock,
+    last_statistics: AsyncMock,
+    add_statistics: MagicMock,
+) -> None:
+    """Test hours already in statistics are not imported again."""
+    store = ReadingStore()
+    store.extend(readings_from_api(SAMPLE_WATER_DATA["valid_multiple"]))
+
+    assert await async_import_statistics(hass, mock_api, store) == 2
+    statistics = add_statistics.call_args.args[2]
+    assert [statistic["state"] for statistic in statistics] == [110.0, 120.0]
+    assert [statistic["sum"] for statistic in statistics] == [10.0, 20.0]
+
+    # Every complete hour is imported, so nothing is submitted
+    add_statistics.reset_mock()
+    last = statistics[-1]
+    last_statistics.return_value = {
+        STATISTIC_ID: [
+            {
+                "start": last["start"].timestamp(),
+                "state": last["state"],
+                "sum": last["sum"],
+            }
+        ]
+    }
+    assert await async_import_statistics(hass, mock_api, store) == 0
+    add_statistics.assert_not_called()
+
+
+@pytest.mark.usefixtures("last_statistics")
+async def test_import_statistics_in_batches(
+    hass: HomeAssistant,
+    mock_api: MagicMock,
+    add_statistics: MagicMock,
+) -> None:
+    """Test statistics are submitted in bounded batches."""
+    store = ReadingStore()
+    store.extend(readings_from_api(SAMPLE_WATER_DATA["valid_multiple"]))
+
+    with patch("custom_components.city4u.services.IMPORT_BATCH_HOURS", 1):
+        assert await async_import_statistics(hass, mock_api, store) == 2
+
+    assert add_statistics.call_count == 2
+    assert [len(call.args[2]) for call in add_statistics.call_args_list] == [1, 1]
+
+
+@pytest.mark.usefixtures("enable_custom_integrations", "last_statistics")
+async def test_import_historical_service_filters_meters(
+    hass: HomeAssistant,
+    mock_api: MagicMock,
+    add_statistics: MagicMock,
+) -> None:
+    """Test the service only imports the requested meters."""
+    other_api = MagicMock()
+    other_api.meter_number = "other_meter"
+    entries = {}
+    for entry_id, api in (("entry_1", mock_api), ("entry_2", other_api)):
+        store = ReadingStore()
+        store.extend(readings_from_api(SAMPLE_WATER_DATA["valid_multiple"]))
+        coordinator = MagicMock()
+        coordinator.data = store.snapshot()
+        entries[entry_id] = {"api": api, "coordinator": coordinator}
+    hass.data[DOMAIN] = entries
+    await async_setup_services(hass)
+
+    await hass.services.async_call(
+        DOMAIN,
+        "import_historical",
+        {ATTR_METER_NUMBER: "other_meter", ATTR_MAX_PARALLEL: 2},
+        blocking=True,
+    )
+
+    assert add_statistics.call_count == 1
+    assert add_statistics.call_args.args[1]["statistic_id"] == (
+        "city4u:water_consumption_other_meter"
+    )
+
+
+async def test_force_update_refreshes_entries_together(hass: HomeAssistant) -> None:
+    """Test forced refreshes of an account's meters share one batch."""
+    scheduler = City4UAccountScheduler(hass)
+    entries = {}
+    fetches = []
+    for index in range(5):
+        fetch = AsyncMock()
+        fetches.append(fetch)
+        scheduler.async_add_meter(f"entry_{index}", fetch)
+        coordinator = MagicMock()
+        coordinator.async_refresh = partial(scheduler.async_refresh, f"entry_{index}")
+        entries[f"entry_{index}"] = {"coordinator": coordinator}
+    hass.data[DOMAIN] = entries
+    await async_setup_services(hass)
+
+    with (
+        patch("custom_components.city4u.account.ACCOUNT_BATCH_WINDOW", 0),
+        patch.object(
+            scheduler, "_async_run_batch", wraps=scheduler._async_run_batch
+        ) as run_batch,
+    ):
+        await hass.services.async_call(DOMAIN, "force_update", blocking=True)
+
+    run_batch.assert_called_once()
+    for fetch in fetches:
+        fetch.assert_awaited_once()
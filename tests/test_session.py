@@ -0,0 +1,36 @@
+"""Test the dedicated City4U HTTP session."""
+
+import aiohttp
+from homeassistant.const import EVENT_HOMEASSISTANT_CLOSE
+from homeassistant.core import HomeAssistant
+
+from custom_components.city4u.const import MAX_CONCURRENT_REQUESTS
+from custom_components.city4u.session import async_close_session, async_get_session
+
+
+async def test_session_shared_until_closed(hass: HomeAssistant) -> None:
+    """Test one tuned session is shared and replaced after it is closed."""
+    session = async_get_session(hass)
+    assert async_get_session(hass) is session
+
+    connector = session.connector
+    assert isinstance(connector, aiohttp.TCPConnector)
+    assert connector.limit_per_host == MAX_CONCURRENT_REQUESTS
+    assert connector.use_dns_cache
+
+    await async_close_session(hass)
+    assert session.closed
+
+    replacement = async_get_session(hass)
+    assert replacement is not session
+    await async_close_session(hass)
+
+
+async def test_session_closed_with_home_assistant(hass: HomeAssistant) -> None:
+    """Test the session is closed when Home Assistant closes."""
+    session = async_get_session(hass)
+
+    hass.bus.async_fire(EVENT_HOMEASSISTANT_CLOSE)
+    await hass.async_block_till_done()
+
+    assert session.closed